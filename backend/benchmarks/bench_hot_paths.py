@@ -0,0 +1,198 @@
+"""
+Micro-benchmarks for the request hot paths, run offline against recorded upstream responses in fixtures/.
+
+Times RHS details extraction (PlantScraper._extract_all_details on a pre-parsed page), RHS search matching
+(find_match), PlantNet result shaping, the PlantDetails -> PlantDetailResponse conversion and parsing of
+Anthropic responses. For each case, reports operations per second (best of several rounds) and the peak
+Python memory allocated by one operation (tracemalloc).
+
+Results are compared against a stored baseline, and the script exits with status 1 if any case is slower,
+or allocates more, than the baseline by more than the tolerance. To compare runs on a busy or throttled
+machine, the baseline is scaled by the speed of a fixed pure-Python reference workload, measured before and
+after the cases. Timings are still only comparable on similar hardware, so re-record the baseline
+(--save-baseline) when changing machine.
+
+Usage (from backend/):
+    python benchmarks/bench_hot_paths.py [--case PATTERN] [--rounds N] [--min-time SECONDS]
+                                         [--baseline PATH] [--tolerance FRACTION] [--save-baseline]
+"""
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from anthropic.types import Message
+from app.config import settings
+from app.exceptions import PlantServiceException
+from app.models import PlantDetailResponse, PlantDetails
+from app.services.html_parsing import parse_details_elements
+from app.services.json_stream import IncrementalJsonObjectParser
+from app.services.plant_details_llm import PlantAnthropicClient
+from app.services.plant_details_rhs import PlantScraper
+from app.services.plant_identification import PlantIdentificationService
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCHMARKS_DIR, "fixtures")
+
+def load_fixture(name: str):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return json.load(f) if name.endswith(".json") else f.read()
+
+def build_cases() -> Dict[str, Callable[[], object]]:
+    """Benchmark cases by name, each a function performing one operation on pre-loaded fixtures."""
+    scraper = PlantScraper(settings.RHS_BASE_URL)
+    full_details_element, _ = parse_details_elements(load_fixture("rhs_details_lavandula.html"), settings.RHS_HTML_PARSER)
+    search_results = load_fixture("rhs_search_lavandula.json")["hits"]
+    plantnet_response = load_fixture("plantnet_identify_tulipa.json")
+    details = PlantDetails.from_dict(load_fixture("rhs_details_lavandula.expected.json"))
+
+    # Never sends a request, so needs no client or API key
+    llm_client = PlantAnthropicClient(client=object())
+    tool_message = Message.model_validate(load_fixture("anthropic_plant_details_tool.json"))
+    text = Message.model_validate(load_fixture("anthropic_plant_details_text.json")).content[0].text
+    text_chunks = [text[i:i + 16] for i in range(0, len(text), 16)]  # about the size of streamed text deltas
+
+    def find_no_match():
+        try:
+            scraper.find_match("Lavandula multifida", search_results)
+        except PlantServiceException:
+            pass
+
+    def parse_text():
+        details = json.loads(text)
+        llm_client._validate_plant_details(details)
+        return details
+
+    def parse_text_stream():
+        parser = IncrementalJsonObjectParser()
+        return [member for chunk in text_chunks for member in parser.feed(chunk)]
+
+    return {
+        "rhs.extract_all_details": lambda: scraper._extract_all_details(full_details_element),
+        "rhs.find_match.exact": lambda: scraper.find_match("Lavandula angustifolia", search_results),
+        "rhs.find_match.cultivar": lambda: scraper.find_match("Lavandula x intermedia 'Grosso'", search_results),
+        "rhs.find_match.none": find_no_match,
+        "plantnet.shape_matches": lambda: PlantIdentificationService._shape_matches(plantnet_response),
+        "details.to_response": lambda: PlantDetailResponse(**details.to_dict()),
+        "llm.tool_input": lambda: llm_client._tool_input(tool_message, "benchmark"),
+        "llm.parse_text": parse_text,
+        "llm.parse_text_stream": parse_text_stream,
+    }
+
+# Key of the reference workload in the baseline file
+REFERENCE = "_reference"
+
+def reference_workload():
+    """Fixed pure-Python work (dict, string and list operations), used to gauge the machine's current speed."""
+    counts = {}
+    for word in ("lavandula angustifolia hidcote tulipa gesneriana " * 20).split():
+        counts[word] = counts.get(word, 0) + 1
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+
+def measure(func: Callable[[], object], rounds: int, min_time: float) -> Dict[str, float]:
+    """Return the best operations per second over rounds of at least min_time seconds, and peak KB of one call."""
+    func()  # warm up
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+
+    best = elapsed
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ops_per_sec": number / best, "peak_kb": peak / 1024}
+
+def find_regressions(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                     tolerance: float, speed: float) -> Dict[str, str]:
+    """Describe each case that is slower (after scaling by speed), or allocates more, than its baseline by more than tolerance."""
+    regressions = {}
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        problems = []
+        expected_ops = expected["ops_per_sec"] * speed
+        if result["ops_per_sec"] < expected_ops * (1 - tolerance):
+            problems.append(f"{result['ops_per_sec']:,.0f} ops/s vs {expected_ops:,.0f} baseline")
+        # Allow 1 KB of slack, so tiny allocations are not flagged on noise
+        if result["peak_kb"] > expected["peak_kb"] * (1 + tolerance) + 1:
+            problems.append(f"{result['peak_kb']:,.1f} peak KB vs {expected['peak_kb']:,.1f} baseline")
+        if problems:
+            regressions[name] = "; ".join(problems)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--case", default="*", help="Only run cases matching this glob pattern, e.g. 'rhs.*'")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per case (the fastest is reported)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per round")
+    parser.add_argument("--baseline", default=os.path.join(BENCHMARKS_DIR, "baseline.json"))
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed fractional regression against the baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="Record these results as the baseline")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    cases = {name: func for name, func in build_cases().items() if fnmatch.fnmatch(name, args.case)}
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    reference_before = measure(reference_workload, args.rounds, args.min_time)["ops_per_sec"]
+    results = {name: measure(func, args.rounds, args.min_time) for name, func in cases.items()}
+    reference = (reference_before + measure(reference_workload, args.rounds, args.min_time)["ops_per_sec"]) / 2
+    speed = reference / baseline[REFERENCE]["ops_per_sec"] if REFERENCE in baseline else 1.0
+
+    print(f"Machine speed relative to the baseline: {speed:.2f}x (baseline ops/s below are scaled by this)\n")
+    print(f"{'case':<28}{'ops/s':>12}{'baseline':>12}{'change':>9}{'peak KB':>10}")
+    for name, result in results.items():
+        ops, expected = result["ops_per_sec"], baseline.get(name)
+        if expected is None:
+            comparison = f"{'-':>12}{'-':>9}"
+        else:
+            expected_ops = expected["ops_per_sec"] * speed
+            comparison = f"{expected_ops:>12,.0f}{ops / expected_ops - 1:>+9.0%}"
+        print(f"{name:<28}{ops:>12,.0f}{comparison}{result['peak_kb']:>10.1f}")
+
+    if args.save_baseline:
+        # Scale existing entries, so cases recorded in earlier runs stay comparable with the new reference
+        baseline = {name: dict(entry, ops_per_sec=round(entry["ops_per_sec"] * speed, 1))
+                    for name, entry in baseline.items() if name != REFERENCE}
+        baseline.update({name: {k: round(v, 1) for k, v in result.items()} for name, result in results.items()})
+        baseline[REFERENCE] = {"ops_per_sec": round(reference, 1)}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=4)
+            f.write("\n")
+        print(f"\nSaved baseline for {len(results)} cases to {args.baseline}")
+        return
+
+    regressions = find_regressions(results, baseline, args.tolerance, speed)
+    if regressions:
+        print(f"\nRegressions beyond {args.tolerance:.0%} of the baseline:")
+        for name, problem in regressions.items():
+            print(f"  - {name}: {problem}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.tolerance:.0%} of the baseline")
+
+if __name__ == "__main__":
+    main()
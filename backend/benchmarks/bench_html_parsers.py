@@ -0,0 +1,80 @@
+"""
+Compare the HTML parser backends for RHS plant details pages.
+
+For each backend, reports the mean time to parse a recorded page and extract its PlantDetails, and the peak
+Python memory allocated while doing so (tracemalloc, so lxml's native tree is not included). The original
+approach (whole page parsed with html.parser) is included as a baseline.
+
+Usage (from backend/):
+    python benchmarks/bench_html_parsers.py [--html PATH] [--expected PATH] [--number N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from bs4 import BeautifulSoup
+from app.config import settings
+from app.services.html_parsing import parse_details_elements
+from app.services.plant_details_rhs import PlantScraper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+BACKENDS = ["lxml", "html.parser", "lxml-xpath"]
+
+def parse_whole_page(scraper: PlantScraper, html: str):
+    """Baseline: build soup for the entire page with html.parser, then select the details element."""
+    return scraper._extract_all_details(BeautifulSoup(html, "html.parser").select_one('lib-plant-details-full'))
+
+def parse_with_backend(scraper: PlantScraper, html: str, backend: str):
+    full_details_element, _ = parse_details_elements(html, backend)
+    return scraper._extract_all_details(full_details_element)
+
+def measure(func, number: int) -> tuple:
+    """Return (mean ms per call, peak KB allocated in one call)."""
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    elapsed_ms = (time.perf_counter() - start) / number * 1000
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--html", default=os.path.join(FIXTURES_DIR, "rhs_details_lavandula.html"))
+    parser.add_argument("--expected", default=os.path.join(FIXTURES_DIR, "rhs_details_lavandula.expected.json"))
+    parser.add_argument("--number", type=int, default=20, help="Timed iterations per backend")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with open(args.html, encoding="utf-8") as f:
+        html = f.read()
+    expected = None
+    if args.expected and os.path.exists(args.expected):
+        with open(args.expected, encoding="utf-8") as f:
+            expected = json.load(f)
+
+    scraper = PlantScraper(settings.RHS_BASE_URL)
+    cases = {"html.parser (whole page)": lambda: parse_whole_page(scraper, html)}
+    for backend in BACKENDS:
+        cases[backend] = lambda backend=backend: parse_with_backend(scraper, html, backend)
+
+    print(f"{os.path.basename(args.html)} ({len(html) / 1024:.0f} KB), {args.number} iterations\n")
+    print(f"{'backend':<26}{'ms/op':>10}{'peak KB':>12}  output")
+    for name, func in cases.items():
+        output = func().to_dict()
+        check = "-" if expected is None else ("ok" if output == expected else "MISMATCH")
+        elapsed_ms, peak_kb = measure(func, args.number)
+        print(f"{name:<26}{elapsed_ms:>10.2f}{peak_kb:>12.0f}  {check}")
+
+if __name__ == "__main__":
+    main()
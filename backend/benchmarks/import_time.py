@@ -0,0 +1,111 @@
+"""
+Report the import time of the application (what a cold Lambda pays before handling its first event), and
+check it against a budget.
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters, and reports the median total import
+time, the slowest modules (by self and cumulative time) and any heavy dependencies that should only be
+imported on first use. Exits with status 1 if the total import time is more than the tolerance (default 50%,
+as import times vary between runs) above the baseline recorded in import_budget.json, or if one of its
+lazy_modules is imported at startup. Timings are only comparable on similar hardware, so re-record the
+baseline (--save-baseline) when changing machine, or after an intentional change to what is imported.
+
+Usage (from backend/):
+    python benchmarks/import_time.py [--runs N] [--top N] [--budget PATH] [--module MODULE]
+                                     [--tolerance FRACTION] [--save-baseline]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCHMARKS_DIR, "..", "src")
+
+# e.g. "import time:       354 |     334681 |   fastapi"
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+def run_importtime(module: str) -> Dict[str, Tuple[int, int, int]]:
+    """Import module in a fresh interpreter, returning (self us, cumulative us, depth) by imported module name."""
+    env = {k: v for k, v in os.environ.items() if not k.startswith("AWS_")}  # don't load secrets from SSM
+    env["PYTHONPATH"] = SRC_DIR
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(f"Importing {module} failed:\n{result.stderr}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            timings[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return timings
+
+def median_timings(runs: List[Dict[str, Tuple[int, int, int]]]) -> Dict[str, Tuple[float, float]]:
+    """Median (self ms, cumulative ms) by module, over the runs that imported it."""
+    names = set().union(*runs)
+    return {
+        name: (
+            statistics.median(run[name][0] for run in runs if name in run) / 1000,
+            statistics.median(run[name][1] for run in runs if name in run) / 1000
+        )
+        for name in names
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main", help="Module to import")
+    parser.add_argument("--runs", type=int, default=5, help="Timed imports, each in a fresh interpreter")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    parser.add_argument("--budget", default=os.path.join(BENCHMARKS_DIR, "import_budget.json"))
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="Allowed fractional increase over the baseline (default: the budget file's tolerance)")
+    parser.add_argument("--save-baseline", action="store_true", help="Record this run's total import time as the baseline")
+    args = parser.parse_args()
+
+    run_importtime(args.module)  # warm up (bytecode compilation, file system cache)
+    runs = [run_importtime(args.module) for _ in range(args.runs)]
+    timings = median_timings(runs)
+    total_ms = timings[args.module][1]
+
+    print(f"Import time for {args.module} (median of {args.runs} runs): {total_ms:.0f} ms\n")
+    for label, index in (("self", 0), ("cumulative", 1)):
+        print(f"Slowest modules by {label} time:")
+        for name, timing in sorted(timings.items(), key=lambda item: item[1][index], reverse=True)[:args.top]:
+            print(f"  {timing[index]:8.1f} ms  {name}")
+        print()
+
+    with open(args.budget, encoding="utf-8") as f:
+        budget = json.load(f)
+    if args.save_baseline:
+        budget["baseline_total_ms"] = round(total_ms)
+        with open(args.budget, "w", encoding="utf-8") as f:
+            json.dump(budget, f, indent=4)
+            f.write("\n")
+        print(f"Saved baseline of {total_ms:.0f} ms to {args.budget}")
+
+    tolerance = budget["tolerance"] if args.tolerance is None else args.tolerance
+    max_total_ms = budget["baseline_total_ms"] * (1 + tolerance)
+    failures = []
+    if total_ms > max_total_ms:
+        failures.append(f"total import time {total_ms:.0f} ms exceeds {max_total_ms:.0f} ms "
+                        f"(baseline {budget['baseline_total_ms']} ms + {tolerance:.0%})")
+    for name in budget["lazy_modules"]:
+        if name in timings:
+            failures.append(f"'{name}' is imported at startup ({timings[name][1]:.0f} ms), but should be imported on first use")
+
+    if failures:
+        print("Import budget exceeded:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print(f"Within import budget ({max_total_ms:.0f} ms, lazy: {', '.join(budget['lazy_modules'])})")
+
+if __name__ == "__main__":
+    main()
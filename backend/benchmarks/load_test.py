@@ -0,0 +1,250 @@
+"""
+Load test the app end to end against local stub upstreams (stub_upstreams.py), to size uvicorn workers and
+Lambda memory without spending real PlantNet or Anthropic quota.
+
+Starts the stub upstreams and the app (under uvicorn, with --workers processes) pointed at them, then runs
+--users simulated users for --duration seconds. Each user repeats the app's request flow: identify a plant
+from an uploaded image, request RHS details for the top match, and fall back to the LLM details if RHS has
+none. Reports throughput and p50/p95/p99 latency per endpoint, and the effective RHS miss rate.
+
+Upstream latency, error rates and payload sizes are set in a load profile (default load_profile.json). App
+caches are disabled unless --cache is given, so every request reaches the upstreams. To load test an app
+that is already running (e.g. deployed, or started with a debugger), pass --app-url; the stubs are then only
+started with --start-stubs, and the app must be configured to use them.
+
+Usage (from backend/):
+    python benchmarks/load_test.py [--users N] [--duration SECONDS] [--workers N] [--profile PATH]
+                                   [--cache] [--app-url URL [--start-stubs]] [--output PATH]
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import httpx
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCHMARKS_DIR, "..", "src")
+
+IDENTIFY = "/api/v1/identify-plant/"
+RHS_DETAILS = "/api/v1/plant-details-rhs/"
+LLM_DETAILS = "/api/v1/plant-details-llm/"
+
+@dataclass
+class EndpointStats:
+    """Latencies (seconds) and response status counts of one endpoint."""
+    latencies: List[float] = field(default_factory=list)
+    statuses: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def record(self, status: str, latency: float) -> None:
+        self.latencies.append(latency)
+        self.statuses[status] += 1
+
+    def percentile(self, p: float) -> float:
+        """Latency at percentile p (0-100) in ms, by the nearest-rank method."""
+        ordered = sorted(self.latencies)
+        return ordered[max(int(round(p / 100 * len(ordered))) - 1, 0)] * 1000
+
+    def summary(self, duration: float) -> dict:
+        return {
+            "requests": len(self.latencies),
+            "throughput_rps": round(len(self.latencies) / duration, 2),
+            "p50_ms": round(self.percentile(50), 1),
+            "p95_ms": round(self.percentile(95), 1),
+            "p99_ms": round(self.percentile(99), 1),
+            "max_ms": round(max(self.latencies) * 1000, 1),
+            "mean_ms": round(statistics.fmean(self.latencies) * 1000, 1),
+            "statuses": dict(sorted(self.statuses.items()))
+        }
+
+def make_images(count: int, size: int) -> List[bytes]:
+    """JPEG photos of size x size pixels (with noise, so they compress like photos), each different."""
+    from PIL import Image, ImageDraw
+    rng = random.Random(0)
+    noise = Image.effect_noise((size, size), 48).convert("RGB")
+    images = []
+    for i in range(count):
+        image = Image.new("RGB", (size, size), (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+        draw = ImageDraw.Draw(image)
+        for _ in range(12):
+            x, y = rng.randrange(size), rng.randrange(size)
+            radius = rng.randrange(size // 20, size // 5)
+            draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=(rng.randrange(256), rng.randrange(256), 0))
+        buffer = io.BytesIO()
+        Image.blend(image, noise, 0.3).save(buffer, format="JPEG", quality=90)
+        images.append(buffer.getvalue())
+    return images
+
+async def timed(client: httpx.AsyncClient, stats: Dict[str, EndpointStats], endpoint: str, **kwargs) -> Optional[httpx.Response]:
+    """POST to endpoint, recording its latency and status (or exception type) in stats."""
+    started = time.perf_counter()
+    try:
+        response = await client.post(endpoint, **kwargs)
+        stats[endpoint].record(str(response.status_code), time.perf_counter() - started)
+        return response
+    except httpx.HTTPError as e:
+        stats[endpoint].record(type(e).__name__, time.perf_counter() - started)
+        return None
+
+async def user_session(client: httpx.AsyncClient, stats: Dict[str, EndpointStats], image: bytes) -> None:
+    """One pass of the app's flow: identify, then RHS details for the top match, then LLM details if RHS fails."""
+    response = await timed(client, stats, IDENTIFY, files={"file": ("plant.jpg", image, "image/jpeg")}, data={"organ": "flower"})
+    if response is None or response.status_code != 200:
+        return
+    species = response.json()["matches"]["0"]["species"]
+
+    response = await timed(client, stats, RHS_DETAILS, json={"plant": species})
+    if response is None or response.status_code != 200:
+        await timed(client, stats, LLM_DETAILS, json={"plant": species})
+
+async def run_load(app_url: str, users: int, duration: float, images: List[bytes], timeout: float) -> Dict[str, EndpointStats]:
+    """Run users concurrent user sessions against the app for duration seconds."""
+    stats: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+
+    async with httpx.AsyncClient(base_url=app_url, timeout=timeout, limits=limits) as client:
+        async def user(number: int) -> None:
+            rng = random.Random(number)
+            # Stagger the start, so users do not move through the flow in lockstep
+            await asyncio.sleep(rng.random())
+            while time.perf_counter() < deadline:
+                await user_session(client, stats, rng.choice(images))
+
+        await asyncio.gather(*(user(i) for i in range(users)))
+    return stats
+
+def stub_environment(stub_url: str, cache: bool, cache_dir: str) -> Dict[str, str]:
+    """Environment pointing the app at the stub upstreams, without loading secrets from AWS."""
+    env = {k: v for k, v in os.environ.items() if not k.startswith("AWS_")}
+    env.update({
+        "PLANTNET_API_KEY": "stub",
+        "ANTHROPIC_API_KEY": "stub",
+        "PLANTNET_API_URL": f"{stub_url}/plantnet",
+        "RHS_SEARCH_API_URL": f"{stub_url}/rhs/api/v1/plants/search",
+        "RHS_BASE_URL": f"{stub_url}/rhs/plants/search-results?query=",
+        "RHS_PLANTS_URL": f"{stub_url}/rhs/plants",
+        "ANTHROPIC_BASE_URL": f"{stub_url}/anthropic",
+        "RHS_CATALOGUE_PATH": "",
+        "LOG_LEVEL": "WARNING",
+        "CACHE_DB_PATH": os.path.join(cache_dir, "load_test.db") if cache else "",
+    })
+    if not cache:
+        for name in ("ID_CACHE_ENABLED", "PHASH_INDEX_ENABLED", "RHS_CACHE_ENABLED", "LLM_CACHE_ENABLED"):
+            env[name] = "false"
+    return env
+
+def start_process(args: List[str], env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, *args], cwd=SRC_DIR, env=env)
+
+def wait_until_healthy(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            sys.exit(f"Process serving {url} exited with status {process.returncode}")
+        try:
+            if httpx.get(f"{url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    sys.exit(f"{url} was not healthy after {timeout:.0f} seconds")
+
+def fetch_stub_stats(stub_url: str) -> Optional[dict]:
+    """RHS search and miss counts from the stub upstreams, or None if they are not reachable."""
+    try:
+        return httpx.get(f"{stub_url}/stats", timeout=5.0).json()
+    except (httpx.HTTPError, ValueError):
+        return None
+
+def rhs_miss_note(stub_stats: Optional[dict]) -> Optional[dict]:
+    """Configured (share of species) and effective (share of searches) RHS miss rates, from the stubs' counts."""
+    if not stub_stats or not stub_stats.get("rhs_searches"):
+        return None
+    return {
+        "species_rate": round(stub_stats["rhs_miss_species"] / stub_stats["species"], 3),
+        "effective_rate": round(stub_stats["rhs_misses"] / stub_stats["rhs_searches"], 3),
+        "searches": stub_stats["rhs_searches"]
+    }
+
+def print_report(stats: Dict[str, EndpointStats], duration: float, sessions_note: str, rhs_misses: Optional[dict] = None) -> Dict[str, dict]:
+    report = {endpoint: stats[endpoint].summary(duration) for endpoint in (IDENTIFY, RHS_DETAILS, LLM_DETAILS) if endpoint in stats}
+    print(f"\n{sessions_note}")
+    if rhs_misses:
+        print(f"RHS misses: {rhs_misses['effective_rate']:.1%} of {rhs_misses['searches']} stub searches "
+              f"({rhs_misses['species_rate']:.1%} of species)")
+    print()
+    print(f"{'endpoint':<30}{'requests':>9}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}  statuses")
+    for endpoint, summary in report.items():
+        statuses = ", ".join(f"{status}: {count}" for status, count in summary["statuses"].items())
+        print(f"{endpoint:<30}{summary['requests']:>9}{summary['throughput_rps']:>8.1f}{summary['p50_ms']:>9.0f}"
+              f"{summary['p95_ms']:>9.0f}{summary['p99_ms']:>9.0f}{summary['max_ms']:>9.0f}  {statuses}")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="Concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds to run the load for")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes for the app")
+    parser.add_argument("--profile", default=os.path.join(BENCHMARKS_DIR, "load_profile.json"), help="Stub upstream load profile")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the stubs' random latencies, errors and species")
+    parser.add_argument("--cache", action="store_true", help="Keep the app's response caches enabled")
+    parser.add_argument("--images", type=int, default=8, help="Distinct images to upload")
+    parser.add_argument("--image-size", type=int, default=2000, help="Width and height of the uploaded images in pixels")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Client timeout per request in seconds")
+    parser.add_argument("--app-url", default=None, help="Load test an app already running at this URL")
+    parser.add_argument("--start-stubs", action="store_true", help="With --app-url, still start the stub upstreams")
+    parser.add_argument("--app-port", type=int, default=8800)
+    parser.add_argument("--stub-port", type=int, default=8900)
+    parser.add_argument("--output", default=None, help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    stub_url = f"http://127.0.0.1:{args.stub_port}"
+    app_url = args.app_url or f"http://127.0.0.1:{args.app_port}"
+    processes = []
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            if args.app_url is None or args.start_stubs:
+                stub_args = [os.path.join(BENCHMARKS_DIR, "stub_upstreams.py"), "--port", str(args.stub_port), "--profile", args.profile]
+                if args.seed is not None:
+                    stub_args += ["--seed", str(args.seed)]
+                processes.append(start_process(stub_args))
+                wait_until_healthy(stub_url, processes[-1])
+            if args.app_url is None:
+                processes.append(start_process(
+                    ["-m", "uvicorn", "app.main:app", "--port", str(args.app_port), "--workers", str(args.workers), "--log-level", "warning"],
+                    env=stub_environment(stub_url, args.cache, cache_dir)
+                ))
+            wait_until_healthy(app_url, processes[-1] if args.app_url is None else None)
+
+            images = make_images(args.images, args.image_size)
+            print(f"Load testing {app_url} with {args.users} users for {args.duration:.0f}s "
+                  f"({args.workers} worker{'s' if args.workers != 1 else ''}, caches {'on' if args.cache else 'off'}, "
+                  f"images {sum(map(len, images)) // len(images) // 1024} KB)...")
+            started = time.perf_counter()
+            stats = asyncio.run(run_load(app_url, args.users, args.duration, images, args.timeout))
+            elapsed = time.perf_counter() - started
+            rhs_misses = rhs_miss_note(fetch_stub_stats(stub_url)) if args.app_url is None or args.start_stubs else None
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    identifications = len(stats[IDENTIFY].latencies) if IDENTIFY in stats else 0
+    report = print_report(stats, elapsed, f"{identifications} sessions in {elapsed:.1f}s ({identifications / elapsed:.2f} sessions/s)", rhs_misses)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"users": args.users, "workers": args.workers, "cache": args.cache, "duration_s": round(elapsed, 1),
+                       "profile": args.profile, "rhs_misses": rhs_misses, "endpoints": report}, f, indent=4)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Local stand-ins for the upstream services (PlantNet, RHS search API, RHS plant pages and Anthropic), for load
+testing the app without spending real quota.
+
+Responses are built from the recorded fixtures in fixtures/, with the latency, error rate and payload size of
+each upstream set by a load profile (see load_profile.json). All upstreams are served by one app, under
+different path prefixes:
+    /plantnet   - PlantNet identify API (set PLANTNET_API_URL to this)
+    /rhs        - RHS search API and plant pages (RHS_SEARCH_API_URL, RHS_BASE_URL and RHS_PLANTS_URL)
+    /anthropic  - Anthropic Messages API (ANTHROPIC_BASE_URL)
+
+Usually started by load_test.py, but can be run on its own, e.g. to point a local app at it.
+
+Usage (from backend/):
+    python benchmarks/stub_upstreams.py [--port PORT] [--profile PATH] [--seed N]
+"""
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+import zlib
+from typing import Dict, List, Set
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCHMARKS_DIR, "fixtures")
+
+# Species returned by the PlantNet stub, so identifications (and the details requests following them) vary
+SPECIES = [
+    ("Tulipa gesneriana", "Tulipa"), ("Lavandula angustifolia", "Lavandula"), ("Rosa canina", "Rosa"),
+    ("Digitalis purpurea", "Digitalis"), ("Hydrangea macrophylla", "Hydrangea"), ("Salvia nemorosa", "Salvia"),
+    ("Geranium sanguineum", "Geranium"), ("Alchemilla mollis", "Alchemilla"), ("Nepeta racemosa", "Nepeta"),
+    ("Echinacea purpurea", "Echinacea"), ("Rudbeckia fulgida", "Rudbeckia"), ("Hosta sieboldiana", "Hosta"),
+    ("Helleborus niger", "Helleborus"), ("Camellia japonica", "Camellia"), ("Buddleja davidii", "Buddleja"),
+    ("Clematis montana", "Clematis"), ("Agapanthus africanus", "Agapanthus"), ("Iris sibirica", "Iris"),
+    ("Papaver orientale", "Papaver"), ("Crocosmia masoniorum", "Crocosmia"), ("Astrantia major", "Astrantia"),
+    ("Verbena bonariensis", "Verbena"), ("Anemone hupehensis", "Anemone"), ("Fuchsia magellanica", "Fuchsia"),
+    ("Paeonia lactiflora", "Paeonia"), ("Hemerocallis fulva", "Hemerocallis"), ("Phlox paniculata", "Phlox"),
+    ("Sedum spectabile", "Sedum"), ("Viburnum tinus", "Viburnum"), ("Choisya ternata", "Choisya"),
+]
+
+def load_fixture(name: str):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return json.load(f) if name.endswith(".json") else f.read()
+
+def choose_rhs_misses(miss_rate: float, rng: random.Random) -> Set[str]:
+    """Species (lower case) RHS has no page for: round(miss_rate * len(SPECIES)) of them, fixed so repeated searches agree."""
+    return {species.lower() for species, _ in rng.sample(SPECIES, round(miss_rate * len(SPECIES)))}
+
+def create_stub_app(profile: Dict[str, Dict], seed: int = None) -> FastAPI:
+    """
+    Create the app serving every stubbed upstream.
+
+    Args:
+        profile (Dict[str, Dict]): Settings for each upstream ('plantnet', 'rhs_search', 'rhs_page' and
+            'anthropic'), each with latency_ms, jitter_ms and error_rate, plus their payload settings.
+        seed (int, optional): Seed for the random latencies, errors and species, and the species RHS has no page for.
+
+    Returns:
+        FastAPI: The stub app.
+    """
+    rng = random.Random(seed)
+    app = FastAPI(title="Garden Glossary upstream stubs")
+    rhs_misses = choose_rhs_misses(profile["rhs_search"].get("miss_rate", 0), rng)
+    # Searches served, and those for species without an RHS page, so load tests can report the effective miss rate
+    counts = {"rhs_searches": 0, "rhs_misses": 0}
+
+    plantnet_template = load_fixture("plantnet_identify_tulipa.json")
+    search_hits = load_fixture("rhs_search_lavandula.json")["hits"]
+    details_page = load_fixture("rhs_details_lavandula.html")
+    padding_kb = profile["rhs_page"].get("padding_kb", 0)
+    if padding_kb:
+        # Unrelated markup, as on real pages with more navigation, related plants etc.
+        filler = '<div class="related"><a href="/plants/0/filler">Filler</a></div>\n'
+        details_page = details_page.replace("</body>", filler * (padding_kb * 1024 // len(filler)) + "</body>")
+    anthropic_responses = {
+        "tool": load_fixture("anthropic_plant_details_tool.json"),
+        "text": load_fixture("anthropic_plant_details_text.json")
+    }
+
+    async def delay(upstream: str) -> bool:
+        """Wait for the upstream's latency, returning True if this request should fail."""
+        settings = profile[upstream]
+        latency_ms = max(rng.gauss(settings["latency_ms"], settings.get("jitter_ms", 0)), 0)
+        await asyncio.sleep(latency_ms / 1000)
+        return rng.random() < settings.get("error_rate", 0)
+
+    def plantnet_results(count: int, images: int) -> List[dict]:
+        results = []
+        template = plantnet_template["results"][0]
+        scores = sorted((rng.random() for _ in range(count)), reverse=True)
+        for (species, genus), score in zip(rng.sample(SPECIES, count), scores):
+            result = copy.deepcopy(template)
+            result["score"] = round(score, 5)
+            result["species"]["scientificNameWithoutAuthor"] = species
+            result["species"]["genus"]["scientificNameWithoutAuthor"] = genus
+            result["images"] = [template["images"][i % len(template["images"])] for i in range(images)]
+            results.append(result)
+        return results
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.get("/stats")
+    async def stats():
+        return {**counts, "rhs_miss_species": len(rhs_misses), "species": len(SPECIES)}
+
+    @app.head("/{path:path}")
+    async def head(path: str):
+        # Connection pre-warming
+        return Response()
+
+    @app.post("/plantnet/v2/identify/{project}")
+    async def plantnet_identify(project: str, request: Request):
+        await request.body()
+        if await delay("plantnet"):
+            return JSONResponse({"statusCode": 503, "error": "Service Unavailable", "message": "Stubbed error"}, status_code=503)
+        settings = profile["plantnet"]
+        count = min(int(request.query_params.get("nb-results", 3)), settings.get("results", 3), len(SPECIES))
+        response = dict(plantnet_template, results=plantnet_results(count, settings.get("images_per_result", 6)))
+        response["bestMatch"] = response["results"][0]["species"]["scientificNameWithoutAuthor"]
+        return response
+
+    @app.post("/rhs/api/v1/plants/search")
+    async def rhs_search(request: Request):
+        payload = json.loads(await request.body())
+        if await delay("rhs_search"):
+            return JSONResponse({"message": "Stubbed error"}, status_code=503)
+        keywords = payload.get("keywords", "")
+        hits = search_hits[:profile["rhs_search"].get("hits", len(search_hits))]
+        counts["rhs_searches"] += 1
+        if keywords.lower() in rhs_misses:
+            counts["rhs_misses"] += 1
+        else:
+            hit = {"id": zlib.crc32(keywords.encode("utf-8")) % 100000,
+                   "botanicalName": f"<em>{keywords}</em>",
+                   "commonName": keywords.lower()}
+            hits = [hit] + hits[:-1]
+        return {"hits": hits, "totalHits": len(hits)}
+
+    @app.get("/rhs/plants/search-results")
+    async def rhs_search_page():
+        return HTMLResponse("<html><body><h1>Search results</h1></body></html>")
+
+    @app.get("/rhs/plants/{plant_id}/{name}/details")
+    async def rhs_page(plant_id: int, name: str):
+        if await delay("rhs_page"):
+            return HTMLResponse("<html><body>Service Unavailable</body></html>", status_code=503)
+        return HTMLResponse(details_page)
+
+    @app.post("/anthropic/v1/messages")
+    async def anthropic_messages(request: Request):
+        body = json.loads(await request.body())
+        if body.get("stream"):
+            return JSONResponse({"type": "error", "error": {"type": "invalid_request_error", "message": "Streaming is not stubbed"}}, status_code=400)
+        if await delay("anthropic"):
+            return JSONResponse({"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}}, status_code=529)
+        response = copy.deepcopy(anthropic_responses["tool" if body.get("tools") else "text"])
+        response["model"] = body.get("model", response["model"])
+        return response
+
+    return app
+
+def load_profile(path: str) -> Dict[str, Dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--profile", default=os.path.join(BENCHMARKS_DIR, "load_profile.json"))
+    parser.add_argument("--seed", type=int, default=None, help="Seed for random latencies, errors and species")
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(create_stub_app(load_profile(args.profile), args.seed), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, status
+from app.metrics import stage
+from app.models import PlantDetailRequest, CombinedPlantDetailResponse
+from app.services import PlantDetailsHedgedService
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Router endpoint
+router = APIRouter(
+    tags=["plant_details"],
+)
+
+@router.post(
+    "/plant-details/",
+    response_model=CombinedPlantDetailResponse,
+    summary="Find key cultivation details about a plant from RHS, falling back to the Anthropic LLM if RHS is slow or fails",
+    status_code=status.HTTP_200_OK
+)
+async def plant_details(plant_request: PlantDetailRequest) -> CombinedPlantDetailResponse:
+    details, source = await PlantDetailsHedgedService.get_plant_details(plant_request.plant)
+    with stage("response_model"):
+        return CombinedPlantDetailResponse(**details.to_dict(), source=source)
@@ -1,5 +1,8 @@
 from fastapi import APIRouter, status
-from app.models import PlantDetailRequest, PlantDetailResponse
+from fastapi.responses import StreamingResponse
+from app.api.streaming import stream_sections
+from app.metrics import stage
+from app.models import DetailsSource, PlantDetailRequest, PlantDetailResponse, StreamFormat
 from app.services import PlantDetailsLlmService
 import logging
 
@@ -19,5 +22,15 @@ router = APIRouter(
 async def plant_details(request: PlantDetailRequest) -> PlantDetailResponse:
         service = PlantDetailsLlmService()
         details = await service.get_plant_details(request.plant)
-        return PlantDetailResponse(**details.to_dict())
+        with stage("response_model"):
+            return PlantDetailResponse(**details.to_dict())
 
+@router.post(
+    "/plant-details-llm/stream/",
+    response_class=StreamingResponse,
+    summary="Stream key cultivation details about a plant from the Anthropic LLM, section by section as generated (SSE or NDJSON)",
+    status_code=status.HTTP_200_OK
+)
+async def plant_details_stream(request: PlantDetailRequest, format: StreamFormat = StreamFormat.sse) -> StreamingResponse:
+        sections = PlantDetailsLlmService().stream_plant_details(request.plant)
+        return await stream_sections(sections, format, DetailsSource.llm)
@@ -1,5 +1,8 @@
 from fastapi import APIRouter, status
-from app.models import PlantDetailRequest, PlantDetailResponse
+from fastapi.responses import StreamingResponse
+from app.api.streaming import stream_sections
+from app.metrics import stage
+from app.models import DetailsSource, PlantDetailRequest, PlantDetailResponse, StreamFormat
 from app.services import PlantDetailsRhsService
 import logging
 
@@ -19,5 +22,18 @@ router = APIRouter(
 async def plant_details(plant_request: PlantDetailRequest) -> PlantDetailResponse:
     service = PlantDetailsRhsService()
     details = await service.retrieve_plant_details(plant_request.plant)    
-    return PlantDetailResponse(**details.to_dict())
+    with stage("response_model"):
+        return PlantDetailResponse(**details.to_dict())
 
+@router.post(
+    "/plant-details-rhs/stream/",
+    response_class=StreamingResponse,
+    summary="Stream key cultivation details about a plant from the RHS website, section by section (SSE or NDJSON)",
+    description="Mirrors the shape of the LLM stream, so clients can handle both sources alike. RHS details are "
+                "only available once the whole page has been fetched and parsed, so every section is sent at once, "
+                "with no time-to-first-section gain over /plant-details-rhs/.",
+    status_code=status.HTTP_200_OK
+)
+async def plant_details_stream(plant_request: PlantDetailRequest, format: StreamFormat = StreamFormat.sse) -> StreamingResponse:
+    sections = PlantDetailsRhsService.stream_plant_details(plant_request.plant)
+    return await stream_sections(sections, format, DetailsSource.rhs)
@@ -1,8 +1,16 @@
 import os
 import uuid
+import asyncio
+from typing import List, Union
 from fastapi import APIRouter, File, Form, UploadFile, status, Depends
-from app.models import Organ, PlantIdentificationResponse
-from app.services import PlantIdentificationService
+from pydantic import ValidationError
+from app.models import (
+    Organ, PlantImage, PlantIdentificationResponse, BatchIdentificationResult, BatchIdentificationResponse, ErrorResponse,
+    PrefetchMode, PrefetchedDetails, CombinedPlantDetailResponse
+)
+from app.services import PlantIdentificationService, DetailsPrefetchService
+from app.services.plant_identification import PLANTNET_MAX_IMAGES
+from app.exceptions import PlantServiceErrorCode, PlantServiceException
 from app.config import get_settings
 import logging
 
@@ -22,15 +30,124 @@ router = APIRouter(
 async def identify_plant(
     file: UploadFile = File(...),
     organ: Organ = Form(...),
+    prefetch: PrefetchMode = Form(PrefetchMode.none),
     settings = Depends(get_settings)
 ):  
+    service = PlantIdentificationService()
+
+    # Legacy mode: write the upload to UPLOAD_DIR and send it from there
+    if settings.UPLOAD_MODE == "disk":
+        result = await _identify_from_disk(service, file, organ, settings.UPLOAD_DIR)
+    else:
+        # Forward the spooled upload straight to PlantNet, without a temporary file
+        logger.debug('Reading uploaded file...')
+        content = await file.read()
+        result = await service.identify_plant(content, organ, filename=file.filename)
+
+    # Optionally fetch details for confident matches now, rather than waiting for the app to ask
+    if prefetch != PrefetchMode.none:
+        species = DetailsPrefetchService.select_species(result['matches'], settings.PREFETCH_TOP_K, settings.PREFETCH_MIN_SCORE)
+        timeout = None
+        if prefetch == PrefetchMode.cache and not settings.background_tasks_supported():
+            # Background prefetches would be frozen with the Lambda environment, so fetch inline, briefly
+            prefetch, timeout = PrefetchMode.inline, settings.PREFETCH_LAMBDA_DEADLINE_SECONDS
+        if prefetch == PrefetchMode.inline:
+            details = await DetailsPrefetchService.fetch_details(species, timeout)
+            return PlantIdentificationResponse(
+                matches=result['matches'],
+                details={i: _to_prefetched_details(species[i], outcome) for i, outcome in details.items()}
+            )
+        DetailsPrefetchService.warm_cache(species)
+
+    # Return response based on service result
+    return PlantIdentificationResponse(matches=result['matches'])
+
+@router.post(
+    "/identify-plant/batch/",
+    response_model=BatchIdentificationResponse,
+    summary="Identify plants from several images, as one combined PlantNet query or as separate concurrent identifications",
+    status_code=status.HTTP_200_OK
+)
+async def identify_plant_batch(
+    files: List[UploadFile] = File(...),
+    organs: List[Organ] = Form(...),
+    combine: bool = Form(True),
+    settings = Depends(get_settings)
+):
+    if len(files) != len(organs):
+        raise PlantServiceException(
+            error_code=PlantServiceErrorCode.VALIDATION_ERROR,
+            message="Each image must have exactly one organ",
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            details={"files": len(files), "organs": len(organs)}
+        )
+    # A combined query is a single PlantNet request, so is limited by PlantNet rather than BATCH_MAX_IMAGES
+    max_images = PLANTNET_MAX_IMAGES if combine else settings.BATCH_MAX_IMAGES
+    if len(files) > max_images:
+        raise PlantServiceException(
+            error_code=PlantServiceErrorCode.VALIDATION_ERROR,
+            message=f"A maximum of {max_images} images can be sent in one {'combined ' if combine else ''}batch",
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+
+    contents = await asyncio.gather(*(file.read() for file in files))
+    images = [
+        PlantImage(content=content, organ=organ, filename=file.filename or "image.jpg")
+        for file, content, organ in zip(files, contents, organs)
+    ]
+    service = PlantIdentificationService()
+
+    # Send all images of the same plant (e.g. leaf + flower + bark) to PlantNet as one query
+    if combine:
+        result = await service.identify_images(images)
+        return BatchIdentificationResponse(results=[BatchIdentificationResult(matches=result['matches'])])
+
+    # Otherwise identify each image separately, with bounded concurrency
+    outcomes = await service.identify_batch([[image] for image in images], settings.BATCH_MAX_CONCURRENCY)
+    return BatchIdentificationResponse(results=[_to_batch_result(outcome) for outcome in outcomes])
+
+def _to_batch_result(outcome: Union[dict, PlantServiceException]) -> BatchIdentificationResult:
+    """Convert a service result or exception into a batch result entry."""
+    if isinstance(outcome, PlantServiceException):
+        return BatchIdentificationResult(
+            error=ErrorResponse(error_code=outcome.error_code.value, message=outcome.message, details=outcome.details)
+        )
+    return BatchIdentificationResult(matches=outcome['matches'])
+
+def _to_prefetched_details(species: str, outcome) -> PrefetchedDetails:
+    """
+    Convert prefetched details and their source, or the exception raised, into a response entry.
+
+    Prefetching is best effort, so incomplete details become an error entry rather than failing the identification.
+    """
+    if isinstance(outcome, PlantServiceException):
+        return PrefetchedDetails(
+            species=species,
+            error=ErrorResponse(error_code=outcome.error_code.value, message=outcome.message, details=outcome.details)
+        )
+    details, source = outcome
+    try:
+        return PrefetchedDetails(species=species, details=CombinedPlantDetailResponse(**details.to_dict(), source=source))
+    except ValidationError as e:
+        logger.warning(f"Prefetched details for '{species}' are incomplete: {e.errors(include_url=False)}")
+        return PrefetchedDetails(
+            species=species,
+            error=ErrorResponse(
+                error_code=PlantServiceErrorCode.VALIDATION_ERROR.value,
+                message="Plant details are incomplete",
+                details={"error": str(e)}
+            )
+        )
+
+async def _identify_from_disk(service: PlantIdentificationService, file: UploadFile, organ: Organ, upload_dir: str) -> dict:
+    """Save the uploaded file to disk, identify the plant from the saved copy, then remove it."""
     # Ensure uploads directory exists
-    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    os.makedirs(upload_dir, exist_ok=True)
     
     # Generate a unique filename
     file_extension = file.filename.split('.')[-1]
     unique_filename = f"{uuid.uuid4()}.{file_extension}"
-    file_location = os.path.join(settings.UPLOAD_DIR, unique_filename)
+    file_location = os.path.join(upload_dir, unique_filename)
 
     file_saved = False
     try:
@@ -42,11 +159,7 @@ async def identify_plant(
         logger.debug('File saved.')
         
         # Identify plant using PlantNet API
-        service = PlantIdentificationService()
-        result = service.identify_plant(file_location, organ)
-                
-        # Return response based on service result
-        return PlantIdentificationResponse(matches=result['matches'])
+        return await service.identify_plant(file_location, organ)
                     
     finally:
         # Remove file after processing
@@ -55,4 +168,3 @@ async def identify_plant(
                 os.remove(file_location)
             except Exception as e:
                 logger.error(f"Failed to remove temporary file: {e}")
-
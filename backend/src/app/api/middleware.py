@@ -0,0 +1,49 @@
+"""ASGI middleware reporting per-stage request timings (see app.metrics)."""
+from typing import Optional
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.metrics import emit_emf, start_request_timings
+
+class RequestTimingMiddleware:
+    """
+    Record the stage timings of each request, returning them in a Server-Timing header and logging them as EMF metrics.
+
+    The header lists the stages completed before the response starts, so for streamed responses it omits the
+    stages still running while the body is streamed. The EMF metrics are logged once the response has been
+    sent, and include every stage.
+
+    Args:
+        app (ASGIApp): App to wrap.
+        server_timing (bool): Whether to add the Server-Timing header.
+        emf_namespace (str, optional): CloudWatch namespace for EMF metrics, or None not to log them.
+    """
+    def __init__(self, app: ASGIApp, server_timing: bool = True, emf_namespace: Optional[str] = None):
+        self.app = app
+        self.server_timing = server_timing
+        self.emf_namespace = emf_namespace
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not (self.server_timing or self.emf_namespace):
+            await self.app(scope, receive, send)
+            return
+
+        timings = start_request_timings()
+        status_code = 500
+
+        async def send_with_timings(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    message.setdefault("headers", [])
+                    MutableHeaders(scope=message).append("Server-Timing", timings.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            if self.emf_namespace:
+                # Route path template (set by the router), so unmatched paths do not add dimension values
+                endpoint = getattr(scope.get("route"), "path", "unmatched")
+                request_id = getattr(scope.get("aws.context"), "aws_request_id", None)
+                emit_emf(timings.emf_records(self.emf_namespace, endpoint, status_code, request_id))
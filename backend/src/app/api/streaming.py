@@ -0,0 +1,88 @@
+"""Streaming responses emitting plant details section by section, as Server-Sent Events or newline-delimited JSON."""
+import json
+from typing import Any, AsyncGenerator, Optional, Tuple
+from fastapi import status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from app.exceptions import PlantServiceErrorCode, PlantServiceException
+from app.models import DetailsSource, ErrorResponse, PlantDetailResponse, StreamFormat
+import logging
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {StreamFormat.sse: "text/event-stream", StreamFormat.ndjson: "application/x-ndjson"}
+
+# Validators for each PlantDetailResponse section, so streamed sections have the same shape as full responses
+SECTION_ADAPTERS = {name: TypeAdapter(field.annotation) for name, field in PlantDetailResponse.model_fields.items()}
+
+def _validate_section(section: str, value: Any) -> Optional[Any]:
+    """Return the section value in its response shape, or None if it is not a PlantDetailResponse section."""
+    adapter = SECTION_ADAPTERS.get(section)
+    if adapter is None:
+        logger.warning(f"Skipping unexpected plant details section '{section}'")
+        return None
+    try:
+        return adapter.dump_python(adapter.validate_python(value), mode="json")
+    except ValidationError as e:
+        raise PlantServiceException(
+            error_code=PlantServiceErrorCode.VALIDATION_ERROR,
+            message=f"Invalid '{section}' section in plant details",
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            details={"error": str(e)}
+        )
+
+def _encode(event: str, data: dict, stream_format: StreamFormat) -> str:
+    if stream_format == StreamFormat.sse:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({"event": event, **data}) + "\n"
+
+async def _next_section(sections: AsyncGenerator[Tuple[str, Any], None]) -> Optional[Tuple[str, Any]]:
+    """Return the next valid section, or None when the stream is exhausted."""
+    async for section, value in sections:
+        value = _validate_section(section, value)
+        if value is not None:
+            return section, value
+    return None
+
+async def stream_sections(
+    sections: AsyncGenerator[Tuple[str, Any], None],
+    stream_format: StreamFormat,
+    source: DetailsSource
+) -> StreamingResponse:
+    """
+    Stream plant details sections to the client as each one becomes available.
+
+    Each section is sent as a 'section' event ({"section": name, "value": value}), followed by a 'done' event with
+    the source once all sections are sent. The first section is awaited before responding, so errors before any
+    content is available are returned as normal error responses with their status code; later errors are sent
+    as an 'error' event.
+
+    Args:
+        sections (AsyncGenerator[Tuple[str, Any], None]): Plant details sections as (name, value) pairs.
+        stream_format (StreamFormat): 'sse' for Server-Sent Events, or 'ndjson' for newline-delimited JSON.
+        source (DetailsSource): Source of the plant details.
+
+    Returns:
+        StreamingResponse: Response streaming the sections.
+    """
+    first = await _next_section(sections)
+
+    async def body():
+        try:
+            section = first
+            while section is not None:
+                yield _encode("section", {"section": section[0], "value": section[1]}, stream_format)
+                section = await _next_section(sections)
+            yield _encode("done", {"source": source.value}, stream_format)
+        except PlantServiceException as e:
+            logger.error(f"Plant details stream failed: {e.error_code.value} - {e.message}")
+            error = ErrorResponse(error_code=e.error_code.value, message=e.message, details=e.details)
+            yield _encode("error", error.model_dump(), stream_format)
+        finally:
+            await sections.aclose()
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[stream_format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,7 @@
+from .base import CacheEntry, make_cache_key, normalise_plant_name
+from .memory import LRUCache
+from .persistent import SqliteCache
+from .tiered import TieredCache, create_cache
+from .bktree import BKTree, PerceptualHashIndex, hamming_distance
+from .swr import StaleWhileRevalidateCache
+from .singleflight import SingleFlight
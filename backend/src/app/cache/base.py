@@ -0,0 +1,37 @@
+"""Common types and helpers for the response caches."""
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+@dataclass
+class CacheEntry:
+    """
+    Dataclass for a single cached value.
+
+    Attributes:
+        value (Any): Cached value (must be JSON-serialisable for persistent backends)
+        stored_at (float): Unix timestamp when the value was stored
+        expires_at (Optional[float]): Unix timestamp after which the value is expired, or None if it never expires
+    """
+    value: Any
+    stored_at: float
+    expires_at: Optional[float] = None
+
+    @property
+    def age(self) -> float:
+        """Seconds since the value was stored."""
+        return time.time() - self.stored_at
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return self.expires_at is not None and (now or time.time()) >= self.expires_at
+
+def make_cache_key(*parts: Any) -> str:
+    """Build a stable cache key from JSON-serialisable parts."""
+    raw = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def normalise_plant_name(name: str) -> str:
+    """Normalise a plant name for use in cache keys (case-folded, single-spaced)."""
+    return " ".join(name.casefold().split())
@@ -0,0 +1,120 @@
+"""Hamming-distance index of perceptual image hashes, for near-duplicate lookups."""
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+class _BKNode:
+    __slots__ = ("key", "value", "children")
+
+    def __init__(self, key: int, value: Any):
+        self.key = key
+        self.value = value
+        self.children: Dict[int, "_BKNode"] = {}
+
+class BKTree:
+    """
+    Burkhard-Keller tree over integer hashes using Hamming distance.
+
+    Searching for all keys within distance d only visits subtrees whose edge distance lies in
+    [dist - d, dist + d], so lookups touch a small fraction of the stored hashes.
+    """
+    def __init__(self):
+        self._root: Optional[_BKNode] = None
+        self._size = 0
+
+    def add(self, key: int, value: Any) -> None:
+        """Insert a hash, replacing the value if the exact hash is already present."""
+        if self._root is None:
+            self._root = _BKNode(key, value)
+            self._size = 1
+            return
+        node = self._root
+        while True:
+            distance = hamming_distance(key, node.key)
+            if distance == 0:
+                node.value = value
+                return
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _BKNode(key, value)
+                self._size += 1
+                return
+            node = child
+
+    def search(self, key: int, max_distance: int) -> List[Tuple[int, int, Any]]:
+        """Return (distance, key, value) for all hashes within max_distance, nearest first."""
+        results = []
+        candidates = [self._root] if self._root else []
+        while candidates:
+            node = candidates.pop()
+            distance = hamming_distance(key, node.key)
+            if distance <= max_distance:
+                results.append((distance, node.key, node.value))
+            low, high = distance - max_distance, distance + max_distance
+            candidates.extend(child for edge, child in node.children.items() if low <= edge <= high)
+        return sorted(results, key=lambda result: result[0])
+
+    def __len__(self) -> int:
+        return self._size
+
+class PerceptualHashIndex:
+    """
+    Thread-safe, size-bounded index of perceptual hashes, partitioned by a context key.
+
+    The context (e.g. organ and PlantNet settings) keeps results for different queries apart. When the
+    index grows past max_entries the oldest hashes are dropped and the affected trees rebuilt. Hashes older
+    than ttl are ignored by lookups (and dropped with the oldest), so results are not served past the age
+    they would have expired at in the exact-match cache.
+
+    Args:
+        max_entries (int): Maximum number of hashes retained across all contexts.
+        ttl (float, optional): Seconds a hash is used for after being added. None means hashes never expire.
+    """
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._trees: Dict[str, BKTree] = {}
+        self._order: Deque[Tuple[str, int]] = deque()
+        self._values: Dict[Tuple[str, int], Any] = {}
+        self._lock = threading.Lock()
+
+    def add(self, context: str, phash: int, value: Any) -> None:
+        with self._lock:
+            entry_key = (context, phash)
+            if entry_key not in self._values:
+                self._order.append(entry_key)
+            # Stored with the time added, so expired hashes can be skipped
+            stored = (time.time(), value)
+            self._values[entry_key] = stored
+            self._trees.setdefault(context, BKTree()).add(phash, stored)
+
+            # Evict in batches, so trees are rebuilt at most once per ~10% of max_entries inserts
+            if len(self._order) > self.max_entries * 1.1:
+                while len(self._order) > self.max_entries:
+                    del self._values[self._order.popleft()]
+                self._rebuild()
+
+    def nearest(self, context: str, phash: int, max_distance: int) -> Optional[Tuple[int, Any, float]]:
+        """Return (distance, value, time added) for the closest unexpired hash within max_distance in this context, or None."""
+        with self._lock:
+            tree = self._trees.get(context)
+            if tree is None:
+                return None
+            results = tree.search(phash, max_distance)
+        oldest = time.time() - self.ttl if self.ttl is not None else None
+        for distance, _, (stored_at, value) in results:
+            if oldest is None or stored_at >= oldest:
+                return distance, value, stored_at
+        return None
+
+    def _rebuild(self) -> None:
+        self._trees = {}
+        for context, phash in self._order:
+            self._trees.setdefault(context, BKTree()).add(phash, self._values[(context, phash)])
+
+    def __len__(self) -> int:
+        return len(self._order)
@@ -0,0 +1,60 @@
+"""In-process LRU cache with per-entry TTL."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from app.cache.base import CacheEntry
+
+class LRUCache:
+    """
+    Thread-safe in-memory cache with least-recently-used eviction and TTL expiry.
+
+    Args:
+        max_entries (int): Maximum number of entries before the least recently used is evicted.
+        ttl (float, optional): Default time-to-live in seconds. None means entries never expire.
+    """
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for key (marking it recently used), or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.is_expired():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        return entry.value if entry else None
+
+    def set_entry(self, key: str, entry: CacheEntry) -> None:
+        """Store an existing entry, preserving its timestamps."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        self.set_entry(key, CacheEntry(value=value, stored_at=now, expires_at=now + ttl if ttl is not None else None))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,102 @@
+"""SQLite-backed persistent cache, shared by all caches through namespaces."""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+from app.cache.base import CacheEntry
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SqliteCache:
+    """
+    Persistent cache storing JSON-serialised values in a SQLite file.
+
+    Several caches can share one database file, each using its own namespace.
+
+    Args:
+        path (str): Path to the SQLite database file (parent directories are created).
+        namespace (str): Namespace isolating this cache's keys from other caches in the same file.
+        ttl (float, optional): Default time-to-live in seconds. None means entries never expire.
+    """
+    def __init__(self, path: str, namespace: str = "default", ttl: Optional[float] = None):
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL,
+                PRIMARY KEY (namespace, key)
+            )"""
+        )
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for key, or None if missing, expired or unreadable."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, stored_at, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)
+                ).fetchone()
+            if row is None:
+                return None
+            entry = CacheEntry(value=json.loads(row[0]), stored_at=row[1], expires_at=row[2])
+            if entry.is_expired():
+                self.delete(key)
+                return None
+            return entry
+        except (sqlite3.Error, json.JSONDecodeError) as e:
+            logger.warning(f"Failed to read '{self.namespace}' cache entry: {e}")
+            return None
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        return entry.value if entry else None
+
+    def set_entry(self, key: str, entry: CacheEntry) -> None:
+        """Store an existing entry, preserving its timestamps."""
+        try:
+            value = json.dumps(entry.value)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (namespace, key, value, stored_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    (self.namespace, key, value, entry.stored_at, entry.expires_at)
+                )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Failed to write '{self.namespace}' cache entry: {e}")
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        self.set_entry(key, CacheEntry(value=value, stored_at=now, expires_at=now + ttl if ttl is not None else None))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+
+    def purge_expired(self) -> int:
+        """Delete expired entries in this namespace and return how many were removed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND expires_at IS NOT NULL AND expires_at <= ?",
+                (self.namespace, time.time())
+            )
+        return cursor.rowcount
@@ -0,0 +1,67 @@
+"""Single-flight coalescing of concurrent identical calls."""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into one shared call.
+
+    The first caller for a key starts the call; callers arriving while it is in flight await the same result
+    (or exception) instead of starting their own. The call is only cancelled once every caller waiting on it has
+    been cancelled, and the key is released as soon as it completes, so later calls start afresh.
+
+    Args:
+        name (str): Name used in log messages.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the result of call(), sharing one in-flight call between concurrent callers with the same key.
+
+        Args:
+            key (str): Key identifying equivalent calls.
+            call (Callable[[], Awaitable[Any]]): Coroutine function making the call.
+
+        Returns:
+            Any: Result of the shared call.
+
+        Raises:
+            Exception: Whatever the shared call raised.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.create_task(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        else:
+            logger.info(f"Joining in-flight {self.name} call for '{key}'")
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            # Shield the shared call, so one caller being cancelled does not cancel it for the others
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters.get(key) == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def _release(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved, in case every caller was cancelled before it was raised
+        if not task.cancelled():
+            task.exception()
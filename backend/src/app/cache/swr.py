@@ -0,0 +1,73 @@
+"""Stale-while-revalidate wrapper around a TieredCache."""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from app.cache.tiered import TieredCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+class StaleWhileRevalidateCache:
+    """
+    Serve cached values immediately, refreshing them in the background once they go stale.
+
+    Entries younger than fresh_ttl are returned as-is. Older entries are still returned (until they are
+    fresh_ttl + stale_ttl old and expire from the underlying cache) while a single background task per key
+    re-fetches them. Misses are fetched inline.
+
+    Args:
+        cache (TieredCache): Underlying cache; its entries should expire after fresh_ttl + stale_ttl.
+        fresh_ttl (float): Age in seconds after which an entry is revalidated.
+        stale_ttl (float): Additional seconds a stale entry may be served while it is revalidated.
+    """
+    def __init__(self, cache: TieredCache, fresh_ttl: float, stale_ttl: float):
+        self.cache = cache
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def set(self, key: str, value: Any) -> None:
+        self.cache.set(key, value, ttl=self.fresh_ttl + self.stale_ttl)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value (fresh or stale) without triggering a refresh."""
+        return self.cache.get(key)
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for key, fetching it on a miss and revalidating it in the background if stale.
+
+        Args:
+            key (str): Cache key.
+            fetch (Callable[[], Awaitable[Any]]): Coroutine function producing a fresh, JSON-serialisable value.
+
+        Returns:
+            Any: Cached or freshly fetched value.
+        """
+        entry = self.cache.get_entry(key)
+        if entry is not None:
+            if entry.age > self.fresh_ttl:
+                logger.debug(f"Serving stale cache entry for '{key}' while revalidating")
+                self._schedule_refresh(key, fetch)
+            return entry.value
+
+        value = await fetch()
+        self.set(key, value)
+        return value
+
+    def _schedule_refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(self._refresh(key, fetch))
+        self._refreshing[key] = task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            self.set(key, await fetch())
+            logger.debug(f"Revalidated cache entry for '{key}'")
+        except Exception as e:
+            logger.warning(f"Background refresh failed for '{key}', keeping stale entry: {e}")
+        finally:
+            self._refreshing.pop(key, None)
@@ -0,0 +1,77 @@
+"""Two-tier cache combining the in-process LRU with an optional persistent backend."""
+import time
+from typing import Any, Optional
+from app.cache.base import CacheEntry
+from app.cache.memory import LRUCache
+from app.cache.persistent import SqliteCache
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TieredCache:
+    """
+    Cache that reads from memory first, then falls back to the persistent backend (if configured).
+
+    Persistent hits are promoted into memory with their original expiry, and writes go to both tiers.
+
+    Args:
+        memory (LRUCache): In-process cache tier.
+        persistent (SqliteCache, optional): Persistent cache tier.
+    """
+    def __init__(self, memory: LRUCache, persistent: Optional[SqliteCache] = None):
+        self.memory = memory
+        self.persistent = persistent
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        entry = self.memory.get_entry(key)
+        if entry is not None:
+            return entry
+        if self.persistent is not None:
+            entry = self.persistent.get_entry(key)
+            if entry is not None:
+                self.memory.set_entry(key, entry)
+                return entry
+        return None
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        return entry.value if entry else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        ttl = self.memory.ttl if ttl is None else ttl
+        entry = CacheEntry(value=value, stored_at=now, expires_at=now + ttl if ttl is not None else None)
+        self.memory.set_entry(key, entry)
+        if self.persistent is not None:
+            self.persistent.set_entry(key, entry)
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.persistent is not None:
+            self.persistent.delete(key)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.persistent is not None:
+            self.persistent.clear()
+
+def create_cache(namespace: str, max_entries: int, ttl: Optional[float]) -> TieredCache:
+    """
+    Create a TieredCache, adding a SQLite tier when settings.CACHE_DB_PATH is set.
+
+    Args:
+        namespace (str): Namespace for this cache's keys in the shared SQLite file.
+        max_entries (int): Maximum entries held in memory.
+        ttl (float, optional): Default time-to-live in seconds.
+
+    Returns:
+        TieredCache: The configured cache.
+    """
+    persistent = None
+    if settings.CACHE_DB_PATH:
+        try:
+            persistent = SqliteCache(settings.CACHE_DB_PATH, namespace=namespace, ttl=ttl)
+        except Exception as e:
+            logger.error(f"Failed to open persistent cache at {settings.CACHE_DB_PATH}, using memory only: {e}")
+    return TieredCache(LRUCache(max_entries=max_entries, ttl=ttl), persistent)
@@ -1,15 +1,18 @@
 import os
 import sys
 import logging
-from typing import Optional, Literal
-from pydantic import Field, computed_field
+from typing import Dict, Optional, Literal, Set
+from pydantic import Field, PrivateAttr, computed_field
 from pydantic_settings import BaseSettings
-import boto3
 from functools import lru_cache
+from app.secret_store import SecretStore, get_secret_store
 
 logger = logging.getLogger(__name__)
 LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
 
+# Secrets loaded from AWS SSM Parameter Store when running in AWS (unless set in the environment)
+SSM_SECRET_NAMES = ("PLANTNET_API_KEY", "ANTHROPIC_API_KEY")
+
 class Settings(BaseSettings):
     # API keys (will be populated from .env or AWS SSM Parameter Store)
     PLANTNET_API_KEY: Optional[str] = None
@@ -21,18 +24,106 @@ class Settings(BaseSettings):
 
     # Application settings with defaults
     UPLOAD_DIR: str = "/tmp/uploads"
+    UPLOAD_MODE: Literal["memory", "disk"] = "memory"  # 'disk' saves uploads to UPLOAD_DIR before sending to PlantNet
     RHS_BASE_URL: str = "https://www.rhs.org.uk/plants/search-results?query="
+    RHS_PLANTS_URL: str = "https://www.rhs.org.uk/plants"  # plant details pages are at {RHS_PLANTS_URL}/{id}/{name}/details
     RHS_SEARCH_API_URL: str = "https://lwapp-uks-prod-psearch-01.azurewebsites.net/api/v1/plants/search"
+    RHS_HTML_PARSER: Literal["lxml", "html.parser", "lxml-xpath"] = "lxml-xpath"  # backend for parsing RHS plant details pages
+    RHS_MATCH_MIN_SIMILARITY: float = 0.85  # minimum trigram similarity for a fuzzy RHS search match
 
     # PlantNet API settings with defaults
+    PLANTNET_API_URL: str = "https://my-api.plantnet.org"
     PROJECT: str = "all"
     NUM_RESULTS: int = 3
     SIMSEARCH: bool = True
+    PLANTNET_TIMEOUT: float = 20.0
+
+    # Image normalisation before upload to PlantNet (strip EXIF, downsize, re-encode as JPEG)
+    IMAGE_NORMALISE_ENABLED: bool = True
+    IMAGE_MAX_EDGE: int = 1280
+    IMAGE_JPEG_QUALITY: int = 85
+
+    # Separate (combine=false) batch identification limits; combined batches are limited to PlantNet's 5 images
+    BATCH_MAX_IMAGES: int = 10
+    BATCH_MAX_CONCURRENCY: int = 3
+
+    # Upstream HTTP connection pool settings
+    HTTP_TIMEOUT: float = 10.0
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    LLM_TIMEOUT: float = 60.0
+    ANTHROPIC_BASE_URL: Optional[str] = None  # defaults to the Anthropic API
+
+    # Upstream clients are opened at startup, with their connections pre-warmed
+    HTTP_PREWARM_ENABLED: bool = True
+    HTTP_PREWARM_TIMEOUT: float = 3.0
+
+    # Cache settings (caches are persisted to SQLite at CACHE_DB_PATH, or held in memory only if unset)
+    CACHE_DB_PATH: Optional[str] = "/tmp/cache/garden_glossary.db"
+    ID_CACHE_ENABLED: bool = True
+    ID_CACHE_MAX_ENTRIES: int = 256
+    ID_CACHE_TTL_SECONDS: int = 86400
+
+    # Near-duplicate image lookup, answering from past matches within PHASH_MAX_DISTANCE bits (of 64)
+    PHASH_INDEX_ENABLED: bool = True
+    PHASH_ALGORITHM: Literal["dhash", "phash"] = "dhash"
+    PHASH_MAX_DISTANCE: int = 4
+    PHASH_INDEX_MAX_ENTRIES: int = 1024
+
+    # RHS details cache (stale entries are served for up to RHS_CACHE_STALE_SECONDS while refreshed in the background)
+    RHS_CACHE_ENABLED: bool = True
+    RHS_CACHE_MAX_ENTRIES: int = 512
+    RHS_CACHE_TTL_SECONDS: int = 604800
+    RHS_CACHE_STALE_SECONDS: int = 2592000
+    RHS_SEARCH_CACHE_TTL_SECONDS: int = 86400
+    RHS_NEGATIVE_CACHE_TTL_SECONDS: int = 21600
+
+    # LLM details request: 'tool' has Claude fill a schema generated from PlantDetailResponse, 'json' describes the
+    # JSON structure in the prompt. With LLM_PROMPT_CACHING, the static tool prefix is prompt-cached once it is long
+    # enough for the model (2048 tokens for Haiku, 1024 otherwise); the current prefix is around 500 tokens
+    LLM_OUTPUT_MODE: Literal["tool", "json"] = "tool"
+    LLM_MAX_TOKENS: int = 600
+    LLM_PROMPT_CACHING: bool = True
+
+    # LLM details cache, keyed by model and prompt version so prompt changes invalidate it
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 512
+    LLM_CACHE_TTL_SECONDS: int = 2592000
+
+    # Combined details endpoint: seconds to wait for RHS before also asking the LLM
+    HEDGE_DELAY_SECONDS: float = 2.0
+
+    # Details prefetched for the top PREFETCH_TOP_K identification matches scoring at least PREFETCH_MIN_SCORE
+    PREFETCH_TOP_K: int = 1
+    PREFETCH_MIN_SCORE: float = 0.5
+    # In AWS Lambda, background ('cache') prefetches would be frozen with the environment once the response is
+    # returned, so they are fetched inline instead, waiting at most this long
+    PREFETCH_LAMBDA_DEADLINE_SECONDS: float = 2.0
+
+    # Local RHS catalogue built offline by app.jobs.rhs_crawler, consulted before scraping RHS (unset to disable)
+    RHS_CATALOGUE_PATH: Optional[str] = None
+
+    # Per-stage request timings, returned in Server-Timing headers and logged to stdout as CloudWatch Embedded Metric
+    # Format metrics (by default only when running in AWS)
+    SERVER_TIMING_ENABLED: bool = True
+    METRICS_EMF_ENABLED: Optional[bool] = None
+    METRICS_NAMESPACE: str = "GardenGlossary"
+
+    # SSM secrets are cached in memory and refreshed every SECRETS_TTL_SECONDS; with SECRETS_CACHE_KEY (a Fernet key)
+    # they are also cached in an encrypted file at SECRETS_CACHE_PATH, which survives Lambda runtime restarts
+    SSM_REGION: str = "eu-west-2"
+    SECRETS_TTL_SECONDS: int = 900
+    SECRETS_CACHE_PATH: Optional[str] = "/tmp/cache/secrets.enc"
+    SECRETS_CACHE_KEY: Optional[str] = None
+
+    # Names of the secrets whose values came from SSM (and so follow rotations)
+    _ssm_secret_names: Set[str] = PrivateAttr(default_factory=set)
 
     # Define PLANTNET_ENDPOINT dynamically so it updates if other settings change
     @computed_field
     def PLANTNET_ENDPOINT(self) -> str:
-        return f"https://my-api.plantnet.org/v2/identify/{self.PROJECT}?api-key={self.PLANTNET_API_KEY}&nb-results={self.NUM_RESULTS}&include-related-images={self.SIMSEARCH}"
+        return f"{self.PLANTNET_API_URL}/v2/identify/{self.PROJECT}?api-key={self.PLANTNET_API_KEY}&nb-results={self.NUM_RESULTS}&include-related-images={self.SIMSEARCH}"
 
     class Config:
         env_file = ".env"
@@ -45,25 +136,43 @@ class Settings(BaseSettings):
 
         # Then check AWS SSM Parameter Store if running in AWS
         if self._is_running_in_aws():
-            self._load_ssm_parameters(names=["PLANTNET_API_KEY", "ANTHROPIC_API_KEY"])
+            self._load_ssm_parameters()
 
     def _is_running_in_aws(self) -> bool:
         """Check if the application is running in an AWS environment."""
         return os.getenv("AWS_EXECUTION_ENV") is not None
 
-    def _load_ssm_parameters(self, names: list, region_name: str = "eu-west-2", with_decryption: bool = True) -> dict:
-        """Load secrets from AWS SSM Parameter Store into settings."""
-        try:
-            ssm_client = boto3.client("ssm", region_name=region_name)
-            response = ssm_client.get_parameters(Names=names, WithDecryption=with_decryption)
-            secrets = {param["Name"]: param["Value"] for param in response["Parameters"]}
-            
-            # Update any None values with secrets
-            for key, value in secrets.items():
-                if hasattr(self, key) and getattr(self, key) is None:
-                    setattr(self, key, value)
-        except Exception as e:
-            logger.error(f"Error retrieving AWS SSM Parameters: {e}")
+    def emf_metrics_enabled(self) -> bool:
+        """Whether to log EMF metrics: as METRICS_EMF_ENABLED if set, otherwise only when running in AWS."""
+        if self.METRICS_EMF_ENABLED is not None:
+            return self.METRICS_EMF_ENABLED
+        return self._is_running_in_aws()
+
+    def background_tasks_supported(self) -> bool:
+        """Whether tasks can keep running after the response is returned (not in AWS Lambda, which freezes them)."""
+        return not self._is_running_in_aws()
+
+    def secret_store(self) -> Optional[SecretStore]:
+        """Return the SecretStore shared by all Settings instances, or None if not running in AWS."""
+        if not self._is_running_in_aws():
+            return None
+        return get_secret_store(
+            SSM_SECRET_NAMES, self.SSM_REGION, self.SECRETS_TTL_SECONDS, self.SECRETS_CACHE_PATH, self.SECRETS_CACHE_KEY
+        )
+
+    def _load_ssm_parameters(self) -> None:
+        """Load secrets from AWS SSM Parameter Store into settings, and keep them updated when refreshed."""
+        store = self.secret_store()
+        # The first Settings instance loads the secrets; later ones are served from the store's cache
+        store.get_all()
+        store.subscribe(self._apply_secrets)
+
+    def _apply_secrets(self, secrets: Dict[str, str]) -> None:
+        """Apply secret values, keeping any set in the environment but following rotations of those from SSM."""
+        for key, value in secrets.items():
+            if hasattr(self, key) and (getattr(self, key) is None or key in self._ssm_secret_names):
+                setattr(self, key, value)
+                self._ssm_secret_names.add(key)
     
     def setup_logging(self):
         """Configure logging for AWS Lambda and CloudWatch compatibility."""
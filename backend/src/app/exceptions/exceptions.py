@@ -49,3 +49,22 @@ class PlantServiceException(Exception):
     def __str__(self):
         return f"{self.error_code.value}: {self.message}"
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialise the exception, e.g. to cache a known failure."""
+        return {
+            "error_code": self.error_code.name,
+            "message": self.message,
+            "status_code": self.status_code,
+            "details": self.details
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PlantServiceException":
+        """Rebuild an exception serialised with to_dict."""
+        return cls(
+            error_code=PlantServiceErrorCode[data["error_code"]],
+            message=data["message"],
+            status_code=data["status_code"],
+            details=data.get("details")
+        )
+
@@ -0,0 +1,200 @@
+"""
+Offline crawler building the local RHS plant catalogue.
+
+Lists plants page by page from the RHS search API, then fetches and parses each plant's details page with bounded
+concurrency and a politeness delay between requests. Progress is checkpointed in the catalogue, so an interrupted
+crawl resumes where it stopped, and later runs only fetch new, failed or stale entries.
+
+Usage (from backend/src):
+    python -m app.jobs.rhs_crawler [--db PATH] [--concurrency N] [--delay SECONDS] [--max-age-days DAYS]
+"""
+import argparse
+import asyncio
+import time
+from typing import Optional
+from fastapi import status
+from app.config import settings
+from app.services.rhs_catalogue import RhsCatalogue, STATUS_ERROR, STATUS_OK, STATUS_SUMMARY
+from app.exceptions import PlantServiceErrorCode, PlantServiceException
+from app.services.plant_details_rhs import PlantScraper
+from app.services.species_matching import normalise_name, strip_markup
+import logging
+
+logger = logging.getLogger(__name__)
+
+class PoliteLimiter:
+    """Space out request starts by at least delay seconds, however many workers are running."""
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_start > now:
+                await asyncio.sleep(self._next_start - now)
+            self._next_start = max(now, self._next_start) + self.delay
+
+class RhsCatalogueCrawler:
+    """
+    Crawl the RHS search API and plant details pages into an RhsCatalogue.
+
+    Args:
+        catalogue (RhsCatalogue): Catalogue to fill, which also stores the crawl checkpoint.
+        scraper (PlantScraper): Scraper used for search and details requests.
+        keywords (str): Search keywords listing the plants to crawl ('' for the whole catalogue).
+        page_size (int): Search results requested per page.
+        concurrency (int): Maximum number of details pages fetched at once.
+        delay (float): Minimum seconds between the start of consecutive requests.
+        max_age (float, optional): Seconds after which listings and fetched details are refreshed. None never refreshes.
+    """
+    def __init__(self, catalogue: RhsCatalogue, scraper: PlantScraper, keywords: str = "", page_size: int = 100,
+                 concurrency: int = 4, delay: float = 1.0, max_age: Optional[float] = None):
+        self.catalogue = catalogue
+        self.scraper = scraper
+        self.keywords = keywords
+        self.page_size = page_size
+        self.concurrency = max(1, concurrency)
+        self.limiter = PoliteLimiter(delay)
+        self.max_age = max_age
+
+    def _listing_due(self) -> bool:
+        """Check whether a listing is in progress, or the last complete listing is missing or stale."""
+        if self.catalogue.get_state("list_keywords") != self.keywords:
+            return True
+        if self.catalogue.get_state("list_start") is not None:
+            return True
+        completed_at = self.catalogue.get_state("list_completed_at")
+        if completed_at is None:
+            return True
+        return self.max_age is not None and time.time() - float(completed_at) > self.max_age
+
+    async def crawl_listing(self) -> int:
+        """
+        List plants from the search API into the catalogue, resuming from the last checkpointed page.
+
+        Returns:
+            int: Number of plants listed in this run.
+        """
+        if not self._listing_due():
+            logger.info("Catalogue listing is up to date")
+            return 0
+
+        if self.catalogue.get_state("list_keywords") != self.keywords:
+            self.catalogue.set_state("list_keywords", self.keywords)
+            self.catalogue.set_state("list_start", "0")
+        start_from = int(self.catalogue.get_state("list_start", "0"))
+        self.catalogue.set_state("list_start", str(start_from))
+
+        listed = 0
+        while True:
+            await self.limiter.wait()
+            page = await self.scraper.search_rhs_page(self.keywords, start_from, self.page_size)
+            hits = page.get('hits', [])
+            urls = {
+                hit['id']: self.scraper._get_match_link(hit, normalise_name(strip_markup(hit.get('botanicalName'))))
+                for hit in hits if hit.get('id') is not None
+            }
+            listed += self.catalogue.upsert_listing(hits, urls)
+            start_from += len(hits)
+            total = page.get('totalHits', 0)
+            logger.info(f"Listed {start_from}/{total} plants")
+
+            if not hits or start_from >= total:
+                break
+            # Checkpoint after every page, so an interrupted listing resumes from here
+            self.catalogue.set_state("list_start", str(start_from))
+
+        self.catalogue.set_state("list_completed_at", str(time.time()))
+        self.catalogue.delete_state("list_start")
+        return listed
+
+    async def _fetch_details(self, plant_id: int) -> str:
+        """Fetch, parse and store one plant's details, returning the outcome."""
+        url = self.catalogue.get_url(plant_id)
+        await self.limiter.wait()
+        try:
+            details = await self.scraper.get_rhs_details(url)
+        except PlantServiceException as e:
+            # Summary-only pages are a final answer, anything else is retried on the next crawl
+            if e.error_code == PlantServiceErrorCode.NO_RESULTS_FOUND and e.status_code == status.HTTP_404_NOT_FOUND:
+                self.catalogue.record_details(plant_id, STATUS_SUMMARY)
+                return STATUS_SUMMARY
+            logger.warning(f"Failed to fetch details for plant {plant_id}: {e.message}")
+            self.catalogue.record_error(plant_id, e.message)
+            return STATUS_ERROR
+        self.catalogue.record_details(plant_id, STATUS_OK, details.to_dict())
+        return STATUS_OK
+
+    async def crawl_details(self, limit: Optional[int] = None) -> dict:
+        """
+        Fetch details for new, failed and stale plants, with at most `concurrency` requests in flight.
+
+        Args:
+            limit (int, optional): Maximum number of details pages to fetch in this run.
+
+        Returns:
+            dict: Number of plants fetched by outcome.
+        """
+        plant_ids = self.catalogue.ids_to_fetch(self.max_age, limit)
+        logger.info(f"Fetching details for {len(plant_ids)} plants")
+        queue: asyncio.Queue = asyncio.Queue()
+        for plant_id in plant_ids:
+            queue.put_nowait(plant_id)
+        outcomes: dict = {}
+
+        async def worker():
+            while True:
+                try:
+                    plant_id = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                outcome = await self._fetch_details(plant_id)
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+                done = sum(outcomes.values())
+                if done % 100 == 0:
+                    logger.info(f"Fetched details for {done}/{len(plant_ids)} plants")
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        return outcomes
+
+    async def run(self, list_plants: bool = True, fetch_details: bool = True, limit: Optional[int] = None) -> dict:
+        """Run the listing and details phases, returning a summary of the crawl."""
+        listed = await self.crawl_listing() if list_plants else 0
+        fetched = await self.crawl_details(limit) if fetch_details else {}
+        return {'listed': listed, 'fetched': fetched, 'catalogue': self.catalogue.counts()}
+
+async def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Crawl the RHS plant catalogue into a local SQLite database.")
+    parser.add_argument("--db", default=settings.RHS_CATALOGUE_PATH or "rhs_catalogue.db", help="Catalogue database path")
+    parser.add_argument("--keywords", default="", help="Search keywords to crawl (default: all plants)")
+    parser.add_argument("--page-size", type=int, default=100, help="Search results per page")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum concurrent details requests")
+    parser.add_argument("--delay", type=float, default=1.0, help="Minimum seconds between requests")
+    parser.add_argument("--max-age-days", type=float, default=None, help="Refresh entries older than this many days")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum details pages to fetch in this run")
+    parser.add_argument("--list-only", action="store_true", help="Only list plants, without fetching details")
+    parser.add_argument("--details-only", action="store_true", help="Only fetch details for plants already listed")
+    args = parser.parse_args(argv)
+
+    settings.setup_logging()
+    catalogue = RhsCatalogue(args.db)
+    crawler = RhsCatalogueCrawler(
+        catalogue,
+        PlantScraper(base_url=settings.RHS_BASE_URL),
+        keywords=args.keywords,
+        page_size=args.page_size,
+        concurrency=args.concurrency,
+        delay=args.delay,
+        max_age=args.max_age_days * 86400 if args.max_age_days is not None else None
+    )
+    try:
+        summary = await crawler.run(list_plants=not args.details_only, fetch_details=not args.list_only, limit=args.limit)
+        logger.info(f"Crawl complete: {summary}")
+    finally:
+        catalogue.close()
+        await PlantScraper.get_http_client().aclose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,6 @@
 import os
 import sys
+from contextlib import asynccontextmanager
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from fastapi import FastAPI, Request
@@ -9,10 +10,25 @@ from mangum import Mangum
 
 from app.config import settings, lambda_logging_context
 from app.models import ErrorResponse
-from app.api.endpoints import plant_identification, plant_details_rhs, plant_details_llm
+from app.api.endpoints import plant_identification, plant_details, plant_details_rhs, plant_details_llm
 from app.exceptions import PlantServiceException
+from app.services.upstream import open_upstream_clients, close_upstream_clients
+from app.api.middleware import RequestTimingMiddleware
 import logging
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open (and pre-warm) the shared upstream clients for the lifetime of the app."""
+    await open_upstream_clients()
+    # Pick up rotated secrets without a redeploy
+    secret_store = settings.secret_store()
+    if secret_store is not None:
+        secret_store.start_background_refresh()
+    yield
+    # Mangum runs the lifespan around every invocation, so on Lambda keep the clients open for the next warm invocation
+    if os.getenv("AWS_EXECUTION_ENV") is None:
+        await close_upstream_clients()
+
 def create_application() -> FastAPI:
     # Configure logging globally
     settings.setup_logging()
@@ -26,12 +42,23 @@ def create_application() -> FastAPI:
         # API service for identifying a plant from an image and providing cultivation details.
         
         ## Features:
-        * identify-plant: Passes an uploaded image and 'organ' to the PlantNet API, to return the 3 most likely species matches.
+        * identify-plant: Passes an uploaded image and 'organ' to the PlantNet API, to return the 3 most likely species matches (optionally prefetching plant details for confident matches).
+        * identify-plant/batch: Passes several images and organs to the PlantNet API, as one combined query or as separate identifications.
         * plant-details-rhs: Searches RHS website for requested plant species and returns key cultivation details.
         * plant-details-llm: Fallback service if plant-details-rhs fails - calls Anthropic API to return plant details in same style and format as plant-details-rhs service.
-        """
+        * plant-details-rhs/stream, plant-details-llm/stream: Stream plant details section by section (Server-Sent Events or NDJSON), so the app can show each section as soon as it is available.
+        * plant-details: Combines plant-details-rhs and plant-details-llm, asking the LLM concurrently if RHS is slow or fails, and reports which source answered.
+        """,
+        lifespan=lifespan
     )
     
+    # Time the stages of each request, for Server-Timing headers and CloudWatch metrics
+    app.add_middleware(
+        RequestTimingMiddleware,
+        server_timing=settings.SERVER_TIMING_ENABLED,
+        emf_namespace=settings.METRICS_NAMESPACE if settings.emf_metrics_enabled() else None
+    )
+
     # Add CORS middleware to allow requests from mobile app
     app.add_middleware(
         CORSMiddleware,
@@ -62,6 +89,7 @@ def create_application() -> FastAPI:
  
     # Include routers
     app.include_router(plant_identification.router, prefix="/api/v1")
+    app.include_router(plant_details.router, prefix="/api/v1")
     app.include_router(plant_details_rhs.router, prefix="/api/v1")
     app.include_router(plant_details_llm.router, prefix="/api/v1")
 
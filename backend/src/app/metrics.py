@@ -0,0 +1,154 @@
+"""Per-request stage timings, returned as Server-Timing headers and logged as CloudWatch Embedded Metric Format (EMF)."""
+import json
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional
+from app.exceptions import PlantServiceException
+import logging
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class StageTiming:
+    """
+    Dataclass for the timing of one stage of a request (e.g. the RHS search, or parsing its details page).
+
+    Attributes:
+        name (str): Stage name, e.g. 'rhs_search'
+        duration_ms (float): Time taken in milliseconds
+        cache (str, optional): Cache outcome for cache lookups ('hit' or 'miss')
+        status (str, optional): Upstream HTTP status, or the type of the error raised
+    """
+    name: str
+    duration_ms: float = 0.0
+    cache: Optional[str] = None
+    status: Optional[str] = None
+
+@dataclass
+class RequestTimings:
+    """Stage timings recorded while handling one request."""
+    started: float = field(default_factory=time.perf_counter)
+    stages: List[StageTiming] = field(default_factory=list)
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self) -> str:
+        """Server-Timing header value listing each stage, with its cache outcome and upstream status, and the total so far."""
+        metrics = []
+        for stage in self.stages:
+            description = " ".join(f"{k}={v}" for k, v in (("cache", stage.cache), ("status", stage.status)) if v is not None)
+            metrics.append(f"{stage.name};dur={stage.duration_ms:.1f}" + (f';desc="{description}"' if description else ""))
+        metrics.append(f"total;dur={self.elapsed_ms:.1f}")
+        return ", ".join(metrics)
+
+    def emf_records(self, namespace: str, endpoint: str, status_code: int, request_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        CloudWatch EMF records for the request latency, and for each stage's latency.
+
+        Stage latency is reported by endpoint and stage, and also by cache outcome and upstream status where known.
+        Each record is a separate log line, as the dimensions differ between stages.
+
+        Args:
+            namespace (str): CloudWatch metrics namespace.
+            endpoint (str): Route path of the request, e.g. '/api/v1/plant-details-rhs/'.
+            status_code (int): Response status code.
+            request_id (str, optional): Request ID, included as a (searchable, non-dimension) property.
+
+        Returns:
+            List[Dict[str, Any]]: EMF records, one per log line.
+        """
+        timestamp = int(time.time() * 1000)
+        properties = {"RequestId": request_id} if request_id else {}
+
+        def record(dimensions: List[List[str]], metric: str, value: float, members: Dict[str, str]) -> Dict[str, Any]:
+            return {
+                "_aws": {
+                    "Timestamp": timestamp,
+                    "CloudWatchMetrics": [{
+                        "Namespace": namespace,
+                        "Dimensions": dimensions,
+                        "Metrics": [{"Name": metric, "Unit": "Milliseconds"}]
+                    }]
+                },
+                **members,
+                **properties,
+                metric: round(value, 1)
+            }
+
+        records = [record(
+            [["Endpoint"], ["Endpoint", "StatusCode"]], "RequestLatency", self.elapsed_ms,
+            {"Endpoint": endpoint, "StatusCode": str(status_code)}
+        )]
+        for stage in self.stages:
+            dimensions = [["Endpoint", "Stage"]]
+            members = {"Endpoint": endpoint, "Stage": stage.name}
+            if stage.cache is not None:
+                dimensions.append(["Endpoint", "Stage", "Cache"])
+                members["Cache"] = stage.cache
+            if stage.status is not None:
+                dimensions.append(["Endpoint", "Stage", "UpstreamStatus"])
+                members["UpstreamStatus"] = stage.status
+            records.append(record(dimensions, "StageLatency", stage.duration_ms, members))
+        return records
+
+# Timings of the request being handled; shared with tasks and worker threads started while handling it
+_request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+def start_request_timings() -> RequestTimings:
+    """Start recording stage timings for the current request (see stage)."""
+    timings = RequestTimings()
+    _request_timings.set(timings)
+    return timings
+
+@contextmanager
+def stage(name: str) -> Iterator[StageTiming]:
+    """
+    Time a stage of the current request, recording it if stage timings were started for the request.
+
+    The yielded StageTiming's cache and status can be set within the block. If the block raises, the status
+    defaults to the upstream status code of the exception (e.g. from the Anthropic SDK) or its type.
+
+    Args:
+        name (str): Stage name, e.g. 'rhs_search'.
+
+    Yields:
+        StageTiming: The stage's timing, completed on exit.
+    """
+    timing = StageTiming(name)
+    started = time.perf_counter()
+    try:
+        yield timing
+    except Exception as e:
+        if timing.status is None:
+            # A PlantServiceException's status code is the app's response status, not the upstream's
+            upstream_status = None if isinstance(e, PlantServiceException) else getattr(e, "status_code", None)
+            timing.status = str(upstream_status or type(e).__name__)
+        raise
+    finally:
+        timing.duration_ms = (time.perf_counter() - started) * 1000
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.stages.append(timing)
+
+@lru_cache
+def _emf_logger() -> logging.Logger:
+    """Logger writing bare JSON lines to stdout, where CloudWatch Logs extracts EMF metrics without an agent."""
+    emf_logger = logging.getLogger(f"{__name__}.emf")
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    emf_logger.handlers = [handler]
+    emf_logger.setLevel(logging.INFO)
+    emf_logger.propagate = False
+    return emf_logger
+
+def emit_emf(records: List[Dict[str, Any]]) -> None:
+    """Write EMF records to stdout, one per line."""
+    emf_logger = _emf_logger()
+    for record in records:
+        emf_logger.info(json.dumps(record, separators=(",", ":")))
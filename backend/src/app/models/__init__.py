@@ -1,2 +1,2 @@
-from .api import Organ, Match, PlantIdentificationResponse, PlantDetailRequest, PlantDetailResponse, ErrorResponse
-from .domain import Size, Soil, Position, PlantDetails
\ No newline at end of file
+from .api import Organ, DetailsSource, PrefetchMode, StreamFormat, Match, PlantIdentificationResponse, PrefetchedDetails, BatchIdentificationResult, BatchIdentificationResponse, PlantDetailRequest, PlantDetailResponse, CombinedPlantDetailResponse, ErrorResponse
+from .domain import Size, Soil, Position, PlantDetails, PlantImage
\ No newline at end of file
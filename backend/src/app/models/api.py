@@ -10,6 +10,22 @@ class Organ(str, Enum):
     bark = "bark"
     auto = "auto"
 
+class DetailsSource(str, Enum):
+    """Enumeration of sources that can provide plant details."""
+    rhs = "rhs"
+    llm = "llm"
+
+class PrefetchMode(str, Enum):
+    """Enumeration of ways to prefetch plant details for confident identification matches."""
+    none = "none"
+    cache = "cache"
+    inline = "inline"
+
+class StreamFormat(str, Enum):
+    """Enumeration of formats for streamed plant details."""
+    sse = "sse"
+    ndjson = "ndjson"
+
 class Match(BaseModel):
     """
     Model for individual plant identification matches, to be returned to the frontend.
@@ -33,8 +49,10 @@ class PlantIdentificationResponse(BaseModel):
 
     Attributes:
         matches (Dict[int, Match]): List of possible identified matches
+        details (Optional[Dict[int, PrefetchedDetails]]): Plant details for confident matches, if prefetched inline
     """
     matches: Dict[int, Match]
+    details: Optional[Dict[int, "PrefetchedDetails"]] = None
 
     class Config:
         json_schema_extra = {
@@ -92,9 +110,9 @@ class Size(BaseModel):
     time_to_height: Optional[str] = Field(None, description="Time taken for plant to reach ultimate height")
 
 class Soil(BaseModel):
-    types: List[str]
-    moisture: List[str]
-    ph_levels: List[str]
+    types: List[str] = Field(..., description="Compatible soil types")
+    moisture: List[str] = Field(..., description="Soil moisture requirements")
+    ph_levels: List[str] = Field(..., description="Soil pH preferences")
 
 class Position(BaseModel):
     sun: Optional[List[str]] = Field(None, description="Sunlight requirements for plant")
@@ -115,11 +133,11 @@ class PlantDetailResponse(BaseModel):
 
     """
     size: Size
-    hardiness: str
+    hardiness: str = Field(..., description="RHS hardiness rating and descriptor (e.g. 'H6: hardy in all of UK')")
     soil: Soil
     position: Position
-    cultivation_tips: str
-    pruning: str
+    cultivation_tips: str = Field(..., description="Brief tips about planting and care")
+    pruning: str = Field(..., description="Specific pruning instructions")
 
     class Config:
         json_schema_extra = {
@@ -147,6 +165,15 @@ class PlantDetailResponse(BaseModel):
             }
         }
 
+class CombinedPlantDetailResponse(PlantDetailResponse):
+    """
+    Response model for the combined 'Plant Details' service.
+
+    Attributes:
+        source (DetailsSource): Service that provided the plant details ('rhs' or 'llm')
+    """
+    source: DetailsSource
+
 class ErrorResponse(BaseModel):
     """
     Response model for errors in API services, to be returned to the frontend in a JSONResponse.
@@ -155,3 +182,37 @@ class ErrorResponse(BaseModel):
     message: str
     details: Optional[Dict[str, Any]] = None
 
+class PrefetchedDetails(BaseModel):
+    """
+    Plant details prefetched for one identification match.
+
+    Attributes:
+        species (str): Name of the matched species
+        details (Optional[CombinedPlantDetailResponse]): Plant details and their source, if found
+        error (Optional[ErrorResponse]): Error details, if no plant details could be found
+    """
+    species: str
+    details: Optional[CombinedPlantDetailResponse] = None
+    error: Optional[ErrorResponse] = None
+
+PlantIdentificationResponse.model_rebuild()
+
+class BatchIdentificationResult(BaseModel):
+    """
+    Result of one identification within a batch request.
+
+    Attributes:
+        matches (Optional[Dict[int, Match]]): Possible identified matches, if identification succeeded
+        error (Optional[ErrorResponse]): Error details, if identification failed
+    """
+    matches: Optional[Dict[int, Match]] = None
+    error: Optional[ErrorResponse] = None
+
+class BatchIdentificationResponse(BaseModel):
+    """
+    Response model for 'Batch Plant Identification' service.
+
+    Attributes:
+        results (List[BatchIdentificationResult]): One result for a combined query, or one per image otherwise
+    """
+    results: List[BatchIdentificationResult]
@@ -2,6 +2,7 @@ from dataclasses import dataclass, asdict
 from typing import Optional, Dict, List, Any
 from fastapi import status
 from app.exceptions import PlantServiceException, PlantServiceErrorCode
+from .api import Organ
 
 @dataclass
 class Size:
@@ -102,6 +103,7 @@ class PlantDetails:
 
     Methods:
         to_dict: Convert information into Dict, raise PlantServiceException if error
+        from_dict: Build PlantDetails with nested dataclasses from a Dict, raise PlantServiceException if error
     """
     size: Optional[Size] = None
     hardiness: Optional[str] = None
@@ -110,6 +112,25 @@ class PlantDetails:
     cultivation_tips: Optional[str] = None
     pruning: Optional[str] = None
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PlantDetails":
+        try:
+            return cls(
+                size=Size(**data["size"]) if data.get("size") is not None else None,
+                hardiness=data.get("hardiness"),
+                soil=Soil(**data["soil"]) if data.get("soil") is not None else None,
+                position=Position(**data["position"]) if data.get("position") is not None else None,
+                cultivation_tips=data.get("cultivation_tips"),
+                pruning=data.get("pruning")
+            )
+        except Exception as e:
+            raise PlantServiceException(
+                error_code=PlantServiceErrorCode.PARSING_ERROR,
+                message="Failed to convert dictionary to data class",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                details={"class": cls.__name__, "error": str(e)}
+            )
+
     def to_dict(self) -> Dict[str, Any]:
         try:
             return {k: v for k, v in asdict(self).items() if v is not None}
@@ -120,4 +141,17 @@ class PlantDetails:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 details={"class": self.__class__.__name__, "error": str(e)}
             )
-        
+
+@dataclass
+class PlantImage:
+    """
+    Dataclass for an image to be identified by the PlantNet API.
+
+    Attributes:
+        content (bytes): Encoded image bytes
+        organ (Organ): Organ of the plant shown in the image
+        filename (str): Filename reported to PlantNet
+    """
+    content: bytes
+    organ: Organ
+    filename: str = "image.jpg"
@@ -0,0 +1,184 @@
+"""Cached loading of secrets from AWS SSM Parameter Store, shared by every Settings instance."""
+import asyncio
+import importlib.util
+import json
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+def encryption_available() -> bool:
+    """Check whether the optional 'cryptography' package is installed, so secrets can be cached on disk."""
+    return importlib.util.find_spec("cryptography") is not None
+
+class SecretStore:
+    """
+    Secrets loaded from AWS SSM Parameter Store with a single call, then cached.
+
+    Values are held in memory for ttl seconds, and optionally in a file encrypted with a Fernet key, which
+    outlives the process (e.g. /tmp across Lambda runtime restarts). A stale file is used as a fallback if SSM
+    cannot be reached. Subscribers are called with the new values whenever they are (re)loaded, so secrets
+    can be rotated in SSM without a redeploy.
+
+    Args:
+        names (Tuple[str, ...]): Names of the SSM parameters to load.
+        region_name (str): AWS region of the parameters.
+        ttl (float): Seconds before cached values are refreshed from SSM.
+        cache_path (str, optional): Encrypted cache file, or None to cache in memory only.
+        cache_key (str, optional): Fernet key for the cache file; the file is not used without one.
+    """
+    def __init__(self, names: Tuple[str, ...], region_name: str, ttl: float,
+                 cache_path: Optional[str] = None, cache_key: Optional[str] = None):
+        self.names = names
+        self.region_name = region_name
+        self.ttl = ttl
+        self._fernet = self._create_fernet(cache_key) if cache_path else None
+        self.cache_path = cache_path if self._fernet is not None else None
+        self._values: Optional[Dict[str, str]] = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[Dict[str, str]], None]] = []
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _create_fernet(cache_key: Optional[str]):
+        if not cache_key:
+            return None
+        if not encryption_available():
+            logger.warning("The 'cryptography' package is not installed, so secrets will not be cached on disk")
+            return None
+        from cryptography.fernet import Fernet
+        try:
+            return Fernet(cache_key)
+        except ValueError as e:
+            logger.warning(f"Invalid secrets cache key, so secrets will not be cached on disk: {e}")
+            return None
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() - self._fetched_at >= self.ttl
+
+    def subscribe(self, callback: Callable[[Dict[str, str]], None]) -> None:
+        """Call callback with the current secrets now (if loaded) and whenever they are refreshed."""
+        self._subscribers.append(callback)
+        if self._values:
+            callback(self._values)
+
+    def get_all(self) -> Dict[str, str]:
+        """
+        Return the secrets, from memory or the encrypted file if fresh, otherwise from SSM.
+
+        Concurrent first calls share one SSM call. Expired values are refreshed by refresh_periodically,
+        not here, so only the first load ever blocks.
+
+        Returns:
+            Dict[str, str]: Secret values by parameter name (empty if they could not be loaded).
+        """
+        if self._values is not None:
+            return self._values
+        with self._lock:
+            if self._values is None:
+                cached = self._read_cache_file()
+                if cached is not None and time.time() - cached[1] < self.ttl:
+                    self._set(*cached, source="encrypted cache file")
+                else:
+                    fetched = self._fetch()
+                    if fetched is not None:
+                        self._set(fetched, time.time(), source="SSM")
+                        self._write_cache_file()
+                    elif cached is not None:
+                        logger.warning("Using stale secrets from the encrypted cache file, as SSM could not be reached")
+                        self._set(*cached, source="encrypted cache file")
+                    else:
+                        self._values = {}
+        return self._values
+
+    async def refresh(self) -> bool:
+        """
+        Reload the secrets from SSM in a worker thread, keeping the current values if that fails.
+
+        Returns:
+            bool: True if the secrets were reloaded.
+        """
+        fetched = await asyncio.to_thread(self._fetch)
+        if fetched is None:
+            return False
+        with self._lock:
+            self._set(fetched, time.time(), source="SSM")
+            self._write_cache_file()
+        return True
+
+    def start_background_refresh(self) -> None:
+        """Start refreshing the secrets every ttl seconds on the running event loop, unless already started."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh_periodically())
+
+    async def refresh_periodically(self) -> None:
+        while True:
+            if not self.is_stale:
+                await asyncio.sleep(max(self.ttl - (time.time() - self._fetched_at), 1.0))
+            if not await self.refresh():
+                # Back off before retrying, rather than calling SSM in a tight loop
+                await asyncio.sleep(min(self.ttl, 60.0))
+
+    def _set(self, values: Dict[str, str], fetched_at: float, source: str) -> None:
+        changed = values != self._values
+        self._values = values
+        self._fetched_at = fetched_at
+        logger.info(f"Loaded {len(values)} secrets from {source}")
+        if changed:
+            for callback in self._subscribers:
+                callback(values)
+
+    def _fetch(self) -> Optional[Dict[str, str]]:
+        """Load the secrets from SSM with one GetParameters call, or return None on failure."""
+        try:
+            # Only needed in AWS, so imported here rather than on every cold start
+            import boto3
+            ssm_client = boto3.client("ssm", region_name=self.region_name)
+            response = ssm_client.get_parameters(Names=list(self.names), WithDecryption=True)
+            if response.get("InvalidParameters"):
+                logger.warning(f"SSM parameters not found: {response['InvalidParameters']}")
+            return {param["Name"]: param["Value"] for param in response["Parameters"]}
+        except Exception as e:
+            logger.error(f"Error retrieving AWS SSM Parameters: {e}")
+            return None
+
+    def _read_cache_file(self) -> Optional[Tuple[Dict[str, str], float]]:
+        """Return the (values, fetched_at) stored in the encrypted cache file, or None if unavailable."""
+        if self.cache_path is None or not os.path.exists(self.cache_path):
+            return None
+        try:
+            with open(self.cache_path, "rb") as f:
+                data = json.loads(self._fernet.decrypt(f.read()))
+            if data["names"] != list(self.names):
+                return None
+            return data["values"], data["fetched_at"]
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable secrets cache file {self.cache_path}: {e}")
+            return None
+
+    def _write_cache_file(self) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            token = self._fernet.encrypt(json.dumps({"names": list(self.names), "values": self._values, "fetched_at": self._fetched_at}).encode("utf-8"))
+            # Write to a private temporary file, then rename it into place atomically
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(token)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to write secrets cache file {self.cache_path}: {e}")
+
+@lru_cache
+def get_secret_store(names: Tuple[str, ...], region_name: str, ttl: float,
+                     cache_path: Optional[str] = None, cache_key: Optional[str] = None) -> SecretStore:
+    """Creates and returns the cached SecretStore for these parameters, shared by all Settings instances."""
+    return SecretStore(names, region_name, ttl, cache_path, cache_key)
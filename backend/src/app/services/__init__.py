@@ -1,3 +1,5 @@
 from .plant_identification import PlantIdentificationService
 from .plant_details_rhs import PlantDetailsRhsService
-from .plant_details_llm import PlantDetailsLlmService
\ No newline at end of file
+from .plant_details_llm import PlantDetailsLlmService
+from .plant_details_hedged import PlantDetailsHedgedService
+from .plant_prefetch import DetailsPrefetchService
\ No newline at end of file
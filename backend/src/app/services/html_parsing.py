@@ -0,0 +1,73 @@
+"""Selectable HTML parser backends for RHS plant details pages, parsing only the plant details elements."""
+import importlib.util
+from functools import lru_cache
+from typing import TYPE_CHECKING, Literal, Optional, Tuple
+import logging
+
+if TYPE_CHECKING:
+    # BeautifulSoup is imported on first parse, keeping it out of the cold start
+    from bs4 import SoupStrainer, Tag
+
+logger = logging.getLogger(__name__)
+
+HtmlParser = Literal["lxml", "html.parser", "lxml-xpath"]
+
+FULL_DETAILS_ELEMENT = 'lib-plant-details-full'
+SUMMARY_ELEMENT = 'lib-plant-details-summary'
+
+@lru_cache
+def details_strainer() -> "SoupStrainer":
+    """Strainer keeping only the details elements (and their descendants), discarding the rest while parsing."""
+    from bs4 import SoupStrainer
+    return SoupStrainer([FULL_DETAILS_ELEMENT, SUMMARY_ELEMENT])
+
+def lxml_available() -> bool:
+    """Check whether the optional 'lxml' package is installed."""
+    return importlib.util.find_spec("lxml") is not None
+
+def resolve_parser(parser: HtmlParser) -> HtmlParser:
+    """Return the requested parser backend, falling back to 'html.parser' if lxml is not installed."""
+    if parser != "html.parser" and not lxml_available():
+        logger.warning(f"lxml is not installed, using 'html.parser' instead of '{parser}'")
+        return "html.parser"
+    return parser
+
+def _parse_with_xpath(html: str) -> Tuple[Optional["Tag"], Optional["Tag"]]:
+    """
+    Locate the details elements with lxml's C parser and XPath, then build soup for the full details subtree only.
+
+    The page is never converted to BeautifulSoup objects; only the (small) full details element is re-parsed,
+    so the section extractors can be shared with the other backends.
+    """
+    from bs4 import BeautifulSoup, Tag
+    from lxml import etree, html as lxml_html
+
+    document = lxml_html.document_fromstring(html)
+    full = document.xpath(f'//{FULL_DETAILS_ELEMENT}')
+    if full:
+        fragment = etree.tostring(full[0], encoding='unicode', method='html', with_tail=False)
+        return BeautifulSoup(fragment, 'lxml', parse_only=details_strainer()).find(FULL_DETAILS_ELEMENT), None
+
+    summary = document.xpath(f'//{SUMMARY_ELEMENT}')
+    # Summary pages are only checked for presence, so an empty placeholder tag is enough
+    return None, Tag(name=SUMMARY_ELEMENT) if summary else None
+
+def parse_details_elements(html: str, parser: HtmlParser = "lxml-xpath") -> Tuple[Optional["Tag"], Optional["Tag"]]:
+    """
+    Parse the plant details elements from an RHS plant details page.
+
+    Args:
+        html (str): HTML of the plant's details page.
+        parser (HtmlParser): 'lxml' or 'html.parser' to parse with BeautifulSoup (keeping only the details
+            elements), or 'lxml-xpath' to locate them with lxml/XPath before building any soup.
+
+    Returns:
+        Tuple[Optional[Tag], Optional[Tag]]: The full details and summary elements, each None if not on the page.
+    """
+    parser = resolve_parser(parser)
+    if parser == "lxml-xpath":
+        return _parse_with_xpath(html)
+
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, parser, parse_only=details_strainer())
+    return soup.find(FULL_DETAILS_ELEMENT), soup.find(SUMMARY_ELEMENT)
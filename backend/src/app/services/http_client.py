@@ -0,0 +1,39 @@
+"""Factory for the pooled asynchronous HTTP clients used to call upstream services."""
+import importlib.util
+from typing import Optional
+import httpx
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+def http2_available() -> bool:
+    """Check whether the optional 'h2' package is installed, so HTTP/2 can be negotiated."""
+    return importlib.util.find_spec("h2") is not None
+
+def create_async_client(timeout: Optional[float] = None, **kwargs) -> httpx.AsyncClient:
+    """
+    Create an httpx AsyncClient with a keep-alive connection pool.
+
+    HTTP/2 is enabled where the 'h2' package is available, otherwise the client falls back to HTTP/1.1.
+
+    Args:
+        timeout (float, optional): Request timeout in seconds. Defaults to settings.HTTP_TIMEOUT.
+        **kwargs: Additional keyword arguments passed to httpx.AsyncClient.
+
+    Returns:
+        httpx.AsyncClient: Configured client, to be reused across requests.
+    """
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+    )
+    http2 = http2_available()
+    logger.debug(f"Creating async HTTP client (http2={http2})")
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=limits,
+        timeout=timeout if timeout is not None else settings.HTTP_TIMEOUT,
+        **kwargs
+    )
@@ -0,0 +1,104 @@
+"""Image decoding, normalisation and perceptual hashing helpers for uploaded plant photos."""
+import io
+from functools import lru_cache
+from typing import Literal, Optional, Tuple
+import numpy as np
+from PIL import Image, ImageOps
+
+HashAlgorithm = Literal["dhash", "phash"]
+
+def _load_grayscale(content: bytes, size: Tuple[int, int]) -> np.ndarray:
+    """Decode image bytes, apply EXIF orientation and return a greyscale pixel array of the given (width, height)."""
+    with Image.open(io.BytesIO(content)) as image:
+        # Let the JPEG decoder downscale while decoding, as only a thumbnail is needed
+        image.draft("L", (size[0] * 8, size[1] * 8))
+        image = ImageOps.exif_transpose(image)
+        grey = image.convert("L").resize(size, Image.Resampling.LANCZOS)
+    return np.asarray(grey, dtype=np.float64)
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    """Pack a boolean array into an integer, most significant bit first."""
+    return int.from_bytes(np.packbits(bits.flatten()).tobytes(), "big")
+
+@lru_cache
+def _dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II matrix of size n x n."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.sqrt(2.0 / n) * np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+    matrix[0, :] = np.sqrt(1.0 / n)
+    return matrix
+
+def dhash(content: bytes, hash_size: int = 8) -> int:
+    """
+    Compute the difference hash (dHash) of an image.
+
+    Args:
+        content (bytes): Encoded image bytes.
+        hash_size (int): Hash grid size; the hash has hash_size ** 2 bits.
+
+    Returns:
+        int: Perceptual hash, where each bit records whether brightness increases between adjacent pixels.
+    """
+    pixels = _load_grayscale(content, (hash_size + 1, hash_size))
+    return _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+def phash(content: bytes, hash_size: int = 8, highfreq_factor: int = 4) -> int:
+    """
+    Compute the DCT-based perceptual hash (pHash) of an image.
+
+    Args:
+        content (bytes): Encoded image bytes.
+        hash_size (int): Size of the low-frequency DCT block kept; the hash has hash_size ** 2 bits.
+        highfreq_factor (int): Multiplier for the thumbnail size the DCT is taken over.
+
+    Returns:
+        int: Perceptual hash, where each bit records whether a low-frequency coefficient is above the median.
+    """
+    img_size = hash_size * highfreq_factor
+    pixels = _load_grayscale(content, (img_size, img_size))
+    dct = _dct_matrix(img_size)
+    low_freq = (dct @ pixels @ dct.T)[:hash_size, :hash_size]
+    return _bits_to_int(low_freq > np.median(low_freq))
+
+def perceptual_hash(content: bytes, algorithm: HashAlgorithm = "dhash") -> int:
+    """Compute a 64-bit perceptual hash of an image using the given algorithm."""
+    return phash(content) if algorithm == "phash" else dhash(content)
+
+def detect_content_type(content: bytes) -> Optional[str]:
+    """Return the MIME type of encoded image bytes from their header, or None if not a recognised image."""
+    try:
+        with Image.open(io.BytesIO(content)) as image:
+            return Image.MIME.get(image.format)
+    except Exception:
+        return None
+
+def normalise_image(content: bytes, max_edge: int = 1280, quality: int = 85) -> Tuple[bytes, str]:
+    """
+    Prepare an image for upload: apply EXIF orientation, strip metadata, downsize and re-encode as JPEG.
+
+    JPEGs that are already within max_edge and carry no EXIF data are returned unchanged, to avoid
+    a lossy re-encode that would not save any bytes.
+
+    Args:
+        content (bytes): Encoded image bytes, in any format Pillow can decode.
+        max_edge (int): Maximum length in pixels of the longest edge.
+        quality (int): JPEG quality used when re-encoding (1-95).
+
+    Returns:
+        Tuple[bytes, str]: Normalised image bytes and their MIME type.
+    """
+    with Image.open(io.BytesIO(content)) as image:
+        if image.format == "JPEG" and max(image.size) <= max_edge and "exif" not in image.info:
+            return content, "image/jpeg"
+
+        # Let the JPEG decoder downscale while decoding, to no smaller than the target size
+        image.draft("RGB", (max_edge, max_edge))
+        image = ImageOps.exif_transpose(image)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue(), "image/jpeg"
@@ -0,0 +1,73 @@
+"""Incremental parser yielding the members of a JSON object as soon as each one is complete."""
+import json
+from typing import Any, List, Optional, Tuple
+
+class IncrementalJsonObjectParser:
+    """
+    Parse a JSON object arriving in chunks (e.g. streamed LLM output), one top-level member at a time.
+
+    Text before the opening brace is ignored, and a trailing comma before the closing brace is tolerated.
+    Each chunk is scanned once, so the total cost is linear in the size of the document.
+    """
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member: List[str] = []
+        self.finished = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Add a chunk of text and return the (key, value) members completed by it.
+
+        Raises:
+            json.JSONDecodeError: If a completed member is not valid JSON.
+        """
+        completed = []
+        for char in chunk:
+            if self.finished:
+                break
+
+            if self._depth == 0:
+                if char == '{':
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                self._member.append(char)
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self.finished = True
+                    member = self._complete_member()
+                    if member is not None:
+                        completed.append(member)
+                    continue
+            elif char == ',' and self._depth == 1:
+                member = self._complete_member()
+                if member is not None:
+                    completed.append(member)
+                continue
+            self._member.append(char)
+        return completed
+
+    def _complete_member(self) -> Optional[Tuple[str, Any]]:
+        """Decode the buffered '"key": value' member, returning None if it is empty (e.g. after a trailing comma)."""
+        text = "".join(self._member).strip()
+        self._member = []
+        if not text:
+            return None
+        (key, value), = json.loads("{" + text + "}").items()
+        return key, value
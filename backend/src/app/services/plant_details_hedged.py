@@ -0,0 +1,93 @@
+"""Service to get plant details from RHS, hedged with a concurrent LLM request if RHS is slow or fails."""
+import asyncio
+from typing import Dict, Optional, Tuple
+from fastapi import status
+from pydantic import ValidationError
+from app.config import settings
+from app.exceptions import PlantServiceErrorCode, PlantServiceException
+from app.models import DetailsSource, PlantDetailResponse, PlantDetails
+from app.services.plant_details_rhs import PlantDetailsRhsService
+from app.services.plant_details_llm import PlantDetailsLlmService
+import logging
+
+logger = logging.getLogger(__name__)
+
+class PlantDetailsHedgedService:
+    """
+    Service layer combining the RHS and LLM plant details services.
+
+    RHS is asked first. If it has not answered within the hedge delay, or fails, the LLM is asked concurrently;
+    the first acceptable answer - one with every section of PlantDetailResponse - is returned (RHS winning ties)
+    and the other request is cancelled.
+    """
+    @staticmethod
+    async def get_plant_details(plant: str, hedge_delay: Optional[float] = None) -> Tuple[PlantDetails, DetailsSource]:
+        """
+        Get plant details from whichever of RHS and the LLM first answers with complete details.
+
+        Args:
+            plant (str): Name of the plant species.
+            hedge_delay (float, optional): Seconds to wait for RHS before also asking the LLM.
+                Defaults to settings.HEDGE_DELAY_SECONDS.
+
+        Returns:
+            Tuple[PlantDetails, DetailsSource]: Plant details and the source that provided them.
+
+        Raises:
+            PlantServiceException: The error from whichever source failed last, if neither provides complete details.
+        """
+        hedge_delay = settings.HEDGE_DELAY_SECONDS if hedge_delay is None else hedge_delay
+        tasks: Dict[asyncio.Task, DetailsSource] = {
+            asyncio.create_task(PlantDetailsRhsService.retrieve_plant_details(plant)): DetailsSource.rhs
+        }
+        llm_started = False
+        last_error: Optional[BaseException] = None
+
+        try:
+            while tasks:
+                # Only wait out the hedge delay while RHS is the sole request in flight
+                timeout = hedge_delay if not llm_started else None
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                # Check RHS first, so it wins if both complete together
+                for task in sorted(done, key=lambda task: tasks[task] != DetailsSource.rhs):
+                    source = tasks.pop(task)
+                    error = task.exception() or PlantDetailsHedgedService._validation_error(task.result())
+                    if error is None:
+                        logger.info(f"Plant details for '{plant}' provided by {source.value}")
+                        return task.result(), source
+                    logger.info(f"{source.value} failed to provide plant details for '{plant}': {error}")
+                    last_error = error
+
+                if not llm_started:
+                    reason = "failed" if done else f"has not answered within {hedge_delay}s"
+                    logger.info(f"RHS {reason}, requesting plant details for '{plant}' from LLM")
+                    tasks[asyncio.create_task(PlantDetailsLlmService().get_plant_details(plant))] = DetailsSource.llm
+                    llm_started = True
+        finally:
+            # Cancel the losing request (or both, if the caller was cancelled)
+            for task in tasks:
+                task.cancel()
+
+        if isinstance(last_error, PlantServiceException):
+            raise last_error
+        raise PlantServiceException(
+            error_code=PlantServiceErrorCode.SERVICE_ERROR,
+            message="Failed to retrieve plant details",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            details={"error": str(last_error)}
+        )
+
+    @staticmethod
+    def _validation_error(details: PlantDetails) -> Optional[PlantServiceException]:
+        """Return an error if details are missing sections required by PlantDetailResponse (e.g. a partial RHS page), else None."""
+        try:
+            PlantDetailResponse(**details.to_dict())
+            return None
+        except ValidationError as e:
+            return PlantServiceException(
+                error_code=PlantServiceErrorCode.VALIDATION_ERROR,
+                message="Plant details are incomplete",
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                details={"error": str(e)}
+            )
@@ -1,20 +1,112 @@
 """Service to find key cultivation details about a plant using an LLM."""
-from typing import Dict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Optional, Tuple
+import copy
+import time
 import uuid
 import json
 from fastapi import status
-from anthropic import AsyncAnthropic, APIStatusError, APIConnectionError, APITimeoutError
+import httpx
+from pydantic import ValidationError
+from app.cache import SingleFlight, TieredCache, create_cache, make_cache_key, normalise_plant_name
 from app.config import settings
 from app.exceptions import PlantServiceException, PlantServiceErrorCode
-from app.models import PlantDetails
+from app.metrics import stage
+from app.models import PlantDetails, PlantDetailResponse
+from app.services.http_client import create_async_client
+from app.services.json_stream import IncrementalJsonObjectParser
 import logging
 
+if TYPE_CHECKING:
+    # The Anthropic SDK is imported on first use, keeping it out of the cold start
+    from anthropic import AsyncAnthropic
+    from anthropic.types import Message
+
 logger = logging.getLogger(__name__)
 
+# Concurrent requests for the same plant (and model and prompt version) share one Anthropic call
+llm_details_flight = SingleFlight("LLM details")
+
+# Tool the LLM is made to call in 'tool' output mode, so its answer arrives as schema-shaped JSON
+PLANT_DETAILS_TOOL_NAME = "record_plant_details"
+
+TOOL_SYSTEM_PROMPT = (
+    "You are a gardening expert. Record accurate cultivation details for the plant named by the user, "
+    "in the style of the RHS: height and spread as ranges in metres, hardiness as an RHS rating with its descriptor, "
+    "and brief, practical cultivation and pruning tips."
+)
+
+# Shortest prefix Anthropic will prompt-cache, in tokens: shorter prefixes are processed normally, without caching
+MIN_CACHEABLE_PROMPT_TOKENS = {"haiku": 2048}
+DEFAULT_MIN_CACHEABLE_PROMPT_TOKENS = 1024
+
+def _estimate_tokens(*parts: Any) -> int:
+    """Rough token count of JSON-serialisable request parts (about 4 characters per token)."""
+    return sum(len(json.dumps(part)) for part in parts) // 4
+
+def _inline_refs(schema: Any, defs: Dict[str, Any]) -> Any:
+    """Replace '$ref' pointers with their definitions and drop titles and defaults, for a compact self-contained schema."""
+    if isinstance(schema, dict):
+        if "$ref" in schema:
+            return _inline_refs(defs[schema["$ref"].split("/")[-1]], defs)
+        return {k: _inline_refs(v, defs) for k, v in schema.items() if k not in ("title", "default", "$defs")}
+    if isinstance(schema, list):
+        return [_inline_refs(item, defs) for item in schema]
+    return schema
+
+@lru_cache
+def plant_details_tool() -> Dict[str, Any]:
+    """Anthropic tool definition whose input schema is generated from the PlantDetailResponse model."""
+    schema = PlantDetailResponse.model_json_schema()
+    input_schema = _inline_refs(schema, schema.get("$defs", {}))
+    # The model docstring and OpenAPI example would only add tokens
+    input_schema.pop("description", None)
+    input_schema.pop("example", None)
+    return {
+        "name": PLANT_DETAILS_TOOL_NAME,
+        "description": "Record the key cultivation details of a plant species.",
+        "input_schema": input_schema
+    }
+
 class PlantAnthropicClient:
-    def __init__(self, model: str= "claude-3-haiku-20240307"):
-        self.client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+    """
+    Client for requesting plant details from the Anthropic API.
+
+    All instances share one AsyncAnthropic client on a pooled, keep-alive httpx client, unless a client is passed in.
+    """
+    _http_client: Optional[httpx.AsyncClient] = None
+    _anthropic_client: Optional["AsyncAnthropic"] = None
+
+    def __init__(self, model: str= "claude-3-haiku-20240307", client: Optional["AsyncAnthropic"] = None,
+                 output_mode: Optional[str] = None):
+        self.client = client if client is not None else self.get_client()
         self.model = model
+        self.output_mode = output_mode or settings.LLM_OUTPUT_MODE
+
+    @classmethod
+    def get_http_client(cls) -> httpx.AsyncClient:
+        """Return the httpx client underlying the shared Anthropic client, creating it on first use."""
+        if cls._http_client is None or cls._http_client.is_closed:
+            cls._http_client = create_async_client(timeout=settings.LLM_TIMEOUT)
+            cls._anthropic_client = None
+        return cls._http_client
+
+    @classmethod
+    def get_client(cls) -> "AsyncAnthropic":
+        """Return the shared Anthropic client, creating it on first use."""
+        from anthropic import AsyncAnthropic
+        http_client = cls.get_http_client()
+        # Recreate the client if the API key has been rotated
+        if cls._anthropic_client is None or cls._anthropic_client.api_key != settings.ANTHROPIC_API_KEY:
+            cls._anthropic_client = AsyncAnthropic(
+                api_key=settings.ANTHROPIC_API_KEY, base_url=settings.ANTHROPIC_BASE_URL, http_client=http_client
+            )
+        return cls._anthropic_client
+
+    @property
+    def prompt_version(self) -> str:
+        """Fingerprint of the request template (prompt, system prompt and sampling parameters), so edits to it invalidate cached responses."""
+        return make_cache_key(self._message_params("{plant_name}"))[:16]
 
     def get_llm_prompt(self, plant_name: str) -> str:
         return f"""You are a gardening expert. I need detailed information about {plant_name}.
@@ -43,28 +135,78 @@ class PlantAnthropicClient:
         }}
         """
     
+    def _message_params(self, plant_name: str) -> Dict:
+        """Parameters for the Anthropic Messages API request for a plant's details."""
+        if self.output_mode == "tool":
+            return self._tool_message_params(plant_name)
+        return dict(
+            model=self.model,
+            max_tokens=settings.LLM_MAX_TOKENS,
+            temperature=0.2,
+            system="You are a gardening expert. Provide accurate plant information in JSON format only.",
+            messages=[
+                {"role": "user",
+                 "content": self.get_llm_prompt(plant_name)}
+            ]
+        )
+
+    def _tool_message_params(self, plant_name: str) -> Dict:
+        """
+        Request parameters forcing a call to the plant details tool, instead of describing the JSON in the prompt.
+
+        The tool schema and system prompt form a static prefix, marked for Anthropic prompt caching when enabled
+        and long enough for the model to cache (see prompt_cacheable).
+        """
+        system = [{"type": "text", "text": TOOL_SYSTEM_PROMPT}]
+        tools = [copy.deepcopy(plant_details_tool())]
+        if settings.LLM_PROMPT_CACHING and self.prompt_cacheable(tools, system):
+            # A breakpoint on the last system block caches the tools and system prompt before it
+            system[-1]["cache_control"] = {"type": "ephemeral"}
+        return dict(
+            model=self.model,
+            max_tokens=settings.LLM_MAX_TOKENS,
+            temperature=0.2,
+            system=system,
+            tools=tools,
+            tool_choice={"type": "tool", "name": PLANT_DETAILS_TOOL_NAME},
+            messages=[
+                {"role": "user",
+                 "content": f"Record the cultivation details of {plant_name}."}
+            ]
+        )
+
+    def prompt_cacheable(self, *prefix: Any) -> bool:
+        """Whether a static request prefix (e.g. tools and system prompt) reaches the model's minimum cacheable length."""
+        minimum = next(
+            (tokens for family, tokens in MIN_CACHEABLE_PROMPT_TOKENS.items() if family in self.model),
+            DEFAULT_MIN_CACHEABLE_PROMPT_TOKENS
+        )
+        return _estimate_tokens(*prefix) >= minimum
+
     async def get_plant_details(self, plant_name: str) -> Dict:        
         request_id = str(uuid.uuid4())
         logger.info(f"Request {request_id} - calling Anthropic API for plant: {plant_name}")
 
         try:
-            response = await self.client.messages.create(
-                model=self.model,
-                max_tokens=1024,
-                temperature=0.2,
-                system="You are a gardening expert. Provide accurate plant information in JSON format only.",
-                messages=[
-                    {"role": "user",
-                     "content": self.get_llm_prompt(plant_name)}
-                ]
-            )
+            started = time.perf_counter()
+            with stage("anthropic") as timing:
+                response = await self.client.messages.create(**self._message_params(plant_name))
+                timing.status = "200"
+            self._log_usage(request_id, response, started)
             logger.debug(f"Request {request_id} - Raw response: {response}")
 
+            if self.output_mode == "tool":
+                with stage("llm_parse"):
+                    details = self._tool_input(response, request_id)
+                logger.info(f"Request {request_id} - LLM details: {details}")
+                return details
+
             content_text = response.content[0].text if response.content else ""
 
             try:
-                details = json.loads(content_text)
-                self._validate_plant_details(details)
+                with stage("llm_parse"):
+                    details = json.loads(content_text)
+                    self._validate_plant_details(details)
                 logger.info(f"Request {request_id} - LLM details: {details}")
                 return details
             except json.JSONDecodeError as e:
@@ -75,51 +217,165 @@ class PlantAnthropicClient:
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
                 )
             
-        except APIStatusError as e:
+        except Exception as e:
+            raise self._service_exception(e, request_id)
+
+    def _tool_input(self, response: "Message", request_id: str) -> Dict:
+        """Extract the plant details tool call from a response, validated against PlantDetailResponse."""
+        tool_use = next(
+            (block for block in response.content if block.type == "tool_use" and block.name == PLANT_DETAILS_TOOL_NAME),
+            None
+        )
+        if tool_use is None:
+            logger.error(f"Request {request_id} - No plant details tool call in response (stop reason: {response.stop_reason})")
+            raise PlantServiceException(
+                error_code=PlantServiceErrorCode.PARSING_ERROR,
+                message="Failed to parse plant details from LLM response",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        return self._validate_tool_input(tool_use.input)
+
+    def _validate_tool_input(self, details: Dict) -> Dict:
+        """Validate tool input against the PlantDetailResponse model, returning it in the model's shape."""
+        try:
+            return PlantDetailResponse.model_validate(details).model_dump()
+        except ValidationError as e:
+            logger.warning(f"Plant details from Anthropic do not match the schema: {e.errors(include_url=False)}")
+            raise PlantServiceException(
+                error_code=PlantServiceErrorCode.VALIDATION_ERROR,
+                message="Plant details from Anthropic are incomplete",
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+
+    def _log_usage(self, request_id: str, message: "Message", started: float) -> None:
+        """Log the tokens used (including prompt cache reads and writes) and latency of an Anthropic call."""
+        usage = message.usage
+        llm_usage = {
+            "model": self.model,
+            "output_mode": self.output_mode,
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "cache_read_input_tokens": usage.cache_read_input_tokens or 0,
+            "cache_creation_input_tokens": usage.cache_creation_input_tokens or 0,
+            "latency_ms": round((time.perf_counter() - started) * 1000),
+            "stop_reason": message.stop_reason
+        }
+        logger.info(
+            f"Request {request_id} - Anthropic usage: {llm_usage['input_tokens']} input tokens "
+            f"({llm_usage['cache_read_input_tokens']} cache read, {llm_usage['cache_creation_input_tokens']} cache write), "
+            f"{llm_usage['output_tokens']} output tokens, {llm_usage['latency_ms']}ms, stop reason '{message.stop_reason}'",
+            extra={"llm_usage": llm_usage}
+        )
+        if message.stop_reason == "max_tokens":
+            logger.warning(f"Request {request_id} - Anthropic response truncated at LLM_MAX_TOKENS={settings.LLM_MAX_TOKENS}")
+
+    async def stream_plant_details(self, plant_name: str) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream plant details from the Anthropic API, yielding each top-level field as soon as it has been generated.
+
+        Args:
+            plant_name (str): Name of the plant species.
+
+        Yields:
+            Tuple[str, Any]: Field name (e.g. 'size') and its parsed JSON value.
+
+        Raises:
+            PlantServiceException: If the request fails, or the streamed response is invalid or incomplete.
+        """
+        request_id = str(uuid.uuid4())
+        logger.info(f"Request {request_id} - streaming from Anthropic API for plant: {plant_name}")
+        parser = IncrementalJsonObjectParser()
+        received = {}
+
+        try:
+            started = time.perf_counter()
+            # Timed until the stream is exhausted, so including the time taken to send each section on
+            with stage("anthropic") as timing:
+                async with self.client.messages.stream(**self._message_params(plant_name)) as stream:
+                    async for event in stream:
+                        # Tool input arrives as partial JSON, and plain JSON output as text
+                        if event.type != "content_block_delta" or parser.finished:
+                            continue
+                        if event.delta.type == "input_json_delta":
+                            chunk = event.delta.partial_json
+                        elif event.delta.type == "text_delta":
+                            chunk = event.delta.text
+                        else:
+                            continue
+                        try:
+                            members = parser.feed(chunk)
+                        except json.JSONDecodeError as e:
+                            logger.error(f"Request {request_id} - Failed to parse streamed JSON: {e}")
+                            raise PlantServiceException(
+                                error_code=PlantServiceErrorCode.PARSING_ERROR,
+                                message="Failed to parse plant details from LLM response",
+                                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+                            )
+                        for key, value in members:
+                            received[key] = value
+                            yield key, value
+                    # The remaining events are cheap, and the final one carries the output token count
+                    final_message = await stream.get_final_message()
+                    timing.status = "200"
+                self._log_usage(request_id, final_message, started)
+
+            with stage("llm_parse"):
+                if self.output_mode == "tool":
+                    self._validate_tool_input(received)
+                else:
+                    self._validate_plant_details(received)
+            logger.info(f"Request {request_id} - LLM details: {received}")
+        except Exception as e:
+            raise self._service_exception(e, request_id)
+
+    def _service_exception(self, e: Exception, request_id: str) -> PlantServiceException:
+        """Convert an error raised while calling the Anthropic API into a PlantServiceException."""
+        from anthropic import APIStatusError, APIConnectionError, APITimeoutError
+        if isinstance(e, PlantServiceException):
+            return e
+        if isinstance(e, APIStatusError):
             if e.status_code in [401, 403]:
                 logger.error(f"Request {request_id} - Anthropic authentication error: {str(e)}")
-                raise PlantServiceException(
+                return PlantServiceException(
                     error_code=PlantServiceErrorCode.SERVICE_ERROR,
                     message="Authentication error with Anthropic",
                     status_code=status.HTTP_503_SERVICE_UNAVAILABLE
                 )
             elif e.status_code in [429, 529]:
                 logger.error(f"Request {request_id} - Anthropic rate limit or capacity error: {str(e)}")
-                raise PlantServiceException(
+                return PlantServiceException(
                     error_code=PlantServiceErrorCode.SERVICE_ERROR,
                     message="Anthropic service temporarily unavailable",
                     status_code=status.HTTP_503_SERVICE_UNAVAILABLE
                 )
             else:
                 logger.error(f"Request {request_id} - Anthropic API error: {str(e)}")
-                raise PlantServiceException(
+                return PlantServiceException(
                     error_code=PlantServiceErrorCode.SERVICE_ERROR,
                     message="Error retrieving plant details from Anthropic",
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
                 )
-        except APIConnectionError as e:
-            logger.error(f"Request {request_id} - Anthropic connection error: {str(e)}")
-            raise PlantServiceException(
-                error_code=PlantServiceErrorCode.SERVICE_ERROR,
-                message="Unable to connect to Anthropic",
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE
-            )
-        except APITimeoutError as e:
+        # APITimeoutError subclasses APIConnectionError, so check it first
+        if isinstance(e, APITimeoutError):
             logger.error(f"Request {request_id} - Anthropic timeout error: {str(e)}")
-            raise PlantServiceException(
+            return PlantServiceException(
                 error_code=PlantServiceErrorCode.SERVICE_ERROR,
                 message="Anthropic request timed out",
                 status_code=status.HTTP_504_GATEWAY_TIMEOUT
             )
-        except Exception as e:
-            if isinstance(e, PlantServiceException):
-                raise
-            logger.error(f"Request {request_id} - Unexpected error: {str(e)}", exc_info=True)
-            raise PlantServiceException(
+        if isinstance(e, APIConnectionError):
+            logger.error(f"Request {request_id} - Anthropic connection error: {str(e)}")
+            return PlantServiceException(
                 error_code=PlantServiceErrorCode.SERVICE_ERROR,
-                message=f"Unexpected error retrieving plant details",
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )            
+                message="Unable to connect to Anthropic",
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        logger.error(f"Request {request_id} - Unexpected error: {str(e)}", exc_info=True)
+        return PlantServiceException(
+            error_code=PlantServiceErrorCode.SERVICE_ERROR,
+            message=f"Unexpected error retrieving plant details",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
 
     def _validate_plant_details(self, details: Dict) -> None:
         """Validate that the returned JSON has the expected structure."""
@@ -134,12 +390,79 @@ class PlantAnthropicClient:
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
             )
 
+@lru_cache
+def get_llm_details_cache() -> Optional[TieredCache]:
+    """Creates and returns the cached LLM plant details cache, or None if disabled."""
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    return create_cache("llm_details", settings.LLM_CACHE_MAX_ENTRIES, settings.LLM_CACHE_TTL_SECONDS)
+
 class PlantDetailsLlmService:
     """
     Service layer for getting plant details from the LLM.
+
+    Validated responses are cached by model, prompt version and normalised plant name, so repeat requests
+    cost no tokens and changes to the prompt are picked up without clearing the cache. Concurrent requests
+    with the same key share a single Anthropic call.
+
+    Args:
+        client (AsyncAnthropic, optional): Anthropic client to use. Defaults to the shared, app-lifetime client.
     """
+    def __init__(self, client: Optional["AsyncAnthropic"] = None):
+        self.client = client
+
+    @staticmethod
+    def _cache_key(llm_client: PlantAnthropicClient, plant_name: str) -> str:
+        return make_cache_key(llm_client.model, llm_client.prompt_version, normalise_plant_name(plant_name))
+
+    @staticmethod
+    def _store(cache: Optional[TieredCache], cache_key: str, plant_name: str, details: Dict) -> None:
+        """Cache LLM details if they convert cleanly to PlantDetails, so only well-formed responses are replayed."""
+        if cache is None:
+            return
+        try:
+            cache.set(cache_key, PlantDetails.from_dict(details).to_dict())
+        except PlantServiceException as e:
+            logger.warning(f"Not caching LLM details for '{plant_name}': {e.details}")
+
     async def get_plant_details(self, plant_name: str) -> PlantDetails:
-        llm_client = PlantAnthropicClient()
-        details = await llm_client.get_plant_details(plant_name)
-        return PlantDetails(**details)
+        llm_client = PlantAnthropicClient(client=self.client)
+        cache = get_llm_details_cache()
+        cache_key = self._cache_key(llm_client, plant_name)
+        if cache is not None:
+            with stage("llm_cache") as timing:
+                cached = cache.get(cache_key)
+                timing.cache = "miss" if cached is None else "hit"
+            if cached is not None:
+                logger.info(f"LLM details cache hit for '{plant_name}'")
+                return PlantDetails.from_dict(cached)
+
+        async def fetch() -> PlantDetails:
+            details = await llm_client.get_plant_details(plant_name)
+            plant_details = PlantDetails(**details)
+            self._store(cache, cache_key, plant_name, details)
+            return plant_details
+
+        return await llm_details_flight.do(cache_key, fetch)
+
+    async def stream_plant_details(self, plant_name: str) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream plant details from the LLM (or replay them from the cache), one (field, value) section at a time."""
+        llm_client = PlantAnthropicClient(client=self.client)
+        cache = get_llm_details_cache()
+        cache_key = self._cache_key(llm_client, plant_name)
+        if cache is not None:
+            with stage("llm_cache") as timing:
+                cached = cache.get(cache_key)
+                timing.cache = "miss" if cached is None else "hit"
+            if cached is not None:
+                logger.info(f"LLM details cache hit for '{plant_name}'")
+                for section in cached.items():
+                    yield section
+                return
 
+        received = {}
+        async for key, value in llm_client.stream_plant_details(plant_name):
+            received[key] = value
+            yield key, value
+        # The client has validated the complete response once the stream is exhausted
+        self._store(cache, cache_key, plant_name, received)
@@ -1,22 +1,107 @@
 """Service to extract key cultivation details about a plant from the RHS website."""
 import asyncio
+import os
+import sqlite3
 from fastapi import status
-import requests
+import httpx
 import json
-from bs4 import BeautifulSoup
+from functools import lru_cache
 from app.config import settings
+from app.cache import LRUCache, SingleFlight, StaleWhileRevalidateCache, TieredCache, create_cache, normalise_plant_name
 from app.models import Size, Soil, Position, PlantDetails
 from app.exceptions import PlantServiceErrorCode, PlantServiceException
-from typing import Optional, List
+from app.metrics import stage
+from app.services.http_client import create_async_client
+from app.services.html_parsing import parse_details_elements
+from app.services.rhs_catalogue import RhsCatalogue, STATUS_OK, STATUS_SUMMARY
+from app.services.species_matching import SpeciesMatcher
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
 import logging
 
+if TYPE_CHECKING:
+    # BeautifulSoup is imported on first use (see html_parsing), keeping it out of the cold start
+    from bs4 import BeautifulSoup, Tag
+
 logger = logging.getLogger(__name__)
 
+# Outcomes meaning RHS has no usable details for a plant (no search hits, no match, or summary only)
+NEGATIVE_CACHE_ERROR_CODES = {PlantServiceErrorCode.NO_RESULTS_FOUND, PlantServiceErrorCode.PARSING_ERROR}
+
+PANEL_CLASS = 'plant-attributes__panel'
+
+# Concurrent requests for the same plant share one catalogue/cache lookup or scrape
+rhs_details_flight = SingleFlight("RHS details")
+
+def find_ancestor(tag: "Tag", name: str, class_: str) -> Optional["Tag"]:
+    """Return the nearest ancestor of tag with the given name and CSS class, or None (a lightweight find_parent)."""
+    parent = tag.parent
+    while parent is not None:
+        if parent.name == name and class_ in (parent.get('class') or ()):
+            return parent
+        parent = parent.parent
+    return None
+
+class PlantDetailsIndex:
+    """
+    Index of the section headings in an RHS plant details element, built in a single pass.
+
+    Section extractors look panels, fields and text sections up here, instead of each searching the
+    whole tree. Lookups match BeautifulSoup's find(..., string=...) semantics: the first heading whose
+    text is exactly the given string.
+
+    Args:
+        soup (BeautifulSoup): Parsed 'lib-plant-details-full' element.
+    """
+    def __init__(self, soup: "BeautifulSoup"):
+        self._h5: Dict[str, "Tag"] = {}
+        self._h6: Dict[str, "Tag"] = {}
+        self._panel_of: Dict[int, Optional["Tag"]] = {}
+        self._panel_headings: Dict[int, List["Tag"]] = {}
+        self._panel_fields: Dict[int, Dict[str, "Tag"]] = {}
+        from bs4 import Tag
+
+        # Plain descendant walk: much cheaper than find_all's generic name/attribute matching
+        for node in soup.descendants:
+            if not isinstance(node, Tag) or node.name not in ('h5', 'h6'):
+                continue
+            text = node.string
+            if node.name == 'h5':
+                if text is not None:
+                    self._h5.setdefault(text, node)
+                continue
+
+            if text is not None:
+                self._h6.setdefault(text, node)
+            panel = find_ancestor(node, 'div', PANEL_CLASS)
+            self._panel_of[id(node)] = panel
+            if panel is not None:
+                self._panel_headings.setdefault(id(panel), []).append(node)
+                if text is not None:
+                    self._panel_fields.setdefault(id(panel), {}).setdefault(text, node)
+
+    def panel(self, title: str) -> Optional["Tag"]:
+        """Return the panel containing the first H6 with the given text, or None."""
+        heading = self._h6.get(title)
+        return self._panel_of.get(id(heading)) if heading is not None else None
+
+    def field(self, panel: "Tag", field_name: str) -> Optional["Tag"]:
+        """Return the first H6 with the given text within a panel, or None."""
+        return self._panel_fields.get(id(panel), {}).get(field_name)
+
+    def headings(self, panel: "Tag") -> List["Tag"]:
+        """Return all H6 headings within a panel, in document order."""
+        return self._panel_headings.get(id(panel), [])
+
+    def section(self, title: str) -> Optional["Tag"]:
+        """Return the first H5 with the given text, or None."""
+        return self._h5.get(title)
+
 class PlantScraper:
     """
     A web scraper for extracting plant details from the RHS website.
 
-    Uses Selenium WebDriver for dynamic content and BeautifulSoup for parsing.
+    Uses a shared, pooled httpx client (HTTP/2 where available) for the RHS search API and plant pages,
+    and BeautifulSoup for parsing.
     
     Args:
         base_url (str): The base URL for RHS plant search queries.
@@ -24,6 +109,8 @@ class PlantScraper:
     Raises:
         PlantServiceException: If base_url is empty or invalid.
     """
+    _http_client: Optional[httpx.AsyncClient] = None
+
     def __init__(self, base_url: str):
         if not base_url:
             raise PlantServiceException(
@@ -33,20 +120,26 @@ class PlantScraper:
             )
         self.base_url = base_url
 
-    def _find_plant_details(self, soup: BeautifulSoup, selector: str) -> Optional[BeautifulSoup]:
+    @classmethod
+    def get_http_client(cls) -> httpx.AsyncClient:
+        """Return the httpx client shared by all scrapers, creating it on first use."""
+        if cls._http_client is None or cls._http_client.is_closed:
+            cls._http_client = create_async_client(timeout=settings.HTTP_TIMEOUT)
+        return cls._http_client
+
+    def _find_plant_details(self, index: PlantDetailsIndex, selector: str) -> Optional["BeautifulSoup"]:
         """
         Locate parent div for specific section within the parsed HTML.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML from the RHS website.
+            index (PlantDetailsIndex): Heading index of the parsed HTML from the RHS website.
             selector (str): Name of the section title (H6) to search for.
 
         Returns:
             Optional[BeautifulSoup]: Soup for the section if title found, None otherwise.
         """
         try:
-            panel = soup.find('h6', string=selector)
-            return panel.find_parent('div', class_='plant-attributes__panel') if panel else None
+            return index.panel(selector)
         except AttributeError:
             raise PlantServiceException(
                 error_code=PlantServiceErrorCode.PARSING_ERROR,
@@ -54,41 +147,43 @@ class PlantScraper:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
-    def _extract_field(self, panel: BeautifulSoup, field_name: str) -> Optional[str]:
+    def _extract_field(self, index: PlantDetailsIndex, panel: "BeautifulSoup", field_name: str) -> Optional[str]:
         """
         Extract a single field value from a panel.
 
         Args:
+            index (PlantDetailsIndex): Heading index of the parsed HTML.
             panel (BeautifulSoup): Panel containing the field.
             field_name (str): Name of the field to extract.
 
         Returns:
             Optional[str]: Field value if found, None otherwise.
         """
-        field_div = panel.find('h6', string=field_name)
+        field_div = index.field(panel, field_name)
         if field_div:
-            parent_div = field_div.find_parent('div', class_='flag__body')
+            parent_div = find_ancestor(field_div, 'div', 'flag__body')
             return parent_div.contents[-1].strip() if parent_div else None
         else:
             logger.warning(f"H6 tag '{field_name}' not found")
         return None
     
-    def _extract_list_field(self, panel: BeautifulSoup, field_name: str) -> List[str]:
+    def _extract_list_field(self, index: PlantDetailsIndex, panel: "BeautifulSoup", field_name: str) -> List[str]:
         """
         Extract a field with multiple strings from a panel.
 
         Args:
+            index (PlantDetailsIndex): Heading index of the parsed HTML.
             panel (BeautifulSoup): Panel containing the field.
             field_name (str): Name of the field to extract.
 
         Returns:
             List[str]: Field values if found, None otherwise.
         """
-        field_h6 = panel.find('h6', string=field_name)
+        field_h6 = index.field(panel, field_name)
         if not field_h6:
             return []
         
-        parent = field_h6.find_parent('div', class_='l-module')
+        parent = find_ancestor(field_h6, 'div', 'l-module')
         if not parent:
             return []
         
@@ -96,44 +191,44 @@ class PlantScraper:
                 for span in parent.find_all('span')
                 if span.text.strip()]
     
-    def _extract_size(self, soup: BeautifulSoup) -> Optional[Size]:
+    def _extract_size(self, index: PlantDetailsIndex) -> Optional[Size]:
         """
         Extract plant size information from the parsed HTML.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML containing size information.
+            index (PlantDetailsIndex): Heading index of the parsed HTML containing size information.
 
         Returns:
             Optional[Size]: Size details if found, None otherwise.
         """
-        size_panel = self._find_plant_details(soup, 'Size')
+        size_panel = self._find_plant_details(index, 'Size')
         if not size_panel:
             logger.warning("Size panel not found in soup")
             return None
         
         return Size(
-            height = self._extract_field(size_panel, 'Ultimate height'),
-            spread = self._extract_field(size_panel, 'Ultimate spread'),
-            time_to_height = self._extract_field(size_panel, 'Time to ultimate height'),
+            height = self._extract_field(index, size_panel, 'Ultimate height'),
+            spread = self._extract_field(index, size_panel, 'Ultimate spread'),
+            time_to_height = self._extract_field(index, size_panel, 'Time to ultimate height'),
         )
     
-    def _extract_hardiness(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_hardiness(self, index: PlantDetailsIndex) -> Optional[str]:
         """
         Extract plant hardiness from the parsed HTML.
 
         Args:
-            soup (BeautifulSoup): Parsed HTML containing hardiness information.
+            index (PlantDetailsIndex): Heading index of the parsed HTML containing hardiness information.
 
         Returns:
             Optional[str]: Hardiness rating and desriptor if found, None otherwise.
         """
-        pos_panel = self._find_plant_details(soup, 'Position')
+        pos_panel = self._find_plant_details(index, 'Position')
         if not pos_panel:
             logger.warning("Position panel not found in soup")
             return None
         
         logger.debug("Searching for hardiness information in Position panel")
-        for h6 in pos_panel.find_all('h6', class_='u-m-b-0'):
+        for h6 in (h6 for h6 in index.headings(pos_panel) if 'u-m-b-0' in h6.get('class', [])):
             if 'Hardiness' in h6.get_text():
                 logger.debug("Found hardiness header in panel")
                 rating = h6.parent.find('span', recursive=False)
@@ -151,17 +246,17 @@ class PlantScraper:
         logger.warning("Hardiness information not found in Position panel")                    
         return 'Hardiness rating not found'
     
-    def _extract_soil(self, soup: BeautifulSoup) -> Optional[Soil]:
+    def _extract_soil(self, index: PlantDetailsIndex) -> Optional[Soil]:
         """
         Extract soil requirements from the parsed HTML.
 
         Args:
-            soup (BeautifulSoup): Parsed HTML containing soil information.
+            index (PlantDetailsIndex): Heading index of the parsed HTML containing soil information.
 
         Returns:
             Optional[Soil]: Soil requirements if found, None otherwise.
         """
-        gc_panel = self._find_plant_details(soup, 'Growing conditions')
+        gc_panel = self._find_plant_details(index, 'Growing conditions')
         if not gc_panel:
             logger.warning("Growing conditions panel not found in soup")
             return None
@@ -176,10 +271,10 @@ class PlantScraper:
                 logger.debug("No soil flags with text found")
 
         # Extract moisture levels
-        moisture = self._extract_list_field(gc_panel, 'Moisture')
+        moisture = self._extract_list_field(index, gc_panel, 'Moisture')
 
         # Extract pH levels
-        ph = self._extract_list_field(gc_panel, 'pH')
+        ph = self._extract_list_field(index, gc_panel, 'pH')
 
         if soil_types or moisture or ph:
             soil_info = Soil(
@@ -192,17 +287,17 @@ class PlantScraper:
         logger.warning("Soil information not found in Growing conditions panel")
         return None
        
-    def _extract_position(self, soup: BeautifulSoup) -> Optional[Position]:
+    def _extract_position(self, index: PlantDetailsIndex) -> Optional[Position]:
         """
         Extract position and sunlight requirements from the parsed HTML.
 
         Args:
-            soup (BeautifulSoup): Parsed HTML containing position information.
+            index (PlantDetailsIndex): Heading index of the parsed HTML containing position information.
 
         Returns:
             Optional[Position]: Position requirements if found, None otherwise.
         """
-        pos_panel = self._find_plant_details(soup, 'Position')
+        pos_panel = self._find_plant_details(index, 'Position')
         if not pos_panel:
             logger.warning("Position panel not found in soup")
             return None
@@ -236,7 +331,7 @@ class PlantScraper:
             logger.debug("No p tag found within Plant attributes content")
 
         # Extract exposure info
-        exposure = self._extract_list_field(content, 'Exposure')
+        exposure = self._extract_list_field(index, pos_panel, 'Exposure')
         if exposure:
             position.exposure = ' '.join(exposure)
 
@@ -246,18 +341,18 @@ class PlantScraper:
         logger.warning("Position info not found in Position panel")
         return None
     
-    def _extract_href_text_field(self, soup: BeautifulSoup, field_name: str) -> Optional[str]:
+    def _extract_href_text_field(self, index: PlantDetailsIndex, field_name: str) -> Optional[str]:
         """
         Extract text section with href links from the parsed HTML.
 
         Args:
-            soup (BeautifulSoup): Parsed HTML containing required information.
+            index (PlantDetailsIndex): Heading index of the parsed HTML containing required information.
             field_name(str): Name of the field to extract.
 
         Returns:
             Optional[str]: Text with href links if found, None otherwise.
         """
-        field_div = soup.find('h5', string=field_name)
+        field_div = index.section(field_name)
         if not field_div:
             logger.warning(f"H5 tag {field_name} not found in soup")
             return None
@@ -290,26 +385,21 @@ class PlantScraper:
         logger.warning(f"Html text for {field_name} not found in soup")
         return None    
        
-    def search_rhs_plants(self, species: str) -> Optional[PlantDetails]:
+    async def search_rhs_page(self, keywords: str, start_from: int = 0, page_size: int = 20) -> dict:
         """
-        Perform a search for a plant species on the RHS website.
+        Request one page of results from the RHS search API.
 
         Args:
-            species (str): Plant species name to search for.
+            keywords (str): Search keywords.
+            start_from (int): Offset of the first result to return.
+            page_size (int): Maximum number of results to return.
 
         Returns:
-            List of search results (max 20).
+            dict: Search API response, with 'hits' and 'totalHits'.
 
         Raises:
-            PlantServiceException for various error conditions.
+            PlantServiceException: If the request fails or times out.
         """
-        if not species:
-            raise PlantServiceException(
-                error_code=PlantServiceErrorCode.VALIDATION_ERROR,
-                message="Species name cannot be empty",
-                status_code=status.HTTP_400_BAD_REQUEST
-            )
-        
         headers = {
             "accept": "application/json, text/plain, */*",
             "content-type": "application/json",
@@ -318,49 +408,87 @@ class PlantScraper:
         }
 
         search_payload = {
-            "pageSize": 20,
-            "startFrom": 0,
-            "keywords": species
+            "pageSize": page_size,
+            "startFrom": start_from,
+            "keywords": keywords
         }
-        
+
         try:
-            logger.info(f"Sending search request for {species}...")
-            response = requests.post(
-                settings.RHS_SEARCH_API_URL,
-                headers=headers,
-                data=json.dumps(search_payload),
-                timeout=10
-            )
+            logger.info(f"Sending search request for '{keywords}' (from {start_from})...")
+            with stage("rhs_search") as timing:
+                response = await self.get_http_client().post(
+                    settings.RHS_SEARCH_API_URL,
+                    headers=headers,
+                    content=json.dumps(search_payload)
+                )
+                timing.status = str(response.status_code)
             response.raise_for_status()
-        except requests.Timeout as e:
+        except httpx.TimeoutException as e:
             raise PlantServiceException(
                 error_code=PlantServiceErrorCode.TIMEOUT_ERROR,
-                message=f"Search request timed out for {species}",
+                message=f"Search request timed out for {keywords}",
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 details={"error": str(e)}
             )
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             raise PlantServiceException(
                 error_code=PlantServiceErrorCode.NETWORK_ERROR,
-                message=f"Failed to search RHS for {species}",
+                message=f"Failed to search RHS for {keywords}",
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 details={"error": str(e)}
             )
+        return response.json()
+
+    async def search_rhs_plants(self, species: str) -> List[dict]:
+        """
+        Perform a search for a plant species on the RHS website.
 
-        search_results = response.json().get('hits', [])
+        Args:
+            species (str): Plant species name to search for.
+
+        Returns:
+            List of search results (max 20).
+
+        Raises:
+            PlantServiceException for various error conditions.
+        """
+        if not species:
+            raise PlantServiceException(
+                error_code=PlantServiceErrorCode.VALIDATION_ERROR,
+                message="Species name cannot be empty",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Reuse recent search hits for the same keywords
+        search_cache = get_rhs_search_cache()
+        cache_key = normalise_plant_name(species)
+        if search_cache is not None:
+            with stage("rhs_search_cache") as timing:
+                cached_results = search_cache.get(cache_key)
+                timing.cache = "hit" if cached_results else "miss"
+            if cached_results:
+                logger.info(f"RHS search cache hit for {species}")
+                return cached_results
+
+        search_results = (await self.search_rhs_page(species)).get('hits', [])
         if not search_results:
             raise PlantServiceException(
                 error_code=PlantServiceErrorCode.PARSING_ERROR,
                 message="Empty response from RHS search API",
                 status_code=status.HTTP_404_NOT_FOUND,
             )
-        
+
+        if search_cache is not None:
+            search_cache.set(cache_key, search_results)
         return search_results
     
     def find_match(self, species: str, search_results: List[dict]) -> str:
         """
         Find the best matching plant URL from search results.
 
+        Results are ranked by SpeciesMatcher: exact, hybrid sign, author-stripped and cultivar/group matches,
+        then the most similar species name above RHS_MATCH_MIN_SIMILARITY.
+
         Args:
             species (str): Original search species.
             search_results (List[dict]): Search results from RHS.
@@ -371,45 +499,29 @@ class PlantScraper:
         Raises:
             PlantServiceException if no match found.
         """
-        species_lower = species.lower()
         logger.info("Checking search results for matches...")
+        match = SpeciesMatcher(species, settings.RHS_MATCH_MIN_SIMILARITY).best_match(search_results)
 
-        match_found = False
-
-        # Check for exact match
-        for result in search_results:
-            name = BeautifulSoup(result.get('botanicalName'), "html.parser").get_text().lower()
-            if species_lower == name:
-                match_found = True
-                logger.info(f"Exact match found for '{name}'")
-                return self._get_match_link(result, name)
-
-        # If no exact match, check for "species + ("
-        if not match_found:
-            for result in search_results:
-                name = BeautifulSoup(result.get('botanicalName'), "html.parser").get_text().lower()
-                if f"{species_lower} (" in name:
-                    match_found = True
-                    logger.info(f"'Bracket match' found for '{name}'")
-                    return self._get_match_link(result, name)
-                
         # If no match, raise Exception
-        if not match_found:
+        if match is None:
             logger.warning(f"No match found for {species}")
             raise PlantServiceException(
                 error_code=PlantServiceErrorCode.NO_RESULTS_FOUND,
                 message=f"No matching search results found for '{species}'",
                 status_code=status.HTTP_404_NOT_FOUND
             )
+
+        logger.info(f"'{match.kind.capitalize()} match' found for '{match.name}' (score {match.score:.2f})")
+        return self._get_match_link(match.result, match.name)
                
     def _get_match_link(self, match: dict, name: str) -> str:
         """Return RHS url for plant."""
         id = match.get("id")
         name = name.replace(" ", "-")
-        plant_url = f"https://www.rhs.org.uk/plants/{id}/{name}/details"
+        plant_url = f"{settings.RHS_PLANTS_URL}/{id}/{name}/details"
         return plant_url
 
-    def rhs_plant_search(self, species: str) -> Optional[PlantDetails]:
+    async def rhs_plant_search(self, species: str) -> Optional[PlantDetails]:
         """
         Comprehensive plant search and details retrieval.
 
@@ -421,14 +533,15 @@ class PlantScraper:
         """
         try:
             # Search for plant
-            search_results = self.search_rhs_plants(species)
+            search_results = await self.search_rhs_plants(species)
 
             # Check for match
-            match_url = self.find_match(species, search_results)
+            with stage("rhs_match"):
+                match_url = self.find_match(species, search_results)
 
             # Retrieve plant details
             logger.info("Searching for plant details...")
-            return self.get_rhs_details(match_url, species)
+            return await self.get_rhs_details(match_url, species)
         except PlantServiceException:
             raise
         except Exception as e:
@@ -440,7 +553,7 @@ class PlantScraper:
                 details={"error": str(e)}
             )
 
-    def get_rhs_details(self, url: str, species: str = '') -> Optional[PlantDetails]:
+    async def get_rhs_details(self, url: str, species: str = '') -> Optional[PlantDetails]:
         """
         Retrieve detailed plant information from a specific RHS plant details page.
 
@@ -461,16 +574,18 @@ class PlantScraper:
 
             try:
                 logger.info(f"Requesting {url}")
-                response = requests.get(url=url, headers=headers, timeout=10)
+                with stage("rhs_page") as timing:
+                    response = await self.get_http_client().get(url=url, headers=headers)
+                    timing.status = str(response.status_code)
                 response.encoding = "utf-8"
-            except requests.Timeout as e:
+            except httpx.TimeoutException as e:
                 raise PlantServiceException(
                     error_code=PlantServiceErrorCode.TIMEOUT_ERROR,
                     message=f"Timed out when attempting to get {url}",
                     status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                     details={"error": str(e)}
                 )
-            except requests.RequestException as e:
+            except httpx.HTTPError as e:
                 raise PlantServiceException(
                     error_code=PlantServiceErrorCode.NETWORK_ERROR,
                     message=f"Failed to access RHS at {url}",
@@ -478,17 +593,44 @@ class PlantScraper:
                     details={"error": str(e)}
                 )
 
-            logger.info("Extracting soup...")
-            soup = BeautifulSoup(response.text, "html.parser")
+            # Parse in a worker thread, so the CPU-bound parse does not block other requests on the event loop
+            return await asyncio.to_thread(self.parse_rhs_details, response.text, species)
+
+        except PlantServiceException:
+            raise
+        except Exception as e:
+            logger.debug(f"Exception: str{e}")
+            raise PlantServiceException(
+                error_code=PlantServiceErrorCode.PARSING_ERROR,
+                message="Failed to process plant details",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                details={"error": str(e)}
+            )
+
+    def parse_rhs_details(self, html: str, species: str = '') -> Optional[PlantDetails]:
+        """
+        Parse plant information from the HTML of an RHS plant details page.
 
+        Args:
+            html (str): HTML of the plant's details page.
+            species (str, optional): The name of the plant species, for context in error messages.
+
+        Returns:
+            Optional[PlantDetails]: Structured plant details if found, None otherwise.
+
+        Raises:
+            PlantServiceException: If the page has no full plant details, or they cannot be parsed.
+        """
+        try:
             # Check if page contains full details or only summary
-            logger.info("Looking for lib-plant-details elements...")
-            full_details_element = soup.select_one('lib-plant-details-full')
-            summary_element = soup.select_one('lib-plant-details-summary')
+            logger.info(f"Extracting lib-plant-details elements (parser: {settings.RHS_HTML_PARSER})...")
+            with stage("rhs_parse"):
+                full_details_element, summary_element = parse_details_elements(html, settings.RHS_HTML_PARSER)
 
             if full_details_element:
                 logger.info("Found full details element")
-                return self._extract_all_details(full_details_element)
+                with stage("rhs_extract"):
+                    return self._extract_all_details(full_details_element)
             
             elif summary_element:
                 raise PlantServiceException(
@@ -515,7 +657,7 @@ class PlantScraper:
                 details={"error": str(e)}
             )
               
-    def _extract_all_details(self, soup: BeautifulSoup) -> PlantDetails:
+    def _extract_all_details(self, soup: "BeautifulSoup") -> PlantDetails:
         """
         Extract all plant details from the parsed HTML.
 
@@ -525,15 +667,63 @@ class PlantScraper:
         Returns:
             PlantDetails: Structured plant information
         """
+        # Walk the element once to index its headings, rather than searching the tree in every extractor
+        index = PlantDetailsIndex(soup)
         return PlantDetails(
-            size=self._extract_size(soup),
-            hardiness=self._extract_hardiness(soup),
-            soil=self._extract_soil(soup),
-            position=self._extract_position(soup),
-            cultivation_tips=self._extract_href_text_field(soup, 'Cultivation'),
-            pruning=self._extract_href_text_field(soup, 'Pruning')
+            size=self._extract_size(index),
+            hardiness=self._extract_hardiness(index),
+            soil=self._extract_soil(index),
+            position=self._extract_position(index),
+            cultivation_tips=self._extract_href_text_field(index, 'Cultivation'),
+            pruning=self._extract_href_text_field(index, 'Pruning')
         )
 
+@lru_cache
+def get_rhs_search_cache() -> Optional[TieredCache]:
+    """Creates and returns the cached RHS search results cache, or None if disabled."""
+    if not settings.RHS_CACHE_ENABLED:
+        return None
+    return create_cache("rhs_search", settings.RHS_CACHE_MAX_ENTRIES, settings.RHS_SEARCH_CACHE_TTL_SECONDS)
+
+@lru_cache
+def get_rhs_negative_cache() -> Optional[TieredCache]:
+    """Creates and returns the cached cache of plants known to have no RHS details, or None if disabled."""
+    if not settings.RHS_CACHE_ENABLED:
+        return None
+    return create_cache("rhs_negative", settings.RHS_CACHE_MAX_ENTRIES, settings.RHS_NEGATIVE_CACHE_TTL_SECONDS)
+
+@lru_cache
+def get_rhs_details_cache() -> Optional[StaleWhileRevalidateCache]:
+    """Creates and returns the cached RHS plant details cache, or None if disabled."""
+    if not settings.RHS_CACHE_ENABLED:
+        return None
+    cache = create_cache(
+        "rhs_details",
+        settings.RHS_CACHE_MAX_ENTRIES,
+        settings.RHS_CACHE_TTL_SECONDS + settings.RHS_CACHE_STALE_SECONDS
+    )
+    return StaleWhileRevalidateCache(cache, settings.RHS_CACHE_TTL_SECONDS, settings.RHS_CACHE_STALE_SECONDS)
+
+@lru_cache
+def get_rhs_catalogue() -> Optional[RhsCatalogue]:
+    """Opens and returns the cached read-only RHS catalogue, or None if not configured or not found."""
+    path = settings.RHS_CATALOGUE_PATH
+    if not path:
+        return None
+    if not os.path.exists(path):
+        logger.warning(f"RHS catalogue not found at {path}")
+        return None
+    try:
+        return RhsCatalogue(path, readonly=True)
+    except sqlite3.Error as e:
+        logger.warning(f"Failed to open RHS catalogue at {path}: {e}")
+        return None
+
+@lru_cache
+def get_rhs_catalogue_misses() -> LRUCache:
+    """Creates and returns the cached record of lookups the (read-only, so unchanging) catalogue has no match for."""
+    return LRUCache(max_entries=settings.RHS_CACHE_MAX_ENTRIES)
+
 # Service-layer class
 class PlantDetailsRhsService:
     """
@@ -542,6 +732,139 @@ class PlantDetailsRhsService:
     """
     @staticmethod
     async def retrieve_plant_details(plant: str) -> PlantDetails:
+        """
+        Retrieve plant details, from the local catalogue or details cache if possible, otherwise from the RHS website.
+
+        Cached details older than RHS_CACHE_TTL_SECONDS are still returned, while being refreshed in the background.
+        Concurrent calls for the same (normalised) plant name share a single retrieval.
+
+        Args:
+            plant (str): Name of the plant species to search for.
+
+        Returns:
+            PlantDetails: Structured plant information.
+
+        Raises:
+            PlantServiceException: If retrieval fails for any reason.
+        """
+        return await rhs_details_flight.do(
+            normalise_plant_name(plant),
+            lambda: PlantDetailsRhsService._retrieve_plant_details(plant)
+        )
+
+    @staticmethod
+    async def _retrieve_plant_details(plant: str) -> PlantDetails:
+        """Retrieve plant details from the catalogue, details cache or RHS website (see retrieve_plant_details)."""
+        # Serve plants already crawled into the local catalogue without any network round-trip
+        details = await PlantDetailsRhsService.lookup_catalogue(plant, fuzzy=False)
+        if details is not None:
+            return details
+
+        async def fetch_uncached() -> PlantDetails:
+            # Fuzzy catalogue matches are slower than an exact lookup, so only tried when the caches miss
+            details = await PlantDetailsRhsService.lookup_catalogue(plant, fuzzy=True)
+            if details is not None:
+                return details
+            return await PlantDetailsRhsService.fetch_plant_details(plant)
+
+        cache = get_rhs_details_cache()
+        if cache is None:
+            return await fetch_uncached()
+        cache_key = normalise_plant_name(plant)
+
+        # Fail fast for plants recently found to have no (full) RHS details, so callers can fall back to the LLM
+        negative_cache = get_rhs_negative_cache()
+        if negative_cache is not None:
+            with stage("rhs_negative_cache") as timing:
+                known_miss = negative_cache.get(cache_key)
+                timing.cache = "miss" if known_miss is None else "hit"
+            if known_miss is not None:
+                logger.info(f"RHS negative cache hit for '{plant}'")
+                raise PlantServiceException.from_dict(known_miss)
+
+        fetched = False
+
+        async def fetch() -> dict:
+            nonlocal fetched
+            fetched = True
+            try:
+                details = await fetch_uncached()
+            except PlantServiceException as e:
+                if negative_cache is not None and e.status_code == status.HTTP_404_NOT_FOUND and e.error_code in NEGATIVE_CACHE_ERROR_CODES:
+                    negative_cache.set(cache_key, e.to_dict())
+                raise
+            return details.to_dict()
+
+        # Timed as a whole, as a miss includes fetching the details from RHS
+        with stage("rhs_details_cache") as timing:
+            details = await cache.get_or_fetch(cache_key, fetch)
+            timing.cache = "miss" if fetched else "hit"
+        return PlantDetails.from_dict(details)
+
+    @staticmethod
+    async def stream_plant_details(plant: str) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream plant details one (field, value) section at a time, in the same shape as the LLM stream.
+
+        This only mirrors the LLM stream's shape, so clients can handle both sources alike: no section is available
+        until the search, details page fetch and parse (around 20 ms with lxml-xpath, 100+ ms with the other
+        RHS_HTML_PARSER backends, see benchmarks/bench_html_parsers.py) have all completed, and then every
+        section is emitted at once. It gives no time-to-first-section gain over the non-streaming endpoint.
+        """
+        details = await PlantDetailsRhsService.retrieve_plant_details(plant)
+        for section, value in details.to_dict().items():
+            yield section, value
+
+    @staticmethod
+    async def lookup_catalogue(plant: str, fuzzy: bool = True) -> Optional[PlantDetails]:
+        """
+        Look plant details up in the local RHS catalogue, in a worker thread so the event loop is not blocked.
+
+        Lookups without a match are remembered, so are not repeated.
+
+        Args:
+            plant (str): Name of the plant species to look up.
+            fuzzy (bool): Whether to fall back to similar species names if no entry has the plant's species name.
+
+        Returns:
+            Optional[PlantDetails]: Catalogued details, or None if the catalogue is unavailable, has no match,
+                or has not fetched the matched plant's details yet.
+
+        Raises:
+            PlantServiceException: If the catalogue records that RHS only has a summary for the plant.
+        """
+        catalogue = get_rhs_catalogue()
+        if catalogue is None:
+            return None
+        misses = get_rhs_catalogue_misses()
+        miss_key = f"{'fuzzy' if fuzzy else 'exact'}:{normalise_plant_name(plant)}"
+        if misses.get(miss_key) is not None:
+            return None
+
+        with stage("rhs_catalogue_fuzzy" if fuzzy else "rhs_catalogue") as timing:
+            try:
+                entry = await asyncio.to_thread(catalogue.lookup, plant, settings.RHS_MATCH_MIN_SIMILARITY, fuzzy)
+            except sqlite3.Error as e:
+                logger.warning(f"RHS catalogue lookup failed for '{plant}': {e}")
+                return None
+            timing.cache = "hit" if entry is not None and entry['status'] in (STATUS_OK, STATUS_SUMMARY) else "miss"
+
+        if entry is None:
+            misses.set(miss_key, True)
+            return None
+        if entry['status'] == STATUS_OK:
+            logger.info(f"RHS catalogue hit for '{plant}'")
+            return PlantDetails.from_dict(entry['details'])
+        if entry['status'] == STATUS_SUMMARY:
+            raise PlantServiceException(
+                error_code=PlantServiceErrorCode.NO_RESULTS_FOUND,
+                message=f"RHS has no detailed information for '{plant}', only a brief summary",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        return None
+
+    @staticmethod
+    async def fetch_plant_details(plant: str) -> PlantDetails:
         """
         Asynchronously retrieve plant details from RHS website.
 
@@ -558,7 +881,7 @@ class PlantDetailsRhsService:
         try:
             scraper = PlantScraper(base_url=settings.RHS_BASE_URL)
 
-            details = await asyncio.to_thread(scraper.rhs_plant_search, plant)
+            details = await scraper.rhs_plant_search(plant)
             
             if details is None:
                 raise PlantServiceException(
@@ -1,96 +1,274 @@
 """Service to identify plant species based on uploaded image, using the PlantNet API."""
-import os
-import requests
+import asyncio
 import json
+import hashlib
+import os
+import time
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+import httpx
 from fastapi import status
-from app.models import Organ
+from app.models import Organ, PlantImage
 from app.exceptions import PlantServiceErrorCode, PlantServiceException
 from app.config import settings
+from app.cache import SingleFlight, TieredCache, PerceptualHashIndex, create_cache, make_cache_key
+from app.metrics import stage
+from app.services.http_client import create_async_client
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of images PlantNet accepts in a single identification query
+PLANTNET_MAX_IMAGES = 5
+
+# Concurrent identifications of the same images (and organs and query settings) share one PlantNet call
+identification_flight = SingleFlight("identification")
+
+class PlantNetClient:
+    """
+    Asynchronous client for the PlantNet API.
+
+    All instances share one pooled, keep-alive httpx client (HTTP/2 where available), so concurrent
+    identification requests overlap on the event loop instead of blocking it.
+    """
+    _http_client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def get_http_client(cls) -> httpx.AsyncClient:
+        """Return the shared httpx client, creating it on first use."""
+        if cls._http_client is None or cls._http_client.is_closed:
+            cls._http_client = create_async_client(timeout=settings.PLANTNET_TIMEOUT)
+        return cls._http_client
+
+    async def identify(self, files: list, data: dict) -> httpx.Response:
+        """
+        Post images and organs to the PlantNet 'identify' endpoint.
+
+        Args:
+            files (list): Multipart file tuples for the images.
+            data (dict): Form data, including the 'organs' list.
+
+        Returns:
+            httpx.Response: Raw PlantNet response.
+        """
+        logger.info("Calling PlantNet API...")
+        with stage("plantnet") as timing:
+            response = await self.get_http_client().post(
+                url=settings.PLANTNET_ENDPOINT,
+                files=files,
+                data=data
+            )
+            timing.status = str(response.status_code)
+        return response
+
+@lru_cache
+def get_identification_cache() -> Optional[TieredCache]:
+    """Creates and returns the cached identification result cache, or None if disabled."""
+    if not settings.ID_CACHE_ENABLED:
+        return None
+    return create_cache("identification", settings.ID_CACHE_MAX_ENTRIES, settings.ID_CACHE_TTL_SECONDS)
+
+@lru_cache
+def get_phash_index() -> Optional[PerceptualHashIndex]:
+    """Creates and returns the cached perceptual hash index, or None if disabled."""
+    if not settings.PHASH_INDEX_ENABLED:
+        return None
+    # Expires with the identification cache, so near-duplicates are not answered from older matches than exact repeats
+    return PerceptualHashIndex(max_entries=settings.PHASH_INDEX_MAX_ENTRIES, ttl=settings.ID_CACHE_TTL_SECONDS)
+
 class PlantIdentificationService:
     @staticmethod
-    def identify_plant(image_path: str, organ: Organ) -> dict:
+    def _query_context(organs: List[Organ]) -> str:
+        """Key for the organs and PlantNet query settings that affect identification results."""
+        return make_cache_key([organ.value for organ in organs], settings.PROJECT, settings.NUM_RESULTS, settings.SIMSEARCH)
+
+    @staticmethod
+    def _cache_key(images: List[PlantImage]) -> str:
+        """Key identification results by image contents, organs and the PlantNet query settings."""
+        return make_cache_key(
+            [hashlib.sha256(image.content).hexdigest() for image in images],
+            PlantIdentificationService._query_context([image.organ for image in images])
+        )
+
+    @staticmethod
+    async def _perceptual_hash(content: bytes) -> Optional[int]:
+        """Compute the image's perceptual hash in a worker thread, or return None if it cannot be decoded."""
+        # Imported on first use, keeping Pillow and NumPy out of the cold start
+        from app.services.imaging import perceptual_hash
+        try:
+            return await asyncio.to_thread(perceptual_hash, content, settings.PHASH_ALGORITHM)
+        except Exception as e:
+            logger.debug(f"Could not compute perceptual hash: {e}")
+            return None
+
+    @staticmethod
+    async def _prepare_upload(content: bytes, filename: str) -> Tuple[str, bytes, str]:
+        """
+        Normalise the image in a worker thread (if enabled) and return the (filename, content, content type) to upload.
+
+        Falls back to the original bytes, labelled with their detected type, if the image cannot be normalised.
+        """
+        # Imported on first use, keeping Pillow and NumPy out of the cold start
+        from app.services.imaging import detect_content_type, normalise_image
+        if settings.IMAGE_NORMALISE_ENABLED:
+            try:
+                normalised, content_type = await asyncio.to_thread(
+                    normalise_image, content, settings.IMAGE_MAX_EDGE, settings.IMAGE_JPEG_QUALITY
+                )
+                logger.debug(f"Normalised image from {len(content) / 1024:.1f} KB to {len(normalised) / 1024:.1f} KB")
+                return f"{os.path.splitext(os.path.basename(filename))[0]}.jpg", normalised, content_type
+            except Exception as e:
+                logger.warning(f"Image normalisation failed, uploading original: {e}")
+        return filename, content, detect_content_type(content) or 'image/jpeg'
+
+    @staticmethod
+    async def identify_plant(image: Union[str, bytes], organ: Organ, filename: Optional[str] = None) -> dict:
         """
         Calls the PlantNet API to identify the plant.
 
         Args:
-            image_path (str): Path for image to be uploaded
+            image (str | bytes): Path for image to be uploaded, or the raw image bytes.
             organ (Organ): Organ type to be passed to PlantNet API.
-        
+            filename (str, optional): Filename reported to PlantNet. Defaults to the image path, or 'image.jpg' for raw bytes.
+
         Returns:
             matches (dict): 3 most likely plants that match the image.
 
         Raises:
-            PlantServiceException: If PlantNet cannot identify the species, or the service encounters an issue.     
+            PlantServiceException: If PlantNet cannot identify the species, or the service encounters an issue.
         """
         try:
-            with open(image_path, 'rb') as image_data:
-                file_header = image_data.read(10)
-                logger.debug(f"File header: {file_header.hex()}")
-                image_data.seek(0)
-
-                files = [('images', (image_path, image_data, 'image/jpeg'))]
-                data = {'organs': [organ.value]}
-
-                logger.debug(f"Files: {files}")
-                logger.debug(f"File size: {os.path.getsize(image_path) / 1024} KB")
-
-                logger.info("Calling PlantNet API...")
-                response = requests.post(
-                    url=settings.PLANTNET_ENDPOINT, 
-                    files=files, 
-                    data=data
+            if isinstance(image, str):
+                filename = filename or image
+                with open(image, 'rb') as image_data:
+                    content = image_data.read()
+            else:
+                filename = filename or "image.jpg"
+                content = bytes(image)
+        except OSError as e:
+            raise PlantServiceException(
+                error_code=PlantServiceErrorCode.SERVICE_ERROR,
+                message=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        return await PlantIdentificationService.identify_images([PlantImage(content=content, organ=organ, filename=filename)])
+
+    @staticmethod
+    async def identify_images(images: List[PlantImage]) -> dict:
+        """
+        Calls the PlantNet API to identify one plant from several images, sent together in a single query.
+
+        Args:
+            images (List[PlantImage]): Up to 5 images of the same plant, each with the organ it shows.
+
+        Returns:
+            matches (dict): 3 most likely plants that match the images.
+
+        Raises:
+            PlantServiceException: If PlantNet cannot identify the species, or the service encounters an issue.
+        """
+        if not 1 <= len(images) <= PLANTNET_MAX_IMAGES:
+            raise PlantServiceException(
+                error_code=PlantServiceErrorCode.VALIDATION_ERROR,
+                message=f"Between 1 and {PLANTNET_MAX_IMAGES} images can be identified together",
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+
+        # Concurrent requests with the same images share a single identification
+        cache_key = PlantIdentificationService._cache_key(images)
+        return await identification_flight.do(
+            cache_key,
+            lambda: PlantIdentificationService._identify_images(images, cache_key)
+        )
+
+    @staticmethod
+    async def _identify_images(images: List[PlantImage], cache_key: str) -> dict:
+        """Identify the images from the cache, perceptual hash index or PlantNet (see identify_images)."""
+        try:
+            for image in images:
+                logger.debug(f"File header: {image.content[:10].hex()}")
+
+            # Return cached matches for previously identified images
+            cache = get_identification_cache()
+            if cache is not None:
+                with stage("id_cache") as timing:
+                    cached = cache.get(cache_key)
+                    timing.cache = "miss" if cached is None else "hit"
+                if cached is not None:
+                    logger.info("Identification cache hit")
+                    return {'matches': {int(i): match for i, match in cached['matches'].items()}}
+
+            # Answer near-duplicates of single images (e.g. the same photo re-compressed at another scale) from past matches
+            phash_index = get_phash_index() if len(images) == 1 else None
+            query_context = PlantIdentificationService._query_context([image.organ for image in images])
+            image_hash = nearest = None
+            if phash_index is not None:
+                with stage("phash_index") as timing:
+                    image_hash = await PlantIdentificationService._perceptual_hash(images[0].content)
+                    if image_hash is not None:
+                        nearest = phash_index.nearest(query_context, image_hash, settings.PHASH_MAX_DISTANCE)
+                    timing.cache = "miss" if nearest is None else "hit"
+            if nearest is not None:
+                distance, matches, identified_at = nearest
+                logger.info(f"Near-duplicate image found in perceptual hash index (distance {distance})")
+                if cache is not None:
+                    # Only until the original identification expires, so index hits cannot keep matches alive
+                    cache.set(cache_key, {'matches': matches}, ttl=identified_at + settings.ID_CACHE_TTL_SECONDS - time.time())
+                return {'matches': matches}
+
+            with stage("image_normalise"):
+                uploads = await asyncio.gather(*(
+                    PlantIdentificationService._prepare_upload(image.content, image.filename) for image in images
+                ))
+            files = [('images', upload) for upload in uploads]
+            data = {'organs': [image.organ.value for image in images]}
+
+            for upload in uploads:
+                logger.debug(f"File: {upload[0]} ({upload[2]})")
+                logger.debug(f"File size: {len(upload[1]) / 1024} KB")
+
+            response = await PlantNetClient().identify(files=files, data=data)
+            logger.debug(f"Response: {response} ({response.http_version})")
+
+            # If plant identified, return matches data
+            if response.status_code == 200:
+                with stage("plantnet_parse"):
+                    matches = PlantIdentificationService._shape_matches(response.json())
+
+                logger.info(f"PlantNet matches: {matches}")
+                if cache is not None:
+                    cache.set(cache_key, {'matches': matches})
+                if image_hash is not None:
+                    phash_index.add(query_context, image_hash, matches)
+                return {'matches': matches}
+
+            # Handle 'Species Not Found'
+            elif response.status_code == 404:
+                raise PlantServiceException(
+                    error_code=PlantServiceErrorCode.NO_RESULTS_FOUND,
+                    message="No matching species found",
+                    status_code=status.HTTP_404_NOT_FOUND
+                )
+            # Handle 'Too Many Requests'
+            elif response.status_code == 429:
+                raise PlantServiceException(
+                    error_code=PlantServiceErrorCode.SERVICE_ERROR,
+                    message="Rate limit exceeded",
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS
+                )
+            # Handle other error codes
+            else:
+                raise PlantServiceException(
+                    error_code=PlantServiceErrorCode.SERVICE_ERROR,
+                    message=f"Unexpected error occurred: {response.status_code}",
+                    status_code=response.status_code,
                 )
-                logger.debug(f"Response: {response}")
-
-                # If plant identified, return matches data
-                if response.status_code == 200:
-                    response_data = response.json()
-                    results = response_data.get('results', [])
-
-                    matches = {
-                        i: {
-                            'species': result.get('species', {}).get('scientificNameWithoutAuthor', ''),
-                            'genus': result.get('species', {}).get('genus', {}).get('scientificNameWithoutAuthor', ''),
-                            'score': result.get('score', 0.0),
-                            'commonNames': result.get('species', {}).get('commonNames', []),
-                            'imageUrls': PlantIdentificationService._extract_image_urls(result['images'], 'm', 3)
-                        }
-                        for i, result in enumerate(results)
-                    }
-
-                    logger.info(f"PlantNet matches: {matches}")
-                    return {'matches': matches}
-                
-                # Handle 'Species Not Found'
-                elif response.status_code == 404:
-                    raise PlantServiceException(
-                        error_code=PlantServiceErrorCode.NO_RESULTS_FOUND,
-                        message="No matching species found",
-                        status_code=status.HTTP_404_NOT_FOUND
-                    )
-                # Handle 'Too Many Requests'
-                elif response.status_code == 429:
-                    raise PlantServiceException(
-                        error_code=PlantServiceErrorCode.SERVICE_ERROR,
-                        message="Rate limit exceeded",
-                        status_code=status.HTTP_429_TOO_MANY_REQUESTS
-                    )
-                # Handle other error codes
-                else:
-                    raise PlantServiceException(
-                        error_code=PlantServiceErrorCode.SERVICE_ERROR,
-                        message=f"Unexpected error occurred: {response.status_code}",
-                        status_code=response.status_code,
-                    )
-
-        except requests.RequestException as e:
+
+        except httpx.RequestError as e:
             raise PlantServiceException(
                 error_code=PlantServiceErrorCode.NETWORK_ERROR,
-                message=str(e),
+                message=str(e) or e.__class__.__name__,
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         except json.JSONDecodeError:
@@ -107,12 +285,57 @@ class PlantIdentificationService:
                 message=str(e),
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-    
+
+    @staticmethod
+    async def identify_batch(batch: List[List[PlantImage]], max_concurrency: int) -> List[Union[dict, PlantServiceException]]:
+        """
+        Run several independent identifications concurrently, with at most max_concurrency PlantNet calls in flight.
+
+        Args:
+            batch (List[List[PlantImage]]): Images for each separate identification.
+            max_concurrency (int): Maximum number of concurrent PlantNet queries.
+
+        Returns:
+            List[dict | PlantServiceException]: Matches or the raised exception for each identification, in input order.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def identify(images: List[PlantImage]) -> Union[dict, PlantServiceException]:
+            async with semaphore:
+                try:
+                    return await PlantIdentificationService.identify_images(images)
+                except PlantServiceException as e:
+                    return e
+
+        return await asyncio.gather(*(identify(images) for images in batch))
+
+    @staticmethod
+    def _shape_matches(response_data: dict) -> dict:
+        """
+        Shape a PlantNet 'identify' response into matches for the frontend.
+
+        Args:
+            response_data (dict): Decoded PlantNet response.
+
+        Returns:
+            dict: Match by rank, each with species, genus, score, common names and up to 3 image URLs.
+        """
+        return {
+            i: {
+                'species': result.get('species', {}).get('scientificNameWithoutAuthor', ''),
+                'genus': result.get('species', {}).get('genus', {}).get('scientificNameWithoutAuthor', ''),
+                'score': result.get('score', 0.0),
+                'commonNames': result.get('species', {}).get('commonNames', []),
+                'imageUrls': PlantIdentificationService._extract_image_urls(result['images'], 'm', 3)
+            }
+            for i, result in enumerate(response_data.get('results', []))
+        }
+
     @staticmethod
     def _extract_image_urls(images: list, size: str = "s", max_results: int = None) -> list:
         """
         Extracts image URLs of specified size from the PlantNet API response.
-        
+
         Args:
             images (list): List of image objects from the PlantNet API response.
             size (str): Size of image URLs to extract ("o", "m" or "s").
@@ -129,4 +352,4 @@ class PlantIdentificationService:
                     break
         return image_urls
 
-    
\ No newline at end of file
+
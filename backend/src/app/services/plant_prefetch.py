@@ -0,0 +1,91 @@
+"""Service to prefetch plant details for confident identification matches."""
+import asyncio
+from typing import Dict, Optional, Set, Tuple, Union
+from fastapi import status
+from app.exceptions import PlantServiceErrorCode, PlantServiceException
+from app.models import DetailsSource, PlantDetails
+from app.services.plant_details_hedged import PlantDetailsHedgedService
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Strong references to background prefetches, so they are not garbage collected before finishing
+_background_tasks: Set[asyncio.Task] = set()
+
+class DetailsPrefetchService:
+    """
+    Service layer fetching plant details for the top identification matches, as soon as PlantNet has responded.
+    """
+    @staticmethod
+    def select_species(matches: dict, top_k: int, min_score: float) -> Dict[int, str]:
+        """
+        Choose the matches worth prefetching details for.
+
+        Args:
+            matches (dict): Identification matches by rank, each with 'species' and 'score'.
+            top_k (int): Maximum number of matches to prefetch, best first.
+            min_score (float): Minimum identification score for a match to be prefetched.
+
+        Returns:
+            Dict[int, str]: Species name by match rank.
+        """
+        selected = {}
+        for i, match in sorted(matches.items(), key=lambda item: item[1].get('score', 0.0), reverse=True):
+            if len(selected) >= top_k or match.get('score', 0.0) < min_score:
+                break
+            if match.get('species'):
+                selected[i] = match['species']
+        return selected
+
+    @staticmethod
+    async def fetch_details(species: Dict[int, str], timeout: Optional[float] = None) -> Dict[int, Union[Tuple[PlantDetails, DetailsSource], PlantServiceException]]:
+        """
+        Fetch details for each species concurrently, from RHS with the LLM as a hedged fallback.
+
+        Args:
+            species (Dict[int, str]): Species name by match rank.
+            timeout (float, optional): Seconds to wait for each species' details, after which a timeout error is
+                returned for it. None waits until every fetch completes.
+
+        Returns:
+            Dict[int, Tuple[PlantDetails, DetailsSource] | PlantServiceException]: Details and their source,
+                or the raised exception, by match rank.
+        """
+        async def fetch(plant: str) -> Union[Tuple[PlantDetails, DetailsSource], PlantServiceException]:
+            try:
+                return await asyncio.wait_for(PlantDetailsHedgedService.get_plant_details(plant), timeout)
+            except PlantServiceException as e:
+                return e
+            except asyncio.TimeoutError:
+                return PlantServiceException(
+                    error_code=PlantServiceErrorCode.TIMEOUT_ERROR,
+                    message=f"Plant details for '{plant}' were not prefetched within {timeout}s",
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+
+        results = await asyncio.gather(*(fetch(plant) for plant in species.values()))
+        return dict(zip(species.keys(), results))
+
+    @staticmethod
+    def warm_cache(species: Dict[int, str]) -> None:
+        """
+        Start fetching details for each species in the background (from RHS with the LLM as a hedged fallback, as
+        fetch_details), so follow-up details requests hit the RHS or LLM cache.
+
+        Only for servers that keep running tasks after the response is returned: AWS Lambda freezes them (see
+        Settings.background_tasks_supported).
+
+        Args:
+            species (Dict[int, str]): Species name by match rank.
+        """
+        async def warm(plant: str) -> None:
+            try:
+                _, source = await PlantDetailsHedgedService.get_plant_details(plant)
+                logger.info(f"Prefetched {source.value} details for '{plant}'")
+            except PlantServiceException as e:
+                logger.info(f"Could not prefetch details for '{plant}': {e.message}")
+
+        for plant in species.values():
+            task = asyncio.create_task(warm(plant))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
@@ -0,0 +1,269 @@
+"""SQLite catalogue of RHS plants and their parsed details, built offline by the catalogue crawler."""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from app.services.species_matching import SpeciesMatcher, normalise_name, remove_cultivar, remove_hybrid_markers, strip_markup, trigrams
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Status of a catalogue entry's details page
+STATUS_PENDING = "pending"    # listed by the search API, details not fetched yet
+STATUS_OK = "ok"              # full details parsed
+STATUS_SUMMARY = "summary"    # RHS only has a summary page for the plant
+STATUS_ERROR = "error"        # last fetch failed, retried on the next crawl
+
+# Upper bound on similar species names (and so candidate plants) considered for a fuzzy match
+MAX_FUZZY_SPECIES = 50
+
+class RhsCatalogue:
+    """
+    Local catalogue of RHS plants, keyed by RHS plant id.
+
+    Each plant's botanical name is stored with its normalised species name (no markup, hybrid signs, cultivars or
+    groups), so lookups only match candidates sharing the queried species via an index. Fuzzy matches are narrowed
+    to species names in the same genus sharing enough trigrams with the query, via an index of each distinct
+    species name's trigrams.
+
+    Args:
+        path (str): Path to the SQLite database file.
+        readonly (bool): Open an existing catalogue read-only (e.g. bundled in the Lambda package), without locking.
+    """
+    def __init__(self, path: str, readonly: bool = False):
+        self.path = path
+        self.readonly = readonly
+        self._lock = threading.Lock()
+
+        if readonly:
+            self._conn = sqlite3.connect(f"file:{path}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+            self.has_trigrams = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'species_trigrams'"
+            ).fetchone() is not None
+            if not self.has_trigrams:
+                logger.warning(f"RHS catalogue at {path} has no trigram index, so fuzzy lookups are disabled (re-run the crawler to add it)")
+            return
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS plants (
+                id INTEGER PRIMARY KEY,
+                botanical_name TEXT NOT NULL,
+                species_name TEXT NOT NULL,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL,
+                details TEXT,
+                error TEXT,
+                listed_at REAL NOT NULL,
+                fetched_at REAL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS plants_species_name ON plants (species_name)")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS species_trigrams (
+                trigram TEXT NOT NULL,
+                species_name TEXT NOT NULL,
+                PRIMARY KEY (trigram, species_name)
+            ) WITHOUT ROWID"""
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS crawl_state (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.has_trigrams = True
+        # Index catalogues crawled before the trigram index was added
+        if self._conn.execute("SELECT 1 FROM species_trigrams LIMIT 1").fetchone() is None:
+            species_names = [row[0] for row in self._conn.execute("SELECT DISTINCT species_name FROM plants")]
+            if species_names:
+                with self._lock:
+                    self._conn.execute("BEGIN")
+                    self._index_trigrams(species_names)
+                    self._conn.execute("COMMIT")
+
+    @staticmethod
+    def species_name(botanical_name: str) -> str:
+        """Normalised species name used to index a botanical name (which may contain markup)."""
+        return remove_cultivar(remove_hybrid_markers(normalise_name(strip_markup(botanical_name))))
+
+    def _index_trigrams(self, species_names: Iterable[str]) -> None:
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO species_trigrams (trigram, species_name) VALUES (?, ?)",
+            ((trigram, name) for name in set(species_names) if " " in name for trigram in trigrams(name))
+        )
+
+    def upsert_listing(self, hits: Iterable[dict], urls: Dict[int, str]) -> int:
+        """
+        Add or update plants from a page of search results, keeping any details already fetched.
+
+        Args:
+            hits (Iterable[dict]): Search API hits, each with 'id' and 'botanicalName'.
+            urls (Dict[int, str]): Details page URL for each hit id.
+
+        Returns:
+            int: Number of plants added or updated.
+        """
+        now = time.time()
+        rows = [
+            (hit["id"], hit.get("botanicalName") or "", self.species_name(hit.get("botanicalName")), urls[hit["id"]], STATUS_PENDING, now)
+            for hit in hits if hit.get("id") is not None
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                """INSERT INTO plants (id, botanical_name, species_name, url, status, listed_at) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    botanical_name = excluded.botanical_name,
+                    species_name = excluded.species_name,
+                    url = excluded.url,
+                    listed_at = excluded.listed_at""",
+                rows
+            )
+            self._index_trigrams(row[2] for row in rows)
+            self._conn.execute("COMMIT")
+        return len(rows)
+
+    def record_details(self, plant_id: int, status: str, details: Optional[dict] = None) -> None:
+        """Store the parsed details (or summary-only status) fetched for a plant."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE plants SET status = ?, details = ?, error = NULL, fetched_at = ? WHERE id = ?",
+                (status, json.dumps(details) if details is not None else None, time.time(), plant_id)
+            )
+
+    def record_error(self, plant_id: int, error: str) -> None:
+        """
+        Record a failed fetch. Previously fetched details are kept, and (as fetched_at is unchanged) retried next crawl.
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE plants SET status = CASE WHEN status = ? THEN ? ELSE status END, error = ? WHERE id = ?",
+                (STATUS_PENDING, STATUS_ERROR, error, plant_id)
+            )
+
+    def ids_to_fetch(self, max_age: Optional[float] = None, limit: Optional[int] = None) -> List[int]:
+        """
+        Return ids of plants whose details are missing, failed, or (if max_age is given) older than max_age seconds.
+
+        Args:
+            max_age (float, optional): Refetch details older than this many seconds. None never refetches.
+            limit (int, optional): Maximum number of ids to return.
+        """
+        query = "SELECT id FROM plants WHERE status IN (?, ?)"
+        params: list = [STATUS_PENDING, STATUS_ERROR]
+        if max_age is not None:
+            query += " OR fetched_at < ?"
+            params.append(time.time() - max_age)
+        query += " ORDER BY fetched_at IS NOT NULL, fetched_at, id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(query, params)]
+
+    def get_url(self, plant_id: int) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT url FROM plants WHERE id = ?", (plant_id,)).fetchone()
+        return row[0] if row else None
+
+    def lookup(self, species: str, min_similarity: float = 0.85, fuzzy: bool = True) -> Optional[dict]:
+        """
+        Find the catalogue entry best matching a species name, ranked as for live RHS search results.
+
+        Args:
+            species (str): Species name to look up.
+            min_similarity (float): Minimum trigram similarity for a fuzzy match.
+            fuzzy (bool): Whether to fall back to similar species names (e.g. misspelt epithets) in the same genus,
+                if no entry has the queried species name.
+
+        Returns:
+            Optional[dict]: The matched entry ('id', 'botanicalName', 'url', 'status', 'details', 'fetchedAt'),
+                or None if no entry matches.
+        """
+        matcher = SpeciesMatcher(species, min_similarity)
+        match = matcher.best_match(self._candidates([matcher.base_name]))
+        if match is None and fuzzy and self.has_trigrams:
+            match = matcher.best_match(self._candidates(self._similar_species(matcher.base_name, min_similarity)))
+        if match is None:
+            return None
+        entry = dict(match.result)
+        entry["details"] = json.loads(entry["details"]) if entry["details"] else None
+        return entry
+
+    def _similar_species(self, species_name: str, min_similarity: float) -> List[str]:
+        """
+        Species names in the same genus sharing enough trigrams with species_name to reach min_similarity, most shared first.
+
+        A Dice coefficient of at least min_similarity needs at least min_similarity * n / (2 - min_similarity) of the
+        n query trigrams to be shared, whatever the candidate's length. Every name in the genus shares the genus's
+        own trigrams, so only the others are looked up.
+        """
+        if " " not in species_name:
+            return []
+        genus = species_name.split(" ")[0]
+        all_trigrams = trigrams(species_name)
+        genus_trigrams = trigrams(genus) & all_trigrams
+        query_trigrams = sorted(all_trigrams - genus_trigrams)
+        min_shared = max(int(min_similarity * len(all_trigrams) / (2 - min_similarity)) - len(genus_trigrams), 1)
+        with self._lock:
+            rows = self._conn.execute(
+                f"""SELECT species_name FROM species_trigrams
+                WHERE trigram IN ({", ".join("?" * len(query_trigrams))}) AND species_name >= ? AND species_name < ?
+                GROUP BY species_name HAVING COUNT(*) >= ?
+                ORDER BY COUNT(*) DESC, species_name LIMIT ?""",
+                (*query_trigrams, f"{genus} ", f"{genus}!", min_shared, MAX_FUZZY_SPECIES)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _candidates(self, species_names: List[str]) -> List[dict]:
+        """Plants with any of species_names, in id order (so ties between equally good matches are stable)."""
+        if not species_names:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"""SELECT id, botanical_name, url, status, details, fetched_at FROM plants
+                WHERE species_name IN ({", ".join("?" * len(species_names))}) ORDER BY id""",
+                species_names
+            ).fetchall()
+        return [
+            {
+                "id": row[0],
+                "botanicalName": row[1],
+                "url": row[2],
+                "status": row[3],
+                "details": row[4],  # decoded for the matched entry only
+                "fetchedAt": row[5]
+            }
+            for row in rows
+        ]
+
+    def get_state(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Return a crawl checkpoint value."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM crawl_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_state(self, key: str, value: str) -> None:
+        """Store a crawl checkpoint value."""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO crawl_state (key, value) VALUES (?, ?)", (key, value))
+
+    def delete_state(self, key: str) -> None:
+        """Remove a crawl checkpoint value."""
+        with self._lock:
+            self._conn.execute("DELETE FROM crawl_state WHERE key = ?", (key,))
+
+    def counts(self) -> Dict[str, int]:
+        """Number of plants by details status."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM plants GROUP BY status").fetchall())
+
+    def close(self) -> None:
+        """Close the catalogue, folding the write-ahead log into the database file so it can be shipped read-only."""
+        with self._lock:
+            if not self.readonly:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.close()
@@ -0,0 +1,152 @@
+"""Ranked matching of a species name against RHS search results."""
+import html
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Set
+
+MARKUP_PATTERN = re.compile(r"<[^>]*>")
+QUOTES_TRANSLATION = str.maketrans({"‘": "'", "’": "'", "“": '"', "”": '"'})
+HYBRID_PATTERN = re.compile(r"(?:^|\s)[×x](?=\s)|×")
+CULTIVAR_PATTERN = re.compile(r"'[^']*'|\([^)]*\)")
+INFRASPECIFIC_RANKS = {"subsp.", "ssp.", "var.", "subvar.", "f.", "forma"}
+AUTHOR_CONNECTORS = {"ex", "et", "&"}
+
+# Match kinds, from most to least trusted. Lower rank wins when several candidates match
+MATCH_RANKS = {"exact": 0, "hybrid": 1, "author": 2, "cultivar": 3, "similar": 4}
+
+def strip_markup(name: str) -> str:
+    """Remove tags (e.g. <em>) and entities from an RHS botanical name, and collapse whitespace."""
+    return " ".join(html.unescape(MARKUP_PATTERN.sub("", name or "")).split())
+
+def normalise_name(name: str) -> str:
+    """Lowercase a plain-text botanical name and unify quote characters."""
+    return name.translate(QUOTES_TRANSLATION).casefold()
+
+def remove_hybrid_markers(name: str) -> str:
+    """Drop hybrid signs, so 'lavandula × intermedia', 'lavandula x intermedia' and 'lavandula ×intermedia' compare equal."""
+    return " ".join(HYBRID_PATTERN.sub(" ", name).split())
+
+def remove_cultivar(name: str) -> str:
+    """Drop quoted cultivar epithets and bracketed groups/series, leaving the species name."""
+    return " ".join(CULTIVAR_PATTERN.sub(" ", name).split())
+
+def strip_authors(name: str) -> str:
+    """
+    Remove author citations from a plain-text botanical name, e.g. 'Lavandula angustifolia Mill.' -> 'Lavandula angustifolia'.
+
+    Keeps the genus, lowercase epithets (including those following subsp./var./f.), hybrid signs and quoted
+    cultivars, and drops capitalised, abbreviated or bracketed author tokens after the genus.
+    """
+    tokens = name.split()
+    if not tokens:
+        return name
+
+    kept = [tokens[0]]
+    keep_next = False
+    in_cultivar = False
+    for token in tokens[1:]:
+        if in_cultivar or token.startswith("'"):
+            kept.append(token)
+            # A cultivar epithet runs until the token closing its quotes
+            in_cultivar = not (token.endswith("'") and (in_cultivar or len(token) > 1))
+        elif keep_next or token in ("×", "x"):
+            kept.append(token)
+            keep_next = False
+        elif token in INFRASPECIFIC_RANKS:
+            kept.append(token)
+            keep_next = True
+        elif token in AUTHOR_CONNECTORS or not token[0].islower() or "." in token:
+            continue
+        else:
+            kept.append(token)
+    return " ".join(kept)
+
+def trigrams(name: str) -> Set[str]:
+    """Character trigrams of a name, padded so word boundaries count."""
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def similarity(a: Set[str], b: Set[str]) -> float:
+    """Dice coefficient of two trigram sets, from 0.0 (nothing shared) to 1.0 (identical)."""
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+@dataclass
+class SpeciesMatch:
+    """The chosen search result, its plain-text (lowercase) name, how it matched and the similarity score."""
+    result: dict
+    name: str
+    kind: str
+    score: float
+
+class SpeciesMatcher:
+    """
+    Rank RHS search results against a species name.
+
+    Candidates are tried as, in order of preference: an exact name match; a match ignoring hybrid signs;
+    a match ignoring author citations in the query; a cultivar or group of the species (e.g. "species 'Cultivar'"
+    or "species (Group)"); and finally the most similar species name by trigram similarity, if at least
+    min_similarity. Each result's markup is stripped once; ties prefer the plain species, then RHS result order.
+
+    Args:
+        species (str): Species name to match, e.g. from PlantNet.
+        min_similarity (float): Minimum trigram similarity (0-1) for a fuzzy match.
+    """
+    def __init__(self, species: str, min_similarity: float = 0.85):
+        self.min_similarity = min_similarity
+        self.name = normalise_name(" ".join(species.split()))
+        self.hybrid_name = remove_hybrid_markers(self.name)
+        self.author_stripped = remove_hybrid_markers(normalise_name(strip_authors(" ".join(species.split()))))
+        self.base_name = remove_cultivar(self.author_stripped)
+        # Fuzzy matching compares species names, unless a cultivar was asked for
+        self.has_cultivar = self.base_name != self.author_stripped
+        self.fuzzy_name = self.author_stripped if self.has_cultivar else self.base_name
+        self.trigrams = trigrams(self.fuzzy_name)
+
+    def _classify(self, name: str, hybrid_name: str, base_name: str) -> Optional[tuple]:
+        """Return (kind, score) for a normalised candidate name, or None if it does not match."""
+        if name == self.name:
+            return "exact", 1.0
+        if hybrid_name == self.hybrid_name:
+            return "hybrid", 1.0
+        if hybrid_name == self.author_stripped:
+            return "author", 1.0
+        if f"{self.name} (" in name:
+            return "cultivar", 1.0
+
+        # Never match on the genus alone, e.g. 'Lavandula' against any 'Lavandula 'Cultivar''
+        if " " not in self.fuzzy_name:
+            return None
+        if base_name != hybrid_name and base_name == self.base_name and not self.has_cultivar:
+            return "cultivar", 1.0
+
+        fuzzy_name = hybrid_name if self.has_cultivar else base_name
+        score = similarity(self.trigrams, trigrams(fuzzy_name)) if " " in fuzzy_name else 0.0
+        if score >= self.min_similarity:
+            return "similar", score
+        return None
+
+    def best_match(self, search_results: List[dict]) -> Optional[SpeciesMatch]:
+        """
+        Return the best matching search result, or None if no result matches well enough.
+
+        Args:
+            search_results (List[dict]): Search results from RHS, each with a 'botanicalName' (which may contain markup).
+        """
+        best, best_rank = None, None
+        for position, result in enumerate(search_results):
+            name = normalise_name(strip_markup(result.get("botanicalName")))
+            hybrid_name = remove_hybrid_markers(name)
+            base_name = remove_cultivar(hybrid_name)
+            classified = self._classify(name, hybrid_name, base_name)
+            if classified is None:
+                continue
+            kind, score = classified
+            # Among equally good matches, prefer the plain species over its cultivars, then RHS result order
+            rank = (MATCH_RANKS[kind], -score, base_name != hybrid_name, position)
+            if best_rank is None or rank < best_rank:
+                best, best_rank = SpeciesMatch(result=result, name=name, kind=kind, score=score), rank
+                if kind == "exact":
+                    break
+        return best
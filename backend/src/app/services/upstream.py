@@ -0,0 +1,87 @@
+"""
+Opening and pre-warming the app-lifetime upstream clients (PlantNet, RHS and Anthropic) at startup.
+
+The clients themselves are the class-level shared clients of PlantNetClient, PlantScraper and PlantAnthropicClient,
+which every service uses; this module only opens them early and closes them on shutdown.
+"""
+import asyncio
+from typing import List, Set, Tuple
+import httpx
+from app.config import settings
+from app.services.plant_details_llm import PlantAnthropicClient
+from app.services.plant_details_rhs import PlantScraper
+from app.services.plant_identification import PlantNetClient
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Host the Anthropic SDK calls by default, known without importing the SDK
+ANTHROPIC_BASE_URL = "https://api.anthropic.com"
+
+# Whether connections have been pre-warmed in this process
+_prewarmed = False
+
+# Strong reference to the background pre-warm, so it is not garbage collected before finishing
+_background_tasks: Set[asyncio.Task] = set()
+
+def _origin(url: str) -> str:
+    """Scheme and host of a URL, without any path or query (e.g. API keys)."""
+    parsed = httpx.URL(url)
+    return str(parsed.copy_with(path="/", query=None, fragment=None))
+
+def _prewarm_targets() -> List[Tuple[httpx.AsyncClient, str]]:
+    """Each shared httpx client paired with the origin of every (distinct) host it calls."""
+    targets = [
+        (PlantNetClient.get_http_client(), settings.PLANTNET_ENDPOINT),
+        (PlantScraper.get_http_client(), settings.RHS_SEARCH_API_URL),
+        (PlantScraper.get_http_client(), settings.RHS_BASE_URL),
+        (PlantScraper.get_http_client(), settings.RHS_PLANTS_URL),
+        (PlantAnthropicClient.get_http_client(), settings.ANTHROPIC_BASE_URL or ANTHROPIC_BASE_URL),
+    ]
+    return list(dict.fromkeys((client, _origin(url)) for client, url in targets))
+
+async def prewarm_connections(timeout: float) -> None:
+    """
+    Open a keep-alive connection to every upstream host (DNS, TCP and TLS), so the first real request reuses it.
+
+    Any response status counts as warm; failures are logged and otherwise ignored.
+
+    Args:
+        timeout (float): Seconds to allow each warm-up request.
+    """
+    async def warm(client: httpx.AsyncClient, origin: str) -> None:
+        try:
+            response = await client.head(origin, timeout=timeout)
+            logger.debug(f"Pre-warmed connection to {origin} ({response.status_code})")
+        except httpx.HTTPError as e:
+            logger.info(f"Could not pre-warm connection to {origin}: {e!r}")
+
+    await asyncio.gather(*(warm(client, origin) for client, origin in _prewarm_targets()))
+
+async def open_upstream_clients() -> None:
+    """
+    Create the shared upstream clients, starting to pre-warm their connections on first call.
+
+    Connections are pre-warmed in the background, so startup (and the first request, e.g. a health check on
+    a cold Lambda) does not wait for them. Safe to call repeatedly: Mangum runs the app lifespan around every
+    Lambda invocation, and later calls keep the clients already open in the (warm) execution environment.
+    """
+    global _prewarmed
+    PlantNetClient.get_http_client()
+    PlantScraper.get_http_client()
+    PlantAnthropicClient.get_http_client()
+    if settings.HTTP_PREWARM_ENABLED and not _prewarmed:
+        _prewarmed = True
+        task = asyncio.create_task(prewarm_connections(settings.HTTP_PREWARM_TIMEOUT))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+async def close_upstream_clients() -> None:
+    """Close the shared upstream clients, so the next use opens new ones."""
+    global _prewarmed
+    for task in _background_tasks:
+        task.cancel()
+    for client in (PlantNetClient._http_client, PlantScraper._http_client, PlantAnthropicClient._http_client):
+        if client is not None and not client.is_closed:
+            await client.aclose()
+    _prewarmed = False
@@ -0,0 +1,5 @@
+"""Make the app package importable from backend/, as it is when run from src/."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
@@ -0,0 +1,69 @@
+import random
+import pytest
+from app.cache import bktree
+from app.cache.bktree import BKTree, PerceptualHashIndex, hamming_distance
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the index."""
+    now = [1000.0]
+    monkeypatch.setattr(bktree.time, "time", lambda: now[0])
+    return now
+
+def test_search_matches_brute_force():
+    rng = random.Random(0)
+    keys = list({rng.getrandbits(64) for _ in range(500)})
+    tree = BKTree()
+    for key in keys:
+        tree.add(key, key)
+    query = keys[0] ^ 0b1011  # 3 bits from keys[0]
+
+    results = tree.search(query, 6)
+    expected = sorted((hamming_distance(query, key), key) for key in keys if hamming_distance(query, key) <= 6)
+    assert sorted((distance, key) for distance, key, _ in results) == expected
+    assert [distance for distance, _, _ in results] == sorted(distance for distance, _, _ in results)
+
+def test_add_existing_hash_replaces_value():
+    tree = BKTree()
+    tree.add(0b1010, "old")
+    tree.add(0b1010, "new")
+    assert len(tree) == 1
+    assert tree.search(0b1010, 0) == [(0, 0b1010, "new")]
+
+def test_nearest_prefers_closest_hash_in_context():
+    index = PerceptualHashIndex()
+    index.add("flower", 0b1111, "far")
+    index.add("flower", 0b0111, "near")
+    index.add("leaf", 0b1110, "other context")
+    assert index.nearest("flower", 0b0110, 4)[:2] == (1, "near")
+    assert index.nearest("bark", 0b0110, 4) is None
+
+def test_nearest_ignores_expired_hashes(clock):
+    index = PerceptualHashIndex(ttl=60)
+    index.add("flower", 0b1111, "old")
+    clock[0] += 30
+    index.add("flower", 0b1110, "newer")
+
+    assert index.nearest("flower", 0b1111, 4)[:2] == (0, "old")
+    clock[0] += 31  # 'old' is 61s old, 'newer' 31s
+    assert index.nearest("flower", 0b1111, 4)[:2] == (1, "newer")
+    clock[0] += 30
+    assert index.nearest("flower", 0b1111, 4) is None
+
+def test_re_add_after_expiry_restarts_ttl(clock):
+    index = PerceptualHashIndex(ttl=60)
+    index.add("flower", 0b1111, "first")
+    clock[0] += 61
+    assert index.nearest("flower", 0b1111, 0) is None
+
+    index.add("flower", 0b1111, "second")
+    assert index.nearest("flower", 0b1111, 0) == (0, "second", clock[0])
+    assert len(index) == 1
+
+def test_oldest_hashes_evicted_past_max_entries():
+    index = PerceptualHashIndex(max_entries=10)
+    for i in range(12):
+        index.add("flower", i << 16, i)
+    assert len(index) == 10
+    assert index.nearest("flower", 0, 0) is None
+    assert index.nearest("flower", 11 << 16, 0)[:2] == (0, 11)
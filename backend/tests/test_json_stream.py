@@ -0,0 +1,45 @@
+import json
+import pytest
+from app.services.json_stream import IncrementalJsonObjectParser
+
+DOCUMENT = {
+    "size": {"height": "0.5–1 metres", "spread": "0.5–1 metres"},
+    "hardiness": "H5: hardy, {braces} and \"quotes\", in a string",
+    "soil": {"types": ["Chalk", "Loam"], "ph_levels": ["Alkaline"]},
+    "pruning": "Trim after flowering, \\ backslash",
+}
+
+def feed_all(parser, chunks):
+    return [member for chunk in chunks for member in parser.feed(chunk)]
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 16, 10_000])
+def test_members_complete_whatever_the_chunking(chunk_size):
+    text = "Here is the JSON:\n" + json.dumps(DOCUMENT, ensure_ascii=False, indent=2) + "\nDone."
+    parser = IncrementalJsonObjectParser()
+    members = feed_all(parser, [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)])
+    assert members == list(DOCUMENT.items())
+    assert parser.finished
+
+def test_member_emitted_as_soon_as_complete():
+    parser = IncrementalJsonObjectParser()
+    assert parser.feed('{"hardiness": "H5"') == []
+    assert parser.feed(', "pru') == [("hardiness", "H5")]
+    assert parser.feed('ning": "Trim"}') == [("pruning", "Trim")]
+
+def test_trailing_comma_tolerated():
+    parser = IncrementalJsonObjectParser()
+    assert feed_all(parser, ['{"a": 1,', ' "b": [1, 2],', "\n}"]) == [("a", 1), ("b", [1, 2])]
+
+def test_text_after_closing_brace_ignored():
+    parser = IncrementalJsonObjectParser()
+    assert parser.feed('{"a": 1} {"b": 2}') == [("a", 1)]
+    assert parser.feed(', "c": 3}') == []
+
+def test_escaped_quote_split_across_chunks():
+    parser = IncrementalJsonObjectParser()
+    assert feed_all(parser, ['{"a": "say \\', '"hi\\', '""}']) == [("a", 'say "hi"')]
+
+def test_invalid_member_raises():
+    parser = IncrementalJsonObjectParser()
+    with pytest.raises(json.JSONDecodeError):
+        parser.feed('{"a": nope, ')
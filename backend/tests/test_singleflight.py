@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+from app.cache import SingleFlight
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_concurrent_calls_share_one_call():
+    async def scenario():
+        flight = SingleFlight("test")
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("key", call) for _ in range(5)))
+        return results, calls, flight.in_flight("key")
+
+    results, calls, in_flight = run(scenario())
+    assert results == ["result"] * 5
+    assert len(calls) == 1
+    assert not in_flight
+
+def test_different_keys_do_not_share():
+    async def scenario():
+        flight = SingleFlight("test")
+
+        async def call(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        return await asyncio.gather(flight.do("a", lambda: call("a")), flight.do("b", lambda: call("b")))
+
+    assert run(scenario()) == ["a", "b"]
+
+def test_exception_is_shared_and_key_released():
+    async def scenario():
+        flight = SingleFlight("test")
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(flight.do("key", failing), flight.do("key", failing), return_exceptions=True)
+        later = await flight.do("key", lambda: asyncio.sleep(0, result="fresh"))
+        return results, later
+
+    results, later = run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert later == "fresh"
+
+def test_cancelling_one_caller_does_not_cancel_the_shared_call():
+    async def scenario():
+        flight = SingleFlight("test")
+        finished = asyncio.Event()
+
+        async def call():
+            await asyncio.sleep(0.05)
+            finished.set()
+            return "result"
+
+        first = asyncio.create_task(flight.do("key", call))
+        second = asyncio.create_task(flight.do("key", call))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second, finished.is_set()
+
+    assert run(scenario()) == ("result", True)
+
+def test_cancelling_every_caller_cancels_the_shared_call():
+    async def scenario():
+        flight = SingleFlight("test")
+        cancelled = asyncio.Event()
+
+        async def call():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [asyncio.create_task(flight.do("key", call)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        return cancelled.is_set(), flight.in_flight("key")
+
+    assert run(scenario()) == (True, False)
@@ -0,0 +1,61 @@
+import pytest
+from app.services.species_matching import SpeciesMatcher, strip_authors
+
+def hits(*names):
+    return [{"id": i, "botanicalName": name} for i, name in enumerate(names)]
+
+def best(species, results, min_similarity=0.85):
+    match = SpeciesMatcher(species, min_similarity).best_match(results)
+    return None if match is None else (match.result["botanicalName"], match.kind)
+
+def test_exact_match_wins_over_earlier_cultivars():
+    results = hits("<em>Lavandula angustifolia</em> 'Hidcote'", "<em>Lavandula angustifolia</em>")
+    assert best("Lavandula angustifolia", results) == ("<em>Lavandula angustifolia</em>", "exact")
+
+@pytest.mark.parametrize("species, expected", [
+    ("Lavandula x intermedia", ("<em>Lavandula</em> × <em>intermedia</em>", "hybrid")),
+    ("Lavandula angustifolia Mill.", ("<em>Lavandula angustifolia</em>", "author")),
+    ("Lavandula stoechas", ("<em>Lavandula stoechas</em> 'Kew Red'", "cultivar")),
+    ("Lavandula angustifolla", ("<em>Lavandula angustifolia</em>", "similar")),
+])
+def test_match_kinds(species, expected):
+    results = hits(
+        "<em>Lavandula</em> × <em>intermedia</em>",
+        "<em>Lavandula angustifolia</em>",
+        "<em>Lavandula stoechas</em> 'Kew Red'",
+    )
+    assert best(species, results) == expected
+
+def test_ranking_order_is_exact_hybrid_author_cultivar_similar():
+    species = "Lavandula angustifolia"
+    results = hits(
+        "<em>Lavandula angustifolla</em>",              # similar
+        "<em>Lavandula angustifolia</em> 'Hidcote'",    # cultivar
+        "<em>Lavandula</em> ×<em>angustifolia</em>",    # hybrid sign ignored
+    )
+    assert best(species, results)[1] == "hybrid"
+    assert best(species, results[:2])[1] == "cultivar"
+    assert best(species, results[:1])[1] == "similar"
+
+def test_plain_species_preferred_over_cultivar_then_result_order():
+    results = hits("<em>Rosa canina</em> 'Kiese'", "<em>Rosa canina</em> 'Abbotswood'")
+    assert best("Rosa canina", results) == ("<em>Rosa canina</em> 'Kiese'", "cultivar")
+
+def test_never_matches_on_genus_alone():
+    results = hits("<em>Lavandula</em> 'Fathead'", "<em>Lavandula angustifolia</em>")
+    assert best("Lavandula", results) is None
+
+def test_genus_only_name_still_matches_exactly():
+    assert best("Lavandula", hits("<em>Lavandula</em>")) == ("<em>Lavandula</em>", "exact")
+
+def test_dissimilar_species_in_genus_does_not_match():
+    assert best("Lavandula latifolia", hits("<em>Lavandula angustifolia</em>")) is None
+
+def test_cultivar_query_does_not_match_a_different_cultivar_exactly():
+    results = hits("<em>Lavandula angustifolia</em> 'Munstead'")
+    assert best("Lavandula angustifolia 'Hidcote'", results) is None
+
+def test_strip_authors_keeps_epithets_and_cultivars():
+    assert strip_authors("Lavandula angustifolia Mill.") == "Lavandula angustifolia"
+    assert strip_authors("Rosa canina subsp. dumalis (Bechst.) Ehrh.") == "Rosa canina subsp. dumalis"
+    assert strip_authors("Lavandula angustifolia 'Hidcote Blue'") == "Lavandula angustifolia 'Hidcote Blue'"
@@ -0,0 +1,69 @@
+import asyncio
+import pytest
+from app.cache import LRUCache, StaleWhileRevalidateCache, TieredCache
+from app.cache import memory, tiered
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the cache entries."""
+    now = [1000.0]
+    monkeypatch.setattr(memory.time, "time", lambda: now[0])
+    monkeypatch.setattr(tiered.time, "time", lambda: now[0])
+    return now
+
+def make_cache() -> StaleWhileRevalidateCache:
+    return StaleWhileRevalidateCache(TieredCache(LRUCache(max_entries=16)), fresh_ttl=60, stale_ttl=600)
+
+def counting_fetch(values):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return values[len(calls) - 1]
+    return fetch, calls
+
+def test_miss_fetches_inline_then_hits(clock):
+    async def scenario():
+        cache = make_cache()
+        fetch, calls = counting_fetch(["v1"])
+        return await cache.get_or_fetch("key", fetch), await cache.get_or_fetch("key", fetch), len(calls)
+
+    assert asyncio.run(scenario()) == ("v1", "v1", 1)
+
+def test_stale_entry_served_while_refreshed_once(clock):
+    async def scenario():
+        cache = make_cache()
+        fetch, calls = counting_fetch(["v1", "v2"])
+        await cache.get_or_fetch("key", fetch)
+        clock[0] += 61
+        stale = await asyncio.gather(cache.get_or_fetch("key", fetch), cache.get_or_fetch("key", fetch))
+        await asyncio.gather(*cache._tasks)
+        return stale, cache.get("key"), len(calls)
+
+    assert asyncio.run(scenario()) == (["v1", "v1"], "v2", 2)
+
+def test_failed_refresh_keeps_stale_entry(clock):
+    async def scenario():
+        cache = make_cache()
+        cache.set("key", "v1")
+        clock[0] += 61
+
+        async def failing():
+            raise RuntimeError("upstream down")
+
+        served = await cache.get_or_fetch("key", failing)
+        await asyncio.gather(*cache._tasks)
+        return served, cache.get("key"), cache._refreshing
+
+    assert asyncio.run(scenario()) == ("v1", "v1", {})
+
+def test_expired_entry_fetched_inline(clock):
+    async def scenario():
+        cache = make_cache()
+        cache.set("key", "v1")
+        clock[0] += 661
+        fetch, _ = counting_fetch(["v2"])
+        return await cache.get_or_fetch("key", fetch)
+
+    assert asyncio.run(scenario()) == "v2"